@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 import json
+from collections import defaultdict
 
+from django import forms
+from django.conf import settings
 from django.conf.urls import url
 from django.contrib import admin
 from django.contrib.admin.views.decorators import staff_member_required
+from django.core.paginator import InvalidPage, Paginator
 from django.db.models import Count, ManyToOneRel, Prefetch
-from django.http import Http404, HttpResponseNotFound
+from django.http import (
+    Http404, HttpResponse, HttpResponseNotFound, JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -15,22 +22,39 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 
 from cms.admin.placeholderadmin import PlaceholderAdminMixin
-from cms.models import CMSPlugin
+from cms.models import CMSPlugin, Page
 from cms.operations import ADD_PLUGIN
 from cms.plugin_pool import plugin_pool
+from cms.utils.i18n import get_language_list
 
-from . import models, views
+from . import conf, models, views
 from .forms import (
-    TranslateInBulkStep1Form, TranslateInBulkStep2Form,
-    TranslateInBulkStep3Form,
+    PageTreeMultipleChoiceField, TranslateInBulkStep1Form,
+    TranslateInBulkStep2Form, TranslateInBulkStep3Form,
+    _get_bulk_request_eligible_pages,
 )
 from .models import TranslationRequest
-from .tasks import prepare_translation_bulk_request
+from .payloads import PAYLOAD_LOOKUPS, get_payload
+from .progress import get_progress, set_progress
+from .reports import REPORT_FORMATS, get_report_rows, parse_report_date
+from .tasks import get_bulk_action_progress, queue_bulk_action, queue_quote
 from .utils import (
-    get_language_name, get_page_url, get_plugin_form, pretty_json,
+    get_language_name, get_page_url, get_payload_page, get_plugin_form,
+    pretty_json,
 )
 
 
+def _payload_viewer(translation_request_pk, field):
+    # The payload can be several megabytes, the viewer fetches it page by page.
+    return format_html(
+        '<div class="js-translations-payload" data-url="{url}">'
+        '<a href="#" class="js-translations-payload-load">{title}</a>'
+        '</div>',
+        url=reverse('admin:translation-request-payload', args=(translation_request_pk, field)),
+        title=_('Show'),
+    )
+
+
 class AllReadOnlyFieldsMixin(object):
     actions = None
 
@@ -68,9 +92,19 @@ class TranslationRequestItemInline(AllReadOnlyFieldsMixin, admin.TabularInline):
             'translation_request',
             'source_cms_page__node__site',
             'target_cms_page__node__site',
-        )
+        ).prefetch_related(
+            'source_cms_page__title_set',
+            'target_cms_page__title_set',
+        ).defer_payloads('translation_request')
+
+    def _get_page(self, page):
+        # django CMS queries the titles of each page otherwise.
+        if not page.title_cache:
+            page.title_cache = {title.language: title for title in page.title_set.all()}
+        return page
 
     def _pretty_page_display(self, page, language):
+        page = self._get_page(page)
         return mark_safe(
             '<a href="{}" target="_top" onclick="closeSideframe()">{}</a>'.format(
                 get_page_url(page, language),
@@ -79,11 +113,11 @@ class TranslationRequestItemInline(AllReadOnlyFieldsMixin, admin.TabularInline):
         )
 
     def source_cms_page_slug(self, obj):
-        return obj.source_cms_page.get_slug(language=obj.translation_request.source_language)
+        return self._get_page(obj.source_cms_page).get_slug(language=obj.translation_request.source_language)
     source_cms_page_slug.short_description = _('Source CMS page slug')
 
     def target_cms_page_slug(self, obj):
-        return obj.target_language.get_slug(language=obj.translation_request.target_language)
+        return self._get_page(obj.target_cms_page).get_slug(language=obj.translation_request.target_language)
     target_cms_page_slug.short_description = _('Target CMS page slug')
 
     def pretty_source_cms_page(self, obj):
@@ -127,8 +161,12 @@ class TranslationOrderInline(AllReadOnlyFieldsMixin, admin.StackedInline):
         'price',
     )
 
+    def get_queryset(self, request):
+        queryset = super(TranslationOrderInline, self).get_queryset(request)
+        return queryset.select_related('request').defer_payloads('request')
+
     def provider_order_id(self, obj):
-        return obj.provider_details.get('Id') or obj.response_content.get('Id')
+        return obj.provider_details.get('Id')
     provider_order_id.short_description = _('Provider order ID')
 
     def pretty_provider_options(self, obj):
@@ -136,15 +174,11 @@ class TranslationOrderInline(AllReadOnlyFieldsMixin, admin.StackedInline):
     pretty_provider_options.short_description = _('Provider options')
 
     def pretty_request_content(self, obj):
-        return pretty_json(json.dumps(obj.request_content))
+        return _payload_viewer(obj.request_id, 'order_request_content')
     pretty_request_content.short_description = _('Request content')
 
     def pretty_response_content(self, obj):
-        if isinstance(obj.response_content, dict):
-            data = json.dumps(obj.response_content)
-        else:
-            data = obj.response_content
-        return pretty_json(data)
+        return _payload_viewer(obj.request_id, 'order_response_content')
     pretty_response_content.short_description = _('Response content')
 
     def price(self, obj):
@@ -161,6 +195,14 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
     ]
 
     list_filter = ('state',)
+    ordering = ('-date_created',)
+    actions = (
+        'check_status_action',
+        'reimport_action',
+        'import_from_archive_action',
+        'cancel_action',
+        'delete_stale_drafts_action',
+    )
     list_display = (
         'provider_order_name',
         'date_created',
@@ -214,10 +256,8 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
         'selected_quote',
     )
 
-    def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
-            _pages_sent=Count('items'),
-        )
+    class Media:
+        js = ('djangocms_translations/js/payload_viewer.js',)
 
     def pretty_source_language(self, obj):
         return get_language_name(obj.source_language)
@@ -231,16 +271,15 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
         return pretty_json(json.dumps(obj.provider_options))
     pretty_provider_options.short_description = _('Provider options')
 
+    def get_queryset(self, request):
+        return super(TranslationRequestAdmin, self).get_queryset(request).defer_payloads()
+
     def pretty_export_content(self, obj):
-        if isinstance(obj.export_content, dict):
-            data = json.dumps(obj.export_content)
-        else:
-            data = obj.export_content
-        return pretty_json(data)
+        return _payload_viewer(obj.pk, 'export_content')
     pretty_export_content.short_description = _('Export content')
 
     def pretty_request_content(self, obj):
-        return pretty_json(json.dumps(obj.request_content))
+        return _payload_viewer(obj.pk, 'request_content')
     pretty_request_content.short_description = _('Request content')
 
     def pages_sent(self, obj):
@@ -250,7 +289,7 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
                 'admin:translation-request-pages-sent',
                 args=(obj.pk,),
             ),
-            title=obj._pages_sent,
+            title=obj.item_count,
         )
     pages_sent.short_description = _('Pages sent')
 
@@ -344,13 +383,29 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
                 return redirect('admin:translate-in-bulk-step-3')
             session.pop('translation_request_pk')
             session.pop('bulk_translation_step')
-            prepare_translation_bulk_request.delay(translation_request.pk)
+            queue_quote(translation_request.pk)
             return redirect('admin:djangocms_translations_translationrequest_changelist')
 
         title = _('Create bulk translations (step 2)')
         context = self._get_template_context(title, form, translation_request=translation_request)
         return render(request, 'admin/djangocms_translations/translationrequest/bulk_create_step_2.html', context)
 
+    @method_decorator(staff_member_required)
+    def translate_in_bulk_step_2_children(self, request, pk):
+        translation_request = get_object_or_404(
+            TranslationRequest.objects,
+            pk=request.session.get('translation_request_pk'),
+        )
+        source_language = translation_request.source_language
+        target_language = translation_request.target_language
+        parent = get_object_or_404(_get_bulk_request_eligible_pages(source_language, target_language), pk=pk)
+
+        field = PageTreeMultipleChoiceField(Page.objects.none())
+        field.source_language = source_language
+        field.target_language = target_language
+        widget = forms.CheckboxSelectMultiple(choices=field.get_tree_choices(parent))
+        return HttpResponse(widget.render('pages', None))
+
     @method_decorator(staff_member_required)
     def translate_in_bulk_step_3(self, request):
         session = request.session
@@ -389,12 +444,10 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
 
     @method_decorator(staff_member_required)
     def pages_sent_view(self, request, pk):
-        items = models.TranslationRequestItem.objects.select_related(
-            'source_cms_page',
-            'translation_request',
-        )
+        # The prefetch sets ``translation_request`` on the items.
+        items = models.TranslationRequestItem.objects.select_related('source_cms_page').defer_payloads()
         translation_request = get_object_or_404(
-            TranslationRequest.objects.prefetch_related(
+            TranslationRequest.objects.defer_payloads().prefetch_related(
                 Prefetch('items', queryset=items),
             ),
             pk=pk,
@@ -405,7 +458,7 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
     @method_decorator(staff_member_required)
     def show_log_view(self, request, pk):
         translation_request = get_object_or_404(
-            TranslationRequest.objects.prefetch_related('imports'),
+            TranslationRequest.objects.defer_payloads().prefetch_related('imports'),
             pk=pk,
         )
 
@@ -415,6 +468,163 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
         )
         return render(request, 'djangocms_translations/log.html', context)
 
+    @method_decorator(staff_member_required)
+    def payload_view(self, request, pk, field):
+        # Only the requested column or archived payload is read.
+        try:
+            data = get_payload(pk, field)
+        except TranslationRequest.DoesNotExist:
+            raise Http404()
+        path = [key for key in request.GET.get('path', '').split('/') if key]
+
+        try:
+            page = get_payload_page(data, path=path, page=int(request.GET.get('page', 1)))
+        except (LookupError, ValueError):
+            raise Http404()
+        return JsonResponse(page)
+
+    def _queue_bulk_action(self, request, queryset, action):
+        translation_request_ids = list(queryset.values_list('pk', flat=True))
+        job_id = queue_bulk_action(action, translation_request_ids)
+        self.message_user(request, format_html(
+            _('{} translation requests queued, <a href="{}">show progress</a>.'),
+            len(translation_request_ids),
+            reverse('admin:translation-request-bulk-action', args=(job_id,)),
+        ))
+
+    def check_status_action(self, request, queryset):
+        self._queue_bulk_action(request, queryset, 'check_status')
+    check_status_action.short_description = _('Check status of selected translation requests')
+
+    def reimport_action(self, request, queryset):
+        self._queue_bulk_action(request, queryset, 'reimport')
+    reimport_action.short_description = _('Re-import selected translation requests')
+
+    def import_from_archive_action(self, request, queryset):
+        self._queue_bulk_action(request, queryset, 'import_from_archive')
+    import_from_archive_action.short_description = _('Import selected translation requests from archive')
+
+    def cancel_action(self, request, queryset):
+        self._queue_bulk_action(request, queryset, 'cancel')
+    cancel_action.short_description = _('Cancel selected translation requests')
+
+    def delete_stale_drafts_action(self, request, queryset):
+        self._queue_bulk_action(request, queryset, 'delete_stale_drafts')
+    delete_stale_drafts_action.short_description = _('Delete selected stale drafts')
+
+    @method_decorator(staff_member_required)
+    def bulk_action_view(self, request, job_id):
+        # The progress is polled from the API, it may not be in the cache yet.
+        context = self._get_template_context(_('Bulk action progress'), job_id=job_id)
+        return render(request, 'djangocms_translations/bulk_action.html', context)
+
+    @method_decorator(staff_member_required)
+    def bulk_action_api_view(self, request, job_id):
+        progress = get_bulk_action_progress(job_id)
+
+        if progress is None:
+            raise Http404()
+        return JsonResponse(progress)
+
+    @method_decorator(staff_member_required)
+    def report_view(self, request):
+        report_format = request.GET.get('format', 'csv')
+        dates = {}
+
+        for field in ('date_from', 'date_to'):
+            if request.GET.get(field):
+                try:
+                    dates[field] = parse_report_date(request.GET[field])
+                except ValueError:
+                    raise Http404()
+
+        if report_format not in REPORT_FORMATS:
+            raise Http404()
+
+        content_type, iter_report = REPORT_FORMATS[report_format]
+        response = StreamingHttpResponse(iter_report(get_report_rows(**dates)), content_type=content_type)
+        response['Content-Disposition'] = 'attachment; filename="translations.{}"'.format(report_format)
+        return response
+
+    @method_decorator(staff_member_required)
+    def progress_view(self, request, pk):
+        progress = get_progress(pk)
+
+        if progress['state'] is None:
+            # Not cached yet, e.g. a request created before upgrading.
+            progress['state'] = get_object_or_404(TranslationRequest.objects.values_list('state', flat=True), pk=pk)
+            set_progress(pk, state=progress['state'])
+        return JsonResponse(progress)
+
+    def _get_coverage_summary(self):
+        counts = (
+            models.TranslationCoverage.objects
+            .filter(site=settings.SITE_ID)
+            .values_list('language', 'state')
+            .annotate(count=Count('pk'))
+            .order_by()
+        )
+        summary = defaultdict(dict)
+        for language, state, count in counts:
+            summary[language][state] = count
+        return summary
+
+    @method_decorator(staff_member_required)
+    def coverage_view(self, request):
+        summary = self._get_coverage_summary()
+        states = models.TranslationCoverage.STATES
+        coverage = [
+            (
+                language,
+                get_language_name(language),
+                [(state, summary[language].get(state, 0)) for state in states.values],
+            )
+            for language in get_language_list(settings.SITE_ID)
+        ]
+        context = self._get_template_context(
+            _('Coverage'),
+            coverage=coverage,
+            states=states.choices,
+        )
+        return render(request, 'djangocms_translations/coverage.html', context)
+
+    @method_decorator(staff_member_required)
+    def coverage_api_view(self, request):
+        return JsonResponse(self._get_coverage_summary())
+
+    @method_decorator(staff_member_required)
+    def coverage_pages_view(self, request):
+        queryset = (
+            models.TranslationCoverage.objects
+            .filter(site=settings.SITE_ID)
+            .order_by('page', 'language')
+            .values(
+                'page',
+                'language',
+                'state',
+                'last_request',
+                'source_page',
+                'source_language',
+                'date_updated',
+            )
+        )
+
+        for field in ('language', 'state'):
+            if request.GET.get(field):
+                queryset = queryset.filter(**{field: request.GET[field]})
+
+        paginator = Paginator(queryset, conf.TRANSLATIONS_COVERAGE_PAGE_SIZE)
+        try:
+            page = paginator.page(request.GET.get('page', 1))
+        except InvalidPage:
+            raise Http404()
+        return JsonResponse({
+            'count': paginator.count,
+            'page': page.number,
+            'num_pages': paginator.num_pages,
+            'results': list(page),
+        })
+
     def get_urls(self):
         return [
             url(
@@ -427,6 +637,11 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
                 self.translate_in_bulk_step_2,
                 name='translate-in-bulk-step-2',
             ),
+            url(
+                r'translate-in-bulk-step-2/(?P<pk>\d+)/children/$',
+                self.translate_in_bulk_step_2_children,
+                name='translate-in-bulk-step-2-children',
+            ),
             url(
                 r'translate-in-bulk-step-3/$',
                 self.translate_in_bulk_step_3,
@@ -437,6 +652,36 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
                 self.translate_in_bulk_back,
                 name='translate-in-bulk-back',
             ),
+            url(
+                r'coverage/$',
+                self.coverage_view,
+                name='translation-coverage',
+            ),
+            url(
+                r'coverage/api/$',
+                self.coverage_api_view,
+                name='translation-coverage-api',
+            ),
+            url(
+                r'coverage/api/pages/$',
+                self.coverage_pages_view,
+                name='translation-coverage-pages',
+            ),
+            url(
+                r'bulk-actions/(?P<job_id>[0-9a-f]{32})/$',
+                self.bulk_action_view,
+                name='translation-request-bulk-action',
+            ),
+            url(
+                r'bulk-actions/(?P<job_id>[0-9a-f]{32})/api/$',
+                self.bulk_action_api_view,
+                name='translation-request-bulk-action-api',
+            ),
+            url(
+                r'report/$',
+                self.report_view,
+                name='translation-report',
+            ),
             url(
                 r'add/$',
                 views.CreateTranslationRequestView.as_view(),
@@ -477,6 +722,16 @@ class TranslationRequestAdmin(AllReadOnlyFieldsMixin, admin.ModelAdmin):
                 self.pages_sent_view,
                 name='translation-request-pages-sent',
             ),
+            url(
+                r'(?P<pk>\w+)/payload/(?P<field>{})/$'.format('|'.join(PAYLOAD_LOOKUPS)),
+                self.payload_view,
+                name='translation-request-payload',
+            ),
+            url(
+                r'(?P<pk>\w+)/progress/$',
+                self.progress_view,
+                name='translation-request-progress',
+            ),
             url(
                 r'(?P<pk>\w+)/log/$',
                 self.show_log_view,
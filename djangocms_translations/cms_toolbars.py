@@ -1,15 +1,45 @@
 # -*- coding: utf-8 -*-
 from django.conf import settings
 from django.urls import reverse
-from django.utils.translation import get_language_from_request
+from django.utils.lru_cache import lru_cache
+from django.utils.translation import get_language, get_language_from_request
 from django.utils.translation import ugettext_lazy as _
 
 from cms.toolbar_base import CMSToolbar
 from cms.toolbar_pool import toolbar_pool
 
+from .conf import TRANSLATIONS_TOOLBAR_DEFER_TRANSLATE_MENU
 from .utils import get_language_name
 
 
+@lru_cache(maxsize=None)
+def get_menu_skeleton(site_id, current_language, active_language):
+    """
+    Returns the URLs of the translations menu, the page to translate being
+    left as a ``{page_id}`` placeholder. Computed once per process, the
+    active language is part of the key as it prefixes the admin URLs.
+    """
+    overview_url = reverse('admin:djangocms_translations_translationrequest_changelist')
+    coverage_url = reverse('admin:translation-coverage')
+
+    if len(settings.CMS_LANGUAGES[site_id]) >= 2:
+        # Bulk translations work only within a site.
+        bulk_translate_url = reverse('admin:translate-in-bulk-step-1')
+    else:
+        bulk_translate_url = None
+
+    base_url = (
+        '{url}?source_cms_page={{page_id}}&target_cms_page={{page_id}}&source_language={source_language}'
+        .format(url=reverse('admin:create-translation-request'), source_language=current_language)
+    )
+    translate_items = [
+        (_('to {}'.format(get_language_name(code))), '{}&target_language={}'.format(base_url, code))
+        for code, name in settings.LANGUAGES
+        if code != current_language
+    ]
+    return overview_url, coverage_url, bulk_translate_url, base_url, translate_items
+
+
 @toolbar_pool.register
 class TranslationsToolbar(CMSToolbar):
     def populate(self):
@@ -21,21 +51,24 @@ class TranslationsToolbar(CMSToolbar):
         if not page:
             return
 
+        current_language = get_language_from_request(self.request)
+        overview_url, coverage_url, bulk_translate_url, base_url, translate_items = get_menu_skeleton(
+            settings.SITE_ID,
+            current_language,
+            get_language(),
+        )
+
         menu = self.toolbar.get_or_create_menu('djangocms_translations', _('Translations'))
-        overview_url = reverse('admin:djangocms_translations_translationrequest_changelist')
         menu.add_sideframe_item(_('Overview'), url=overview_url)
+        menu.add_sideframe_item(_('Coverage'), url=coverage_url)
 
-        languages_within_this_site = settings.CMS_LANGUAGES[settings.SITE_ID]
-        if len(languages_within_this_site) >= 2:
-            # Bulk translations work only within a site.
-            bulk_translate_url = reverse('admin:translate-in-bulk-step-1')
+        if bulk_translate_url:
             menu.add_modal_item(_('Translate in bulk'), url=bulk_translate_url)
 
-        current_language = get_language_from_request(self.request)
-        base_url = (
-            '{url}?source_cms_page={page_id}&target_cms_page={page_id}&source_language={source_language}'
-            .format(url=reverse('admin:create-translation-request'), page_id=page.pk, source_language=current_language)
-        )
+        if TRANSLATIONS_TOOLBAR_DEFER_TRANSLATE_MENU:
+            # The target language is chosen in the form instead of a submenu.
+            menu.add_modal_item(_('Translate this page'), url=base_url.format(page_id=page.pk), position=1)
+            return
 
         translate_menu = menu.get_or_create_menu(
             'djangocms_translations-translate',
@@ -43,9 +76,5 @@ class TranslationsToolbar(CMSToolbar):
             position=1,
         )
 
-        for language_data in all_languages:
-            code = language_data[0]
-            if code != current_language:
-                name = get_language_name(code)
-                sub_url = '{}&target_language={}'.format(base_url, code)
-                translate_menu.add_modal_item(_('to {}'.format(name)), url=sub_url)
+        for label, url in translate_items:
+            translate_menu.add_modal_item(label, url=url.format(page_id=page.pk))
@@ -1,7 +1,65 @@
 # -*- coding: utf-8 -*-
 from django.conf import settings
+from django.utils.translation import ugettext_lazy as _
 
 
 TRANSLATIONS_CONF = getattr(settings, 'DJANGOCMS_TRANSLATIONS_CONF', {})
 TRANSLATIONS_USE_STAGING = getattr(settings, 'DJANGOCMS_TRANSLATIONS_USE_STAGING', True)
 TRANSLATIONS_BULK_BATCH_SIZE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_BATCH_SIZE', 100)
+TRANSLATIONS_TOOLBAR_DEFER_TRANSLATE_MENU = getattr(
+    settings,
+    'DJANGOCMS_TRANSLATIONS_TOOLBAR_DEFER_TRANSLATE_MENU',
+    False,
+)
+TRANSLATIONS_BULK_ACTION_BATCH_SIZE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_ACTION_BATCH_SIZE', 50)
+TRANSLATIONS_BULK_ACTION_CONCURRENCY = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_ACTION_CONCURRENCY', 4)
+TRANSLATIONS_BULK_ACTION_PROGRESS_TIMEOUT = getattr(
+    settings,
+    'DJANGOCMS_TRANSLATIONS_BULK_ACTION_PROGRESS_TIMEOUT',
+    60 * 60 * 24,
+)
+TRANSLATIONS_INTERACTIVE_QUEUE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_INTERACTIVE_QUEUE', None)
+TRANSLATIONS_BULK_QUEUE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_QUEUE', None)
+TRANSLATIONS_INTERACTIVE_MAX_ITEMS = getattr(settings, 'DJANGOCMS_TRANSLATIONS_INTERACTIVE_MAX_ITEMS', 10)
+TRANSLATIONS_EXPORT_CHUNK_SIZE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_EXPORT_CHUNK_SIZE', 50)
+TRANSLATIONS_BULK_CONCURRENCY = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_CONCURRENCY', 2)
+TRANSLATIONS_BULK_SLOT_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_SLOT_TIMEOUT', 60 * 10)
+TRANSLATIONS_BULK_SLOT_PAGE_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_SLOT_PAGE_TIMEOUT', 60)
+TRANSLATIONS_BULK_SLOT_RETRY_DELAY = getattr(settings, 'DJANGOCMS_TRANSLATIONS_BULK_SLOT_RETRY_DELAY', 5)
+TRANSLATIONS_STALE_DRAFT_AGE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_STALE_DRAFT_AGE', 7)
+TRANSLATIONS_PROGRESS_FLUSH_INTERVAL = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PROGRESS_FLUSH_INTERVAL', 2)
+TRANSLATIONS_PROGRESS_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PROGRESS_TIMEOUT', 60 * 60 * 24 * 7)
+TRANSLATIONS_AUTO_TRANSLATE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE', {})
+TRANSLATIONS_AUTO_TRANSLATE_DELAY = getattr(settings, 'DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE_DELAY', 60 * 60)
+TRANSLATIONS_AUTO_TRANSLATE_PROVIDER = getattr(settings, 'DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE_PROVIDER', None)
+TRANSLATIONS_AUTO_TRANSLATE_USER = getattr(settings, 'DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE_USER', None)
+TRANSLATIONS_PAYLOAD_COMPRESSION = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PAYLOAD_COMPRESSION', 'zlib')
+TRANSLATIONS_PAYLOAD_COMPRESSION_LEVEL = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PAYLOAD_COMPRESSION_LEVEL', None)
+TRANSLATIONS_PAYLOAD_RETENTION_DAYS = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PAYLOAD_RETENTION_DAYS', 90)
+TRANSLATIONS_PAYLOAD_ARCHIVE_BATCH_SIZE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PAYLOAD_ARCHIVE_BATCH_SIZE', 100)
+TRANSLATIONS_PAYLOAD_STORAGE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PAYLOAD_STORAGE', None)
+TRANSLATIONS_PAYLOAD_STORAGE_LOCATION = getattr(
+    settings,
+    'DJANGOCMS_TRANSLATIONS_PAYLOAD_STORAGE_LOCATION',
+    'djangocms_translations/payloads',
+)
+TRANSLATIONS_PAYLOAD_PAGE_SIZE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PAYLOAD_PAGE_SIZE', 50)
+TRANSLATIONS_COVERAGE_PAGE_SIZE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_COVERAGE_PAGE_SIZE', 100)
+TRANSLATIONS_FAKE_API_URL = getattr(settings, 'DJANGOCMS_TRANSLATIONS_FAKE_API_URL', 'http://127.0.0.1:8765/api/')
+TRANSLATIONS_PSEUDO_EXPANSION = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PSEUDO_EXPANSION', 0.3)
+TRANSLATIONS_CACHE = getattr(settings, 'DJANGOCMS_TRANSLATIONS_CACHE', 'default')
+TRANSLATIONS_PRETTY_CACHE_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PRETTY_CACHE_TIMEOUT', 60 * 60 * 24)
+TRANSLATIONS_PROVIDER_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PROVIDER_TIMEOUT', 60)
+TRANSLATIONS_PROVIDER_RATE_LIMIT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PROVIDER_RATE_LIMIT', 5)
+TRANSLATIONS_PROVIDER_RATE_LIMIT_WAIT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PROVIDER_RATE_LIMIT_WAIT', 2)
+TRANSLATIONS_CIRCUIT_BREAKER_THRESHOLD = getattr(settings, 'DJANGOCMS_TRANSLATIONS_CIRCUIT_BREAKER_THRESHOLD', 5)
+TRANSLATIONS_CIRCUIT_BREAKER_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_CIRCUIT_BREAKER_TIMEOUT', 60)
+TRANSLATIONS_QUOTE_PROVIDERS = getattr(settings, 'DJANGOCMS_TRANSLATIONS_QUOTE_PROVIDERS', ())
+TRANSLATIONS_QUOTE_TIMEOUT = getattr(settings, 'DJANGOCMS_TRANSLATIONS_QUOTE_TIMEOUT', 30)
+TRANSLATIONS_PROVIDERS = getattr(settings, 'DJANGOCMS_TRANSLATIONS_PROVIDERS', (
+    (
+        'SupertextTranslationProvider',
+        _('Supertext'),
+        'djangocms_translations.providers.supertext.SupertextTranslationProvider',
+    ),
+))
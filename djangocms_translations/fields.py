@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import json
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from . import conf
+
+
+# Compressed data is recognized by its header, anything else is plain JSON.
+ZLIB_HEADER = b'\x78'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _get_zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImproperlyConfigured('The zstandard package is required for zstd compressed payloads.')
+    return zstandard
+
+
+def compress(data, method=None, level=None):
+    if method is None:
+        method = conf.TRANSLATIONS_PAYLOAD_COMPRESSION
+    if level is None:
+        level = conf.TRANSLATIONS_PAYLOAD_COMPRESSION_LEVEL
+
+    if method == 'zlib':
+        return zlib.compress(data, -1 if level is None else level)
+    elif method == 'zstd':
+        return _get_zstd().ZstdCompressor(level=3 if level is None else level).compress(data)
+    elif method is None:
+        return data
+    raise ImproperlyConfigured('Unknown payload compression {!r}.'.format(method))
+
+
+def decompress(data):
+    if data.startswith(ZSTD_MAGIC):
+        return _get_zstd().ZstdDecompressor().decompress(data)
+    elif data.startswith(ZLIB_HEADER):
+        return zlib.decompress(data)
+    return data
+
+
+class CompressedValue(object):
+    """
+    Compressed JSON read from the database, decoded by ``decode()``.
+    """
+
+    def __init__(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        self.data = bytes(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def decode(self):
+        return json.loads(decompress(self.data).decode('utf-8'))
+
+
+def decode_value(value):
+    # Values read by ``values()`` and ``values_list()`` aren't decoded.
+    if isinstance(value, CompressedValue):
+        return value.decode()
+    return value
+
+
+class CompressedJSONDescriptor(object):
+    """
+    Decodes the value on first access, rows loaded for other fields
+    never decompress it.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        attname = self.field.attname
+
+        if attname not in instance.__dict__:
+            # Deferred.
+            instance.refresh_from_db(fields=[attname])
+
+        value = instance.__dict__[attname]
+
+        if isinstance(value, CompressedValue):
+            value = instance.__dict__[attname] = value.decode()
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedJSONField(models.BinaryField):
+    """
+    Stores a JSON value compressed with ``DJANGOCMS_TRANSLATIONS_PAYLOAD_COMPRESSION``.
+    Values stored with another or without compression are read as well.
+    """
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super(CompressedJSONField, self).contribute_to_class(cls, name, **kwargs)
+        setattr(cls, self.attname, CompressedJSONDescriptor(self))
+
+    def from_db_value(self, value, *args):
+        if value is None:
+            return value
+        return CompressedValue(value)
+
+    def to_python(self, value):
+        return value
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, CompressedValue):
+            # Saved again unchanged.
+            return value.data
+        return compress(json.dumps(value, cls=DjangoJSONEncoder).encode('utf-8'))
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
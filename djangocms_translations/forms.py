@@ -1,54 +1,107 @@
 # -*- coding: utf-8 -*-
 from django import forms
 from django.conf import settings
+from django.db.models import Prefetch, Q
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 
 from cms.forms.fields import PageSelectFormField
-from cms.models import Page
+from cms.models import Page, Title, TreeNode
 
 from . import models
+from .tasks import queue_submission
 from .utils import get_page_url
 
 
+# A page is eligible when none of its ancestors lacks one of the languages,
+# the page itself is checked by the ORM filters. The ancestors are looked up
+# by the prefixes of the node path, so that the index of ``path`` is used.
+ELIGIBLE_PAGES_SQL = """
+NOT EXISTS (
+    SELECT 1 FROM {node} node
+    INNER JOIN {node} ancestor
+        ON ancestor.path = ANY(ARRAY(
+            SELECT substr(node.path, 1, {steplen} * level) FROM generate_series(1, node.depth - 1) level
+        ))
+    INNER JOIN {page} ancestor_page
+        ON ancestor_page.node_id = ancestor.id AND ancestor_page.publisher_is_draft
+    WHERE node.id = {page}.node_id AND (
+        NOT EXISTS (
+            SELECT 1 FROM {title} WHERE page_id = ancestor_page.id AND language = %s
+        ) OR NOT EXISTS (
+            SELECT 1 FROM {title} WHERE page_id = ancestor_page.id AND language = %s
+        )
+    )
+)
+""".format(
+    node=TreeNode._meta.db_table,
+    page=Page._meta.db_table,
+    title=Title._meta.db_table,
+    steplen=TreeNode.steplen,
+)
+
+
 def _get_bulk_request_eligible_pages(source_language, target_language):
-    base_qs = (
+    return (
         Page.objects
         .drafts()
-        .select_related('node__parent')
         .filter(node__site=settings.SITE_ID)
         .filter(title_set__language__in=[source_language])
         .filter(title_set__language__in=[target_language])
+        .extra(where=[ELIGIBLE_PAGES_SQL], params=[source_language, target_language])
         .order_by('node__path')
     )
-    ids_by_path = {}
-    for page in base_qs.iterator():
-        parent_node = page.node.parent
-        if parent_node:
-            if parent_node.path in ids_by_path:
-                ids_by_path[page.node.path] = page.pk
-        else:
-            ids_by_path[page.node.path] = page.pk
-    return base_qs.filter(pk__in=ids_by_path.values())
+
+
+def get_bulk_request_page_tree(source_language, target_language, parent=None):
+    """
+    Returns the eligible pages one level below ``parent`` (the root pages without),
+    with their titles in both languages fetched by a single extra query.
+    """
+    titles = Title.objects.filter(language__in=[source_language, target_language])
+    pages = (
+        _get_bulk_request_eligible_pages(source_language, target_language)
+        .select_related('node__site')
+        .prefetch_related(Prefetch('title_set', queryset=titles, to_attr='bulk_request_titles'))
+    )
+
+    if parent is None:
+        pages = pages.filter(node__depth=1)
+    else:
+        pages = pages.filter(node__parent=parent.node_id)
+
+    pages = list(pages)
+    for page in pages:
+        # Used by get_title() and get_absolute_url().
+        page.title_cache = {title.language: title for title in page.bulk_request_titles}
+    return pages
 
 
 class PageTreeMultipleChoiceField(forms.ModelMultipleChoiceField):
     widget = forms.CheckboxSelectMultiple
     INDENT = 8
 
+    def get_tree_choices(self, parent=None):
+        return [
+            (page.pk, self.label_from_instance(page))
+            for page in get_bulk_request_page_tree(self.source_language, self.target_language, parent)
+        ]
+
     def label_from_instance(self, obj):
         source_link = get_page_url(obj, self.source_language)
         target_link = get_page_url(obj, self.target_language)
 
         return format_html(
-            '<span data-path="{path}"></span>'
-            '{indent}{title} '
+            '<span data-path="{path}" data-pk="{pk}"></span>'
+            '{indent}{expand}{title} '
             '<a class="select-children">{button_label}</a>'
             '<a href="{source_link}" target="_blank">{source_language}</a>'
             '<a href="{target_link}" target="_blank">{target_language}</a>',
             path=obj.node.path,
+            pk=obj.pk,
             indent=mark_safe('&nbsp;' * (obj.node.depth - 1) * self.INDENT),
+            expand=mark_safe('<a class="expand" href="#">+</a> ' if obj.node.numchild else ''),
             title=obj.get_title(self.source_language),
             button_label=_('Select with children'),
             source_link=source_link,
@@ -145,20 +198,43 @@ class TranslateInBulkStep1Form(forms.ModelForm):
 class TranslateInBulkStep2Form(forms.Form):
     """ Step 2: adds <TranslationRequestItem>s to <TranslationRequest> created on Step 1. """
 
-    pages = PageTreeMultipleChoiceField(Page.objects.drafts())
+    pages = PageTreeMultipleChoiceField(Page.objects.drafts(), required=False)
+    # Pages selected with all their descendants, which might not be loaded yet.
+    subtrees = forms.ModelMultipleChoiceField(
+        Page.objects.drafts(),
+        required=False,
+        widget=forms.MultipleHiddenInput,
+    )
 
     def __init__(self, *args, **kwargs):
         self.translation_request = kwargs.pop('translation_request')
         super(TranslateInBulkStep2Form, self).__init__(*args, **kwargs)
 
+        source_language = self.translation_request.source_language
+        target_language = self.translation_request.target_language
+        eligible_pages = _get_bulk_request_eligible_pages(source_language, target_language)
+
         pages_field = self.fields['pages']
-        pages_field.source_language = self.translation_request.source_language
-        pages_field.target_language = self.translation_request.target_language
-        pages_field.queryset = (
-            _get_bulk_request_eligible_pages(pages_field.source_language, pages_field.target_language)
-            .order_by('node__path')
-            .select_related('node__site')
-        )
+        pages_field.source_language = source_language
+        pages_field.target_language = target_language
+        pages_field.queryset = eligible_pages
+        # The node paths of the subtrees are read in clean().
+        self.fields['subtrees'].queryset = eligible_pages.select_related('node')
+        # Only the root pages are rendered, their children are loaded on demand.
+        pages_field.widget.choices = pages_field.get_tree_choices()
+
+    def clean(self):
+        cleaned_data = super(TranslateInBulkStep2Form, self).clean()
+        query = Q(pk__in=[page.pk for page in cleaned_data.get('pages', ())])
+
+        for page in cleaned_data.get('subtrees', ()):
+            query |= Q(node__path__startswith=page.node.path)
+
+        cleaned_data['pages'] = list(self.fields['pages'].queryset.filter(query))
+
+        if not cleaned_data['pages']:
+            raise forms.ValidationError(_('Please select at least one page.'))
+        return cleaned_data
 
     def save(self, *args, **kwargs):
         translation_request_items = [
@@ -170,6 +246,7 @@ class TranslateInBulkStep2Form(forms.Form):
             for page in self.cleaned_data['pages']
         ]
         models.TranslationRequestItem.objects.bulk_create(translation_request_items)
+        self.translation_request.update_item_count()
         self.translation_request.set_provider_order_name(self.cleaned_data['pages'][0])
 
 
@@ -186,15 +263,12 @@ class TranslateInBulkStep3Form(forms.Form):
         self.fields['delivery_time'].choices = self.translation_request.provider.get_delivery_time_choices()
 
     def save(self, *args, **kwargs):
-        self.translation_request.set_content_from_cms()
-        self.translation_request.set_request_content()
         self.translation_request.set_provider_options(
             order_type=self.cleaned_data['order_type'],
             delivery_time=self.cleaned_data['delivery_time'],
             additional_info=_('Order without quote'),
         )
-        self.translation_request.set_status(models.TranslationRequest.STATES.READY_FOR_SUBMISSION)
-        self.translation_request.submit_request()
+        queue_submission(self.translation_request.pk, export=True)
 
 
 class ChooseTranslationQuoteForm(forms.ModelForm):
@@ -211,9 +285,11 @@ class ChooseTranslationQuoteForm(forms.ModelForm):
         return format_html(_(
             '<strong>{}</strong><br>'
             '{}<br><br>'
+            'Provider: {}<br>'
             'Delivery until: {}<br>'
             'Price: {} {}'
-        ), obj.name, obj.description, obj.delivery_date, obj.price_currency, obj.price_amount)
+        ), obj.name, obj.description, obj.get_provider_backend_display(), obj.delivery_date,
+            obj.price_currency, obj.price_amount)
 
     def fix_widget_choices(self):
         widget = self.fields['selected_quote'].widget
@@ -228,3 +304,9 @@ class ChooseTranslationQuoteForm(forms.ModelForm):
         self.fields['selected_quote'].queryset = self.instance.quotes.all()
         self.fields['selected_quote'].empty_label = None
         self.fix_widget_choices()
+
+    def save(self, commit=True):
+        # Saving every field would overwrite state changes made meanwhile.
+        if commit:
+            self.instance.save(update_fields=('selected_quote',))
+        return self.instance
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from django.core.management.base import BaseCommand
+
+from ... import conf
+from ...payloads import archive_old_payloads
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves the payloads of imported or cancelled translation requests created more than '
+        '--days days ago to compressed files of the payload storage.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=conf.TRANSLATIONS_PAYLOAD_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=conf.TRANSLATIONS_PAYLOAD_ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        archived = archive_old_payloads(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write('Archived the payloads of {} translation requests.'.format(archived))
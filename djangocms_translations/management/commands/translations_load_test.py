@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils.six.moves.urllib.parse import urlparse
+
+from cms.models import Page
+
+from ... import conf
+from ...models import TranslationRequest
+from ...providers import get_provider_choices
+from ...providers.fake import (
+    FakeSupertextApp, FakeSupertextTranslationProvider,
+    start_fake_supertext_server,
+)
+
+
+STAGES = ('export', 'quote', 'submit', 'import', 'turnaround')
+CALLBACK_ATTEMPTS = 50
+IMPORT_PENDING_STATES = (
+    TranslationRequest.STATES.IN_TRANSLATION,
+    TranslationRequest.STATES.IMPORT_STARTED,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives translation requests through export, quote, submit, callback and import '
+        'against a local fake Supertext server and reports throughput and latency per stage. '
+        'Imported plugins are appended to the given pages, use a disposable database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('page_ids', nargs='+', type=int, help='Draft pages used as source and target.')
+        parser.add_argument('--source-language', required=True)
+        parser.add_argument('--target-language', required=True)
+        parser.add_argument('--requests', type=int, default=10, help='Number of translation requests.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Number of requests in flight.')
+        parser.add_argument('--latency', type=float, default=0, help='Simulated provider latency in seconds.')
+        parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait for each callback.')
+        parser.add_argument('--username', help='Owner of the requests, defaults to the first superuser.')
+
+    def handle(self, *args, **options):
+        if FakeSupertextTranslationProvider.__name__ not in dict(get_provider_choices()):
+            raise CommandError('{} is not registered in DJANGOCMS_TRANSLATIONS_PROVIDERS.'.format(
+                FakeSupertextTranslationProvider.__name__,
+            ))
+
+        self.options = options
+        self.pages = list(Page.objects.drafts().filter(pk__in=options['page_ids']))
+
+        if not self.pages:
+            raise CommandError('No draft pages found for {}.'.format(options['page_ids']))
+
+        if options['username']:
+            self.user = User.objects.get(username=options['username'])
+        else:
+            self.user = User.objects.filter(is_superuser=True).order_by('pk').first()
+
+        self.timings = defaultdict(list)
+        self.imported = {}
+        self.lock = threading.Lock()
+
+        api_url = urlparse(conf.TRANSLATIONS_FAKE_API_URL)
+        app = FakeSupertextApp(latency=options['latency'], send_callback=self.deliver_callback)
+        server = start_fake_supertext_server(app, host=api_url.hostname, port=api_url.port)
+
+        started = time.time()
+        pool = ThreadPool(options['concurrency'])
+        try:
+            results = pool.map(self.run_pipeline, range(options['requests']))
+        finally:
+            pool.close()
+            server.shutdown()
+        elapsed = time.time() - started
+
+        self.report(results, elapsed)
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.time()
+        yield
+        with self.lock:
+            self.timings[stage].append(time.time() - started)
+
+    def run_pipeline(self, index):
+        page = self.pages[index % len(self.pages)]
+
+        try:
+            translation_request = TranslationRequest.objects.create(
+                user=self.user,
+                source_language=self.options['source_language'],
+                target_language=self.options['target_language'],
+                provider_backend=FakeSupertextTranslationProvider.__name__,
+            )
+            translation_request.items.create(source_cms_page=page, target_cms_page=page)
+            translation_request.set_provider_order_name(page)
+            imported = self.imported[translation_request.pk] = threading.Event()
+
+            with self.timer('export'):
+                translation_request.set_content_from_cms()
+
+            with self.timer('quote'):
+                translation_request.get_quote_from_provider()
+
+            with self.timer('turnaround'):
+                with self.timer('submit'):
+                    translation_request.selected_quote = translation_request.quotes.order_by('price_amount').first()
+                    translation_request.save(update_fields=('selected_quote',))
+                    translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+                    translation_request.submit_request()
+                if not imported.wait(self.options['timeout']):
+                    return False
+                return self.wait_for_import(translation_request)
+        except Exception as error:
+            self.stderr.write('Request #{} failed: {!r}'.format(index, error))
+            return False
+        finally:
+            connection.close()
+
+    def wait_for_import(self, translation_request):
+        # The callback view queues the import, it runs right away on eager workers only.
+        deadline = time.time() + self.options['timeout']
+
+        while True:
+            translation_request.refresh_from_db(fields=['state'])
+            if translation_request.state not in IMPORT_PENDING_STATES or time.time() > deadline:
+                return translation_request.state == TranslationRequest.STATES.IMPORTED
+            time.sleep(0.1)
+
+    def deliver_callback(self, url, body):
+        # Dispatch straight to the callback view instead of going through
+        # a running web server.
+        path = urlparse(url).path
+        match = resolve(path)
+
+        try:
+            for attempt in range(CALLBACK_ATTEMPTS):
+                request = RequestFactory().post(path, data=body, content_type='application/json')
+                try:
+                    with self.timer('import'):
+                        match.func(request, *match.args, **match.kwargs)
+                except Http404:
+                    # The request is not marked as in translation yet.
+                    time.sleep(0.1)
+                except Exception as error:
+                    self.stderr.write('Callback {} failed: {!r}'.format(path, error))
+                    break
+                else:
+                    break
+        finally:
+            connection.close()
+            self.imported[int(match.kwargs['pk'])].set()
+
+    def report(self, results, elapsed):
+        succeeded = results.count(True)
+        self.stdout.write('{} requests, {} succeeded, {} failed in {:.2f}s ({:.2f} requests/s)'.format(
+            len(results),
+            succeeded,
+            len(results) - succeeded,
+            elapsed,
+            succeeded / elapsed if elapsed else 0,
+        ))
+        self.stdout.write('{:<12}{:>8}{:>12}{:>12}{:>12}{:>12}'.format(
+            'stage', 'count', 'mean ms', 'p50 ms', 'p95 ms', 'max ms',
+        ))
+
+        for stage in STAGES:
+            timings = sorted(self.timings[stage])
+
+            if not timings:
+                continue
+
+            def percentile(value):
+                return timings[min(len(timings) - 1, int(len(timings) * value))] * 1000
+
+            self.stdout.write('{:<12}{:>8}{:>12.1f}{:>12.1f}{:>12.1f}{:>12.1f}'.format(
+                stage,
+                len(timings),
+                sum(timings) / len(timings) * 1000,
+                percentile(0.5),
+                percentile(0.95),
+                timings[-1] * 1000,
+            ))
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import conf
+from ...forms import _get_bulk_request_eligible_pages
+from ...models import TranslationRequest, TranslationRequestItem
+from ...providers import get_provider_choices
+from ...providers.pseudo import PseudoTranslationProvider
+
+
+class Command(BaseCommand):
+    help = (
+        'Pseudo-localizes every page of the current site having both languages, '
+        'in batches of bulk translation requests, and reports the throughput.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source-language', required=True)
+        parser.add_argument('--target-language', required=True)
+        parser.add_argument('--batch-size', type=int, default=conf.TRANSLATIONS_BULK_BATCH_SIZE)
+        parser.add_argument('--username', help='Owner of the requests, defaults to the first superuser.')
+
+    def handle(self, *args, **options):
+        if PseudoTranslationProvider.__name__ not in dict(get_provider_choices()):
+            raise CommandError('{} is not registered in DJANGOCMS_TRANSLATIONS_PROVIDERS.'.format(
+                PseudoTranslationProvider.__name__,
+            ))
+
+        source_language = options['source_language']
+        target_language = options['target_language']
+        batch_size = options['batch_size']
+
+        if options['username']:
+            user = User.objects.get(username=options['username'])
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('pk').first()
+
+        pages = list(_get_bulk_request_eligible_pages(source_language, target_language))
+
+        if not pages:
+            raise CommandError('No eligible pages found for this configuration.')
+
+        export_time = 0
+        import_time = 0
+        failed = 0
+
+        for start in range(0, len(pages), batch_size):
+            batch = pages[start:start + batch_size]
+            translation_request = TranslationRequest.objects.create(
+                user=user,
+                source_language=source_language,
+                target_language=target_language,
+                provider_backend=PseudoTranslationProvider.__name__,
+            )
+            TranslationRequestItem.objects.bulk_create([
+                TranslationRequestItem(
+                    translation_request=translation_request,
+                    source_cms_page=page,
+                    target_cms_page=page,
+                )
+                for page in batch
+            ])
+            translation_request.update_item_count()
+            translation_request.set_provider_order_name(batch[0])
+
+            started = time.time()
+            translation_request.set_content_from_cms()
+            translation_request.set_request_content()
+            exported = time.time()
+            translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+            translation_request.submit_request()
+            imported = time.time()
+
+            export_time += exported - started
+            import_time += imported - exported
+
+            if translation_request.state != TranslationRequest.STATES.IMPORTED:
+                failed += len(batch)
+
+            self.stdout.write('{}: {} pages, export {:.2f}s, import {:.2f}s, {}'.format(
+                translation_request.provider_order_name,
+                len(batch),
+                exported - started,
+                imported - exported,
+                translation_request.get_state_display(),
+            ))
+
+        total_time = export_time + import_time
+        self.stdout.write('{} pages ({} failed) in {:.2f}s: export {:.1f} pages/s, import {:.1f} pages/s'.format(
+            len(pages),
+            failed,
+            total_time,
+            len(pages) / export_time if export_time else 0,
+            len(pages) / import_time if import_time else 0,
+        ))
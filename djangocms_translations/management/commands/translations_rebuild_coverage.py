@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cms.models import Page
+from cms.utils.i18n import get_language_list
+
+from ...models import TranslationCoverage
+
+
+class Command(BaseCommand):
+    help = (
+        'Adds the missing rows of the translation coverage index for the current site. '
+        'Existing rows are kept up to date incrementally and left untouched.'
+    )
+
+    def handle(self, *args, **options):
+        site_id = settings.SITE_ID
+        pages = Page.objects.drafts().filter(node__site=site_id)
+        languages_by_page = {}
+
+        for page_id, language in pages.values_list('pk', 'title_set__language'):
+            languages_by_page.setdefault(page_id, set()).add(language)
+
+        existing = set(
+            TranslationCoverage.objects
+            .filter(site=site_id)
+            .values_list('page', 'language')
+        )
+        coverage = [
+            TranslationCoverage(
+                site_id=site_id,
+                page_id=page_id,
+                language=language,
+                state=(
+                    TranslationCoverage.STATES.PRESENT
+                    if language in page_languages
+                    else TranslationCoverage.STATES.MISSING
+                ),
+            )
+            for page_id, page_languages in languages_by_page.items()
+            for language in get_language_list(site_id)
+            if (page_id, language) not in existing
+        ]
+        TranslationCoverage.objects.bulk_create(coverage, batch_size=1000)
+        self.stdout.write('Added {} coverage rows.'.format(len(coverage)))
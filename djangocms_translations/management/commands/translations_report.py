@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...reports import REPORT_FORMATS, get_report_rows, parse_report_date
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the translation requests with their pages, languages, word count and price '
+        'as CSV or JSON, streaming rows from the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(REPORT_FORMATS), default='csv')
+        parser.add_argument('--from', dest='date_from', type=parse_report_date, help='First creation day.')
+        parser.add_argument('--to', dest='date_to', type=parse_report_date, help='Last creation day.')
+        parser.add_argument('--output', help='File to write to, defaults to stdout.')
+
+    def handle(self, *args, **options):
+        if options['date_from'] and options['date_to'] and options['date_from'] > options['date_to']:
+            raise CommandError('--from must not be after --to.')
+
+        content_type, iter_report = REPORT_FORMATS[options['format']]
+        chunks = iter_report(get_report_rows(options['date_from'], options['date_to']))
+
+        if options['output']:
+            with io.open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from djangocms_translations.providers import get_provider_choices
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0009_auto_20181220_0902'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='translationrequest',
+            name='provider_backend',
+            field=models.CharField(choices=get_provider_choices(), max_length=100),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from djangocms_translations.providers import get_provider_choices
+
+
+def set_provider_backend(apps, schema_editor):
+    TranslationQuote = apps.get_model('djangocms_translations', 'TranslationQuote')
+    TranslationRequest = apps.get_model('djangocms_translations', 'TranslationRequest')
+    provider_backend = TranslationRequest.objects.filter(
+        pk=models.OuterRef('request_id'),
+    ).values('provider_backend')[:1]
+    TranslationQuote.objects.update(provider_backend=models.Subquery(provider_backend))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0011_auto_20261019_0930'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationquote',
+            name='provider_backend',
+            field=models.CharField(blank=True, choices=get_provider_choices(), max_length=100),
+        ),
+        migrations.RunPython(set_provider_backend, migrations.RunPython.noop),
+    ]
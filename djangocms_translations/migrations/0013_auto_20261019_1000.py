@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0012_translationquote_provider_backend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationrequest',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            '''
+            UPDATE djangocms_translations_translationrequest
+            SET item_count = (
+                SELECT COUNT(*) FROM djangocms_translations_translationrequestitem
+                WHERE djangocms_translations_translationrequestitem.translation_request_id =
+                    djangocms_translations_translationrequest.id
+            )
+            ''',
+            migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='translationrequest',
+            name='date_created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='translationrequest',
+            name='state',
+            field=models.CharField(choices=[('draft', 'Draft'), ('open', 'Open'), ('pending_quote', 'Pending quote from provider'), ('pending_approval', 'Pending approval of quote'), ('ready_for_submission', 'Pending submission to translation provider'), ('in_translation', 'In translation'), ('import_started', 'Import started'), ('import_failed', 'Import failed'), ('imported', 'Imported'), ('cancelled', 'Cancelled')], db_index=True, default='draft', max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='translationrequest',
+            index=models.Index(fields=['state', '-date_created'], name='djangocms_tr_state_date_idx'),
+        ),
+    ]
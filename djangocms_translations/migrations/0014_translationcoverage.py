@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import cms.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0018_pagenode'),
+        ('sites', '0002_alter_domain_unique'),
+        ('djangocms_translations', '0013_auto_20261019_1000'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationCoverage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(choices=settings.LANGUAGES, max_length=10)),
+                ('state', models.CharField(choices=[('missing', 'Missing'), ('present', 'Present'), ('in_translation', 'In translation'), ('translated', 'Translated'), ('stale', 'Stale')], default='missing', max_length=100)),
+                ('source_language', models.CharField(blank=True, choices=settings.LANGUAGES, max_length=10)),
+                ('source_fingerprint', models.CharField(blank=True, max_length=40)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('last_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='djangocms_translations.TranslationRequest')),
+                ('page', cms.models.fields.PageField(on_delete=django.db.models.deletion.CASCADE, related_name='translation_coverage', to='cms.Page')),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sites.Site')),
+                ('source_page', cms.models.fields.PageField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cms.Page')),
+            ],
+            options={
+                'default_permissions': '',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='translationcoverage',
+            index=models.Index(fields=['site', 'language', 'state'], name='djangocms_tr_coverage_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='translationcoverage',
+            unique_together={('page', 'language')},
+        ),
+    ]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0014_translationcoverage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationrequestitem',
+            name='date_archived',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationrequestitem',
+            name='date_exported',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationrequestitem',
+            name='date_imported',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='translationrequestitem',
+            name='export_content',
+            field=django.contrib.postgres.fields.jsonb.JSONField(
+                blank=True,
+                default=list,
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+            ),
+        ),
+    ]
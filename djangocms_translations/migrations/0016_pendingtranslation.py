@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import cms.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0018_pagenode'),
+        ('djangocms_translations', '0015_auto_20261019_1100'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingTranslation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_language', models.CharField(choices=settings.LANGUAGES, max_length=10)),
+                ('target_language', models.CharField(choices=settings.LANGUAGES, max_length=10)),
+                ('date_published', models.DateTimeField(db_index=True)),
+                ('page', cms.models.fields.PageField(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cms.Page')),
+            ],
+            options={
+                'default_permissions': '',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='pendingtranslation',
+            unique_together={('page', 'source_language', 'target_language')},
+        ),
+    ]
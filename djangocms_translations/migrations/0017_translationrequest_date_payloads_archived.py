@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0016_pendingtranslation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationrequest',
+            name='date_payloads_archived',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
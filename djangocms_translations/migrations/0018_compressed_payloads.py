@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+import djangocms_translations.fields
+
+
+PAYLOAD_COLUMNS = (
+    ('djangocms_translations_translationrequest', ('export_content', 'request_content')),
+    ('djangocms_translations_translationorder', ('request_content', 'response_content')),
+)
+BATCH_SIZE = 100
+
+
+def _convert_payloads(schema_editor, convert):
+    connection = schema_editor.connection
+
+    for table, columns in PAYLOAD_COLUMNS:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT id FROM {} ORDER BY id'.format(table))
+            ids = [row[0] for row in cursor.fetchall()]
+
+        for start in range(0, len(ids), BATCH_SIZE):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT id, {} FROM {} WHERE id IN %s'.format(', '.join(columns), table),
+                    [tuple(ids[start:start + BATCH_SIZE])],
+                )
+                rows = cursor.fetchall()
+
+                for row in rows:
+                    cursor.execute(
+                        'UPDATE {} SET {} WHERE id = %s'.format(
+                            table,
+                            ', '.join('{} = %s'.format(column) for column in columns),
+                        ),
+                        [
+                            connection.Database.Binary(convert(bytes(value)))
+                            for value in row[1:]
+                        ] + [row[0]],
+                    )
+
+
+def compress_payloads(apps, schema_editor):
+    _convert_payloads(schema_editor, djangocms_translations.fields.compress)
+
+
+def decompress_payloads(apps, schema_editor):
+    _convert_payloads(schema_editor, djangocms_translations.fields.decompress)
+
+
+def _alter_columns(column_type, using):
+    return [
+        'ALTER TABLE {table} ALTER COLUMN {column} TYPE {type} USING {using}'.format(
+            table=table,
+            column=column,
+            type=column_type,
+            using=using.format(column),
+        )
+        for table, columns in PAYLOAD_COLUMNS
+        for column in columns
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0017_translationrequest_date_payloads_archived'),
+    ]
+
+    operations = [
+        # The admin read the order id from the response content of older orders,
+        # compressed content can't be queried.
+        migrations.RunSQL(
+            "UPDATE djangocms_translations_translationorder "
+            "SET provider_details = provider_details || jsonb_build_object('Id', response_content -> 'Id') "
+            "WHERE jsonb_typeof(response_content) = 'object' AND response_content ? 'Id' "
+            "AND NOT provider_details ? 'Id'",
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            _alter_columns('bytea', "convert_to({}::text, 'UTF8')"),
+            _alter_columns('jsonb', "convert_from({}, 'UTF8')::jsonb"),
+            state_operations=[
+                migrations.AlterField(
+                    model_name='translationorder',
+                    name='request_content',
+                    field=djangocms_translations.fields.CompressedJSONField(blank=True, default=dict),
+                ),
+                migrations.AlterField(
+                    model_name='translationorder',
+                    name='response_content',
+                    field=djangocms_translations.fields.CompressedJSONField(blank=True, default=dict),
+                ),
+                migrations.AlterField(
+                    model_name='translationrequest',
+                    name='export_content',
+                    field=djangocms_translations.fields.CompressedJSONField(blank=True, default=dict),
+                ),
+                migrations.AlterField(
+                    model_name='translationrequest',
+                    name='request_content',
+                    field=djangocms_translations.fields.CompressedJSONField(blank=True, default=dict),
+                ),
+            ],
+        ),
+        migrations.RunPython(compress_payloads, decompress_payloads),
+    ]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from djangocms_translations.utils import get_content_fingerprint
+
+
+def set_export_fingerprints(apps, schema_editor):
+    TranslationRequestItem = apps.get_model('djangocms_translations', 'TranslationRequestItem')
+    items = (
+        TranslationRequestItem.objects
+        .filter(date_exported__isnull=False)
+        .exclude(export_content=[])
+        .only('pk', 'export_content')
+    )
+
+    for item in items.iterator():
+        TranslationRequestItem.objects.filter(pk=item.pk).update(
+            export_fingerprint=get_content_fingerprint(item.export_content),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0018_compressed_payloads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationrequestitem',
+            name='export_fingerprint',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.RunPython(set_export_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_translations', '0019_translationrequestitem_export_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationcoverage',
+            name='previous_state',
+            field=models.CharField(blank=True, choices=[('missing', 'Missing'), ('present', 'Present'), ('in_translation', 'In translation'), ('translated', 'Translated'), ('stale', 'Stale')], max_length=100),
+        ),
+    ]
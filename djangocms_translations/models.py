@@ -3,33 +3,74 @@ from __future__ import unicode_literals
 
 import json
 import logging
+import time
+from datetime import timedelta
+from multiprocessing import TimeoutError
+from multiprocessing.pool import ThreadPool
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.postgres.fields import JSONField
+from django.contrib.sites.models import Site
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
-from cms.models import CMSPlugin
+from cms.models import CMSPlugin, Page, Title
 from cms.models.fields import PageField, PlaceholderField
+from cms.signals import post_publish
 from cms.utils.plugins import copy_plugins_to_placeholder
 
-from djangocms_transfer.exporter import get_page_export_data
 from djangocms_transfer.importer import import_plugins_to_page
 from djangocms_transfer.utils import get_plugin_class
 from extended_choices import Choices
 
-from .providers import TRANSLATION_PROVIDERS, SupertextTranslationProvider
-from .utils import get_plugin_form
+from . import conf
+from .fields import CompressedJSONField
+from .progress import ProgressTracker, set_progress
+from .providers import get_provider_choices, get_provider_class
+from .providers.base import ProviderException, ProviderUnavailable
+from .utils import (
+    get_content_fingerprint, get_page_export_data, get_plugin_form,
+)
 
 
 logger = logging.getLogger('djangocms_translations')
 
 
+class PayloadQuerySet(models.QuerySet):
+
+    def defer_payloads(self, *relations):
+        """
+        Defers the ``PAYLOAD_FIELDS`` of the model and of the given ``relations``.
+        These columns can be megabytes each and are only loaded when accessed.
+        """
+        fields = list(self.model.PAYLOAD_FIELDS)
+
+        for relation in relations:
+            related_model = self.model._meta.get_field(relation).related_model
+            fields.extend('{}__{}'.format(relation, field) for field in related_model.PAYLOAD_FIELDS)
+        return self.defer(*fields)
+
+
+class InvalidTransition(Exception):
+    """
+    The translation request cannot change to the requested state.
+    """
+
+
+class TransitionConflict(InvalidTransition):
+    """
+    The state of the translation request was changed by another process meanwhile.
+    """
+
+
 def _get_placeholder_slot(archived_placeholder):
     return archived_placeholder.slot
 
@@ -47,14 +88,28 @@ class TranslationRequest(models.Model):
         ('IMPORTED', 'imported', _('Imported')),
         ('CANCELLED', 'cancelled', _('Cancelled')),
     )
-
-    PROVIDERS = Choices(
-        ('SUPERTEXT', SupertextTranslationProvider.__name__, _('Supertext')),
-    )
+    TRANSITIONS = {
+        STATES.DRAFT: (STATES.OPEN, STATES.CANCELLED),
+        STATES.OPEN: (STATES.PENDING_QUOTE, STATES.READY_FOR_SUBMISSION, STATES.CANCELLED),
+        STATES.PENDING_QUOTE: (STATES.PENDING_QUOTE, STATES.PENDING_APPROVAL, STATES.CANCELLED),
+        STATES.PENDING_APPROVAL: (STATES.READY_FOR_SUBMISSION, STATES.CANCELLED),
+        STATES.READY_FOR_SUBMISSION: (STATES.IN_TRANSLATION, STATES.CANCELLED),
+        # Back to READY_FOR_SUBMISSION when sending the order failed.
+        STATES.IN_TRANSLATION: (STATES.READY_FOR_SUBMISSION, STATES.IMPORT_STARTED, STATES.CANCELLED),
+        # Again IMPORT_STARTED when resuming an interrupted import.
+        STATES.IMPORT_STARTED: (STATES.IMPORT_STARTED, STATES.IMPORTED, STATES.IMPORT_FAILED),
+        STATES.IMPORT_FAILED: (STATES.IMPORT_STARTED, STATES.IMPORTED, STATES.CANCELLED),
+        STATES.IMPORTED: (),
+        STATES.CANCELLED: (),
+    }
+
+    # Only names and labels, the provider classes are imported on first use.
+    PROVIDERS = get_provider_choices()
+    PAYLOAD_FIELDS = ('export_content', 'request_content')
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    state = models.CharField(choices=STATES, default=STATES.DRAFT, max_length=100)
-    date_created = models.DateTimeField(auto_now_add=True)
+    state = models.CharField(choices=STATES, default=STATES.DRAFT, max_length=100, db_index=True)
+    date_created = models.DateTimeField(auto_now_add=True, db_index=True)
     date_submitted = models.DateTimeField(blank=True, null=True)
     date_received = models.DateTimeField(blank=True, null=True)
     date_imported = models.DateTimeField(blank=True, null=True)
@@ -63,9 +118,21 @@ class TranslationRequest(models.Model):
     provider_backend = models.CharField(max_length=100, choices=PROVIDERS)
     provider_order_name = models.CharField(max_length=255, blank=True)
     provider_options = JSONField(default=dict, blank=True)
-    export_content = JSONField(default=dict, blank=True)
-    request_content = JSONField(default=dict, blank=True)
+    export_content = CompressedJSONField(default=dict, blank=True)
+    request_content = CompressedJSONField(default=dict, blank=True)
     selected_quote = models.ForeignKey('TranslationQuote', blank=True, null=True, on_delete=models.CASCADE)
+    # Denormalized count of ``items``, see ``update_item_count()``.
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+    # The payloads were moved to the payload storage, see ``payloads.archive_payloads()``.
+    date_payloads_archived = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = PayloadQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # The changelist filters by state and sorts by creation date.
+            models.Index(fields=['state', '-date_created'], name='djangocms_tr_state_date_idx'),
+        ]
 
     @property
     def status(self):
@@ -74,18 +141,50 @@ class TranslationRequest(models.Model):
     @property
     def provider(self):
         if not self._provider and self.provider_backend:
-            self._provider = TRANSLATION_PROVIDERS.get(self.provider_backend)(self)
+            self._provider = get_provider_class(self.provider_backend)(self)
         return self._provider
     _provider = None
 
-    def set_status(self, status, commit=True):
+    def can_transition(self, status):
+        return status in self.TRANSITIONS[self.state]
+
+    def set_status(self, status, commit=True, update_fields=()):
+        """
+        Changes the state along ``TRANSITIONS``, saving ``update_fields`` as well.
+        The row is only updated if its state is still the one of this instance,
+        otherwise ``TransitionConflict`` is raised and nothing is saved.
+        """
         assert status in self.STATES.values, _('Invalid status')
-        self.state = status
+
+        if not self.can_transition(status):
+            raise InvalidTransition('Cannot change the state of request {} from {} to {}.'.format(
+                self.pk, self.state, status,
+            ))
 
         if commit:
-            self.save(update_fields=('state',))
+            values = {field: getattr(self, field) for field in update_fields}
+            updated = (
+                TranslationRequest.objects
+                .filter(pk=self.pk, state=self.state)
+                .update(state=status, **values)
+            )
+
+            if not updated:
+                raise TransitionConflict('The state of request {} changed from {} meanwhile.'.format(
+                    self.pk, self.state,
+                ))
+            self.state = status
+            set_progress(self.pk, state=status)
+            TranslationCoverage.update_for_request(self)
+        else:
+            self.state = status
         return not status == self.STATES.IMPORT_FAILED
 
+    def update_item_count(self):
+        # Items added with ``bulk_create()`` don't send signals.
+        self.item_count = self.items.count()
+        self.save(update_fields=('item_count',))
+
     def set_provider_order_name(self, source_page):
         initial_page_title = source_page.get_page_title(self.source_language)
         request_item_count = self.items.count()
@@ -97,57 +196,146 @@ class TranslationRequest(models.Model):
         self.provider_order_name = _('Order #{} - {}{}').format(self.pk, initial_page_title, bulk_text)
         self.save(update_fields=('provider_order_name',))
 
-    def set_content_from_cms(self):
-        export_content = []
-        for item in self.items.all():
-            export_content.extend(item.get_export_data(self.source_language))
-
-        self.export_content = json.dumps(export_content, cls=DjangoJSONEncoder)
-        self.save(update_fields=('export_content',))
-        self.set_status(self.STATES.OPEN)
+    def set_content_from_cms(self, start=0, stop=None):
+        """
+        Exports the items ``[start:stop]`` not exported yet, so that an interrupted
+        export resumes with the remaining items. The content of the request is
+        put together once the last item is exported, the items only keep their
+        ``date_exported`` checkpoint then.
+        """
+        items = self.items.select_related('source_cms_page').order_by('pk').defer_payloads()
+
+        if not start:
+            set_progress(self.pk, items_exported=items.filter(date_exported__isnull=False).count())
+
+        with ProgressTracker(self.pk) as progress:
+            for item in items[start:stop]:
+                if not item.date_exported:
+                    item.set_export_content(self.source_language)
+                    progress.add('items_exported')
+
+        if stop is None or stop >= self.item_count:
+            export_content = [
+                placeholder
+                for item_content in items.values_list('export_content', flat=True)
+                for placeholder in item_content
+            ]
+            self.export_content = json.dumps(export_content, cls=DjangoJSONEncoder)
+
+            with transaction.atomic():
+                # Fails for requests put together already, before their items are cleared.
+                self.set_status(self.STATES.OPEN, update_fields=('export_content',))
+                self.items.update(export_content=[])
 
     def set_provider_options(self, **kwargs):
         self.provider_options = self.provider.get_provider_options(**kwargs)
         self.save(update_fields=('provider_options',))
 
+    def set_provider_backend(self, provider_backend):
+        # The request content has to be built again for the new provider.
+        self.provider_backend = provider_backend
+        self._provider = None
+        self.save(update_fields=('provider_backend',))
+
     def get_quote_from_provider(self):
         self.set_status(self.STATES.PENDING_QUOTE)
 
-        provider_quote = self.provider.get_quote()
+        if conf.TRANSLATIONS_QUOTE_PROVIDERS:
+            provider_quotes = self._get_quotes_from_providers(conf.TRANSLATIONS_QUOTE_PROVIDERS)
+        else:
+            # Reuses the request content built by a previous pipeline stage.
+            provider_quotes = [(self.provider_backend, self.provider.get_quotes(self.request_content or None))]
 
-        currency = provider_quote['Currency']
         date_received = timezone.now()
-        quotes = []
-
-        for option in provider_quote['Options']:
-            order_type_id = option['OrderTypeId']
-            name = '{} ({})'.format(option['Name'], option['ShortDescription'])
-            description = option['Description']
-
-            for delivery_option in option['DeliveryOptions']:
-                quote = self.quotes.create(
-                    provider_options={
-                        'OrderTypeId': order_type_id,
-                        'DeliveryId': delivery_option['DeliveryId'],
-                    },
-                    name=name,
-                    description=description,
-                    delivery_date=delivery_option['DeliveryDate'],
-                    price_currency=currency,
-                    price_amount=delivery_option['Price'] or 0,
-                    date_received=date_received,
-                )
-                quotes.append(quote)
-
+        TranslationQuote.objects.bulk_create([
+            TranslationQuote(request=self, provider_backend=provider_backend, date_received=date_received, **quote)
+            for provider_backend, quotes in provider_quotes
+            for quote in quotes
+        ])
         self.set_status(self.STATES.PENDING_APPROVAL)
 
+    def _get_quotes_from_providers(self, provider_backends):
+        """
+        Requests quotes from the request provider and ``provider_backends`` at once,
+        waiting at most ``QUOTE_TIMEOUT`` seconds for each of them.
+        Returns ``(provider_backend, quotes)`` pairs of the providers which answered.
+        """
+        provider_backends = [self.provider_backend] + [
+            provider_backend for provider_backend in provider_backends
+            if provider_backend != self.provider_backend
+        ]
+        providers = [get_provider_class(provider_backend)(self) for provider_backend in provider_backends]
+        # Computed here as the threads below must not touch the database.
+        if not self.request_content:
+            self.set_request_content()
+        payloads = [self.request_content] + [provider.get_export_data() for provider in providers[1:]]
+
+        pool = ThreadPool(len(providers))
+        started = time.time()
+        provider_quotes = []
+        errors = []
+
+        try:
+            results = [
+                pool.apply_async(provider.get_quotes, (payload,))
+                for provider, payload in zip(providers, payloads)
+            ]
+
+            for provider_backend, provider, result in zip(provider_backends, providers, results):
+                try:
+                    quotes = result.get(timeout=max(started + provider.QUOTE_TIMEOUT - time.time(), 0))
+                except TimeoutError:
+                    logger.warning('%s did not quote within %ss', provider_backend, provider.QUOTE_TIMEOUT)
+                    # Retried once the provider had as much time again.
+                    errors.append(ProviderUnavailable('Quote timed out.', retry_after=provider.QUOTE_TIMEOUT))
+                except Exception as error:  # noqa
+                    # Any provider may fail, the others are still worth comparing.
+                    logger.exception('Failed to get a quote from %s', provider_backend)
+                    errors.append(error)
+                else:
+                    provider_quotes.append((provider_backend, quotes))
+        finally:
+            # Doesn't wait for the providers which timed out.
+            pool.terminate()
+
+        if not provider_quotes:
+            if all(isinstance(error, ProviderUnavailable) for error in errors):
+                raise min(errors, key=lambda error: error.retry_after)
+            raise ProviderException('No provider returned a quote.')
+        return provider_quotes
+
     def set_request_content(self):
         self.request_content = self.provider.get_export_data()
         self.save(update_fields=('request_content',))
+        set_progress(self.pk, groups_built=len(self.request_content.get('Groups', ())))
+
+    def get_payload(self, name):
+        """
+        Returns the payload ``name`` (see ``payloads.PAYLOAD_LOOKUPS``), read back
+        from the payload storage once the payloads were archived.
+        """
+        if self.date_payloads_archived:
+            # The payloads module imports the models.
+            from .payloads import load_payload
+            return load_payload(self.pk, name)
+        if name.startswith('order_'):
+            return getattr(self.order, name[len('order_'):])
+        return getattr(self, name)
 
     def submit_request(self):
-        response = self.provider.send_request()
+        # Claims the request first, so that it is sent once only.
         self.set_status(self.STATES.IN_TRANSLATION)
+
+        try:
+            response = self.provider.send_request()
+        except Exception:  # noqa
+            self.set_status(self.STATES.READY_FOR_SUBMISSION)
+            raise
+
+        response_content = self.provider.get_response_content()
+        if response_content is not None:
+            # The provider translated synchronously, no callback will come.
+            self.import_response(response_content)
         return response
 
     def check_status(self):
@@ -158,11 +346,22 @@ class TranslationRequest(models.Model):
         # on success, update the requests status as well
         self.order.save(update_fields=('state',))
 
-    def import_response(self, raw_data):
-        import_state = TranslationImport.objects.create(request=self)
+    def import_response(self, raw_data=None):
+        """
+        Imports the translated content into the target pages. Each item is imported
+        in a transaction of its own and skipped once imported, so that running this
+        again after an interruption or a failure imports the remaining items only.
+        Without ``raw_data`` the response content stored on the order is imported.
+        """
         self.set_status(self.STATES.IMPORT_STARTED)
-        self.order.response_content = raw_data.decode('utf-8')
-        self.order.save(update_fields=('response_content',))
+        import_state = self.imports.filter(state=TranslationImport.STATES.STARTED).last()
+
+        if import_state is None:
+            import_state = TranslationImport.objects.create(request=self)
+
+        if raw_data is not None:
+            self.order.response_content = raw_data.decode('utf-8')
+            self.order.save(update_fields=('response_content',))
 
         try:
             import_data = self.provider.get_import_data()
@@ -172,30 +371,49 @@ class TranslationRequest(models.Model):
             import_state.set_error_message(message)
             return self.set_status(self.STATES.IMPORT_FAILED)
 
-        id_item_mapping = self.items.in_bulk()
+        items = self.items.defer_payloads()
+        # Not joined to the locked items, that would lock the pages as well.
+        target_pages = Page.objects.filter(translation_requests_as_target__translation_request=self).in_bulk()
         import_error = False
-        for translation_request_item_pk, placeholders in import_data.items():
-            translation_request_item = id_item_mapping[translation_request_item_pk]
-            try:
-                import_plugins_to_page(
-                    placeholders=placeholders,
-                    page=translation_request_item.target_cms_page,
-                    language=self.target_language
-                )
-            except (IntegrityError, ObjectDoesNotExist):
-                self._set_import_archive()
-                message = _('Failed to import plugins from {}.').format(self.provider_backend)
-                logger.exception(message)
-                import_state.set_error_message(message)
-                import_error = True
+        set_progress(
+            self.pk,
+            items_imported=items.filter(date_imported__isnull=False).count(),
+            items_failed=0,
+        )
+
+        with ProgressTracker(self.pk) as progress:
+            for translation_request_item_pk, placeholders in import_data.items():
+                try:
+                    with transaction.atomic():
+                        # Locked, so that concurrent imports don't import an item twice.
+                        translation_request_item = items.select_for_update().get(pk=translation_request_item_pk)
+
+                        if translation_request_item.date_imported:
+                            continue
+
+                        import_plugins_to_page(
+                            placeholders=placeholders,
+                            page=target_pages[translation_request_item.target_cms_page_id],
+                            language=self.target_language
+                        )
+                        translation_request_item.date_imported = timezone.now()
+                        translation_request_item.save(update_fields=('date_imported',))
+                except (IntegrityError, ObjectDoesNotExist):
+                    self._set_import_archive(translation_request_item_pk, placeholders)
+                    message = _('Failed to import plugins from {}.').format(self.provider_backend)
+                    logger.exception(message)
+                    import_state.set_error_message(message)
+                    import_error = True
+                    progress.add('items_failed')
+                else:
+                    progress.add('items_imported')
 
         if import_error:
             # FIXME: this or all-or-nothing (atomic)?
             return self.set_status(self.STATES.IMPORT_FAILED)
 
-        self.set_status(self.STATES.IMPORTED, commit=False)
         self.date_imported = timezone.now()
-        self.save(update_fields=('date_imported', 'state'))
+        self.set_status(self.STATES.IMPORTED, update_fields=('date_imported',))
         import_state.state = import_state.STATES.IMPORTED
         import_state.save(update_fields=('state', ))
         return True
@@ -207,11 +425,15 @@ class TranslationRequest(models.Model):
 
     @transaction.atomic
     def _import_from_archive(self):
+        # Locks the row until the plugins are copied, concurrent imports fail right away.
+        self.date_imported = timezone.now()
+        self.set_status(self.STATES.IMPORTED, update_fields=('date_imported',))
+
         plugins_by_placeholder = {
             pl.slot: pl.get_plugins()
             for pl in self.archived_placeholders.all()
         }
-        for translation_request_item in self.items.select_related('target_cms_page'):
+        for translation_request_item in self.items.select_related('target_cms_page').defer_payloads():
             page_placeholders = (
                 translation_request_item
                 .target_cms_page
@@ -227,40 +449,41 @@ class TranslationRequest(models.Model):
                     language=self.target_language,
                 )
 
-        self.set_status(self.STATES.IMPORTED, commit=False)
-        self.date_imported = timezone.now()
-        self.save(update_fields=('date_imported', 'state'))
-
     @transaction.atomic
-    def _set_import_archive(self):
-        import_data = self.provider.get_import_data()
-        id_item_mapping = self.items.in_bulk()
+    def _set_import_archive(self, translation_request_item_pk, placeholders):
+        # Archives the placeholders of an item failing to import, once.
+        translation_request_item = self.items.defer_payloads().select_for_update().get(pk=translation_request_item_pk)
 
-        for translation_request_item_pk, placeholders in import_data:
-            translation_request_item = id_item_mapping[translation_request_item_pk]
-            page_placeholders = translation_request_item.source_cms_page.get_declared_placeholders()
+        if translation_request_item.date_archived:
+            return None
 
-            plugins_by_placeholder = {
-                pl.slot: pl.plugins
-                for pl in placeholders if pl.plugins
-            }
+        page_placeholders = translation_request_item.source_cms_page.get_declared_placeholders()
 
-            for pos, placeholder in enumerate(page_placeholders, start=1):
-                if placeholder.slot not in plugins_by_placeholder:
-                    continue
+        plugins_by_placeholder = {
+            pl.slot: pl.plugins
+            for pl in placeholders if pl.plugins
+        }
 
-                plugins = plugins_by_placeholder[placeholder.slot]
-                bound_plugins = (plugin for plugin in plugins if plugin.data)
-                ar_placeholder = (
-                    self
-                    .archived_placeholders
-                    .create(slot=placeholder.slot, position=pos)
-                )
+        for pos, placeholder in enumerate(page_placeholders, start=1):
+            if placeholder.slot not in plugins_by_placeholder:
+                continue
 
-                try:
-                    ar_placeholder._import_plugins(bound_plugins)
-                except (IntegrityError, ObjectDoesNotExist):
-                    return False
+            plugins = plugins_by_placeholder[placeholder.slot]
+            bound_plugins = (plugin for plugin in plugins if plugin.data)
+            ar_placeholder = (
+                self
+                .archived_placeholders
+                .create(slot=placeholder.slot, position=pos)
+            )
+
+            try:
+                ar_placeholder._import_plugins(bound_plugins)
+            except (IntegrityError, ObjectDoesNotExist):
+                return False
+
+        translation_request_item.date_archived = timezone.now()
+        translation_request_item.save(update_fields=('date_archived',))
+        return True
 
     def clean(self, exclude=None):
         if self.source_language == self.target_language:
@@ -270,9 +493,20 @@ class TranslationRequest(models.Model):
 
 
 class TranslationRequestItem(models.Model):
+    PAYLOAD_FIELDS = ('export_content',)
+
     translation_request = models.ForeignKey(TranslationRequest, related_name='items', on_delete=models.CASCADE)
     source_cms_page = PageField(related_name='translation_requests_as_source', on_delete=models.PROTECT)
     target_cms_page = PageField(related_name='translation_requests_as_target', on_delete=models.PROTECT)
+    # Checkpoints of the export and import, see ``TranslationRequest.import_response()``.
+    export_content = JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    # Fingerprint of ``export_content`` for ``TranslationCoverage``.
+    export_fingerprint = models.CharField(max_length=40, blank=True)
+    date_exported = models.DateTimeField(blank=True, null=True)
+    date_imported = models.DateTimeField(blank=True, null=True)
+    date_archived = models.DateTimeField(blank=True, null=True)
+
+    objects = PayloadQuerySet.as_manager()
 
     @cached_property
     def source_cms_page_title(self):
@@ -301,9 +535,16 @@ class TranslationRequestItem(models.Model):
             d['translation_request_item_pk'] = self.pk
         return data
 
+    def set_export_content(self, language):
+        self.export_content = self.get_export_data(language)
+        self.export_fingerprint = get_content_fingerprint(self.export_content)
+        self.date_exported = timezone.now()
+        self.save(update_fields=('export_content', 'export_fingerprint', 'date_exported'))
+
 
 class TranslationQuote(models.Model):
     request = models.ForeignKey(TranslationRequest, related_name='quotes', on_delete=models.CASCADE)
+    provider_backend = models.CharField(max_length=100, choices=TranslationRequest.PROVIDERS, blank=True)
     date_received = models.DateTimeField()
 
     name = models.CharField(max_length=1000)
@@ -325,6 +566,7 @@ class TranslationOrder(models.Model):
         ('FAILED', 'failed', _('Failed/cancelled')),
         ('DONE', 'done', _('Done')),
     )
+    PAYLOAD_FIELDS = ('request_content', 'response_content')
 
     request = models.OneToOneField(TranslationRequest, related_name='order', on_delete=models.CASCADE)
 
@@ -333,11 +575,13 @@ class TranslationOrder(models.Model):
 
     state = models.CharField(choices=STATES, default=STATES.OPEN, max_length=100)
 
-    request_content = JSONField(default=dict, blank=True)
-    response_content = JSONField(default=dict, blank=True)
+    request_content = CompressedJSONField(default=dict, blank=True)
+    response_content = CompressedJSONField(default=dict, blank=True)
 
     provider_details = JSONField(default=dict, blank=True)
 
+    objects = PayloadQuerySet.as_manager()
+
     @property
     def price_with_currency(self):
         price = self.provider_details.get(self.request.provider.PRICE_KEY)
@@ -447,3 +691,267 @@ class TranslationImport(models.Model):
         self.state = self.STATES.FAILED
         self.message = message
         self.save(update_fields=('state', 'message'))
+
+
+class TranslationCoverage(models.Model):
+    """
+    Translation state of a page in a language, kept up to date as requests
+    change state and pages are published.
+    """
+    STATES = Choices(
+        ('MISSING', 'missing', _('Missing')),
+        ('PRESENT', 'present', _('Present')),
+        ('IN_TRANSLATION', 'in_translation', _('In translation')),
+        ('TRANSLATED', 'translated', _('Translated')),
+        ('STALE', 'stale', _('Stale')),
+    )
+    IN_TRANSLATION_STATES = (
+        TranslationRequest.STATES.OPEN,
+        TranslationRequest.STATES.PENDING_QUOTE,
+        TranslationRequest.STATES.PENDING_APPROVAL,
+        TranslationRequest.STATES.READY_FOR_SUBMISSION,
+        TranslationRequest.STATES.IN_TRANSLATION,
+        TranslationRequest.STATES.IMPORT_STARTED,
+    )
+
+    site = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='+')
+    page = PageField(related_name='translation_coverage', on_delete=models.CASCADE)
+    language = models.CharField(max_length=10, choices=settings.LANGUAGES)
+    state = models.CharField(choices=STATES, default=STATES.MISSING, max_length=100)
+    # The state before the page went into translation, restored if the translation fails.
+    previous_state = models.CharField(choices=STATES, max_length=100, blank=True)
+    last_request = models.ForeignKey(
+        TranslationRequest,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    source_page = PageField(blank=True, null=True, on_delete=models.SET_NULL, related_name='+')
+    source_language = models.CharField(max_length=10, choices=settings.LANGUAGES, blank=True)
+    source_fingerprint = models.CharField(max_length=40, blank=True)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        default_permissions = ''
+        unique_together = ('page', 'language')
+        indexes = [
+            models.Index(fields=['site', 'language', 'state'], name='djangocms_tr_coverage_idx'),
+        ]
+
+    @classmethod
+    def _get_or_create_for_pages(cls, page_ids, language):
+        existing = set(cls.objects.filter(page__in=page_ids, language=language).values_list('page', flat=True))
+        titles = Title.objects.filter(page=models.OuterRef('pk'), language=language)
+        pages = (
+            Page.objects
+            .filter(pk__in=set(page_ids) - existing)
+            .annotate(has_title=models.Exists(titles))
+            .values_list('pk', 'node__site', 'has_title')
+        )
+        cls.objects.bulk_create([
+            cls(
+                site_id=site_id,
+                page_id=page_id,
+                language=language,
+                state=cls.STATES.PRESENT if has_title else cls.STATES.MISSING,
+            )
+            for page_id, site_id, has_title in pages
+        ])
+        return cls.objects.filter(page__in=page_ids, language=language)
+
+    @classmethod
+    def update_for_request(cls, translation_request):
+        state = translation_request.state
+        target_pages = list(translation_request.items.values_list('target_cms_page', flat=True))
+        language = translation_request.target_language
+
+        if state in cls.IN_TRANSLATION_STATES:
+            # Pages in translation already keep the state from before their first request.
+            cls._get_or_create_for_pages(target_pages, language).exclude(
+                state=cls.STATES.IN_TRANSLATION,
+            ).update(
+                previous_state=F('state'),
+                state=cls.STATES.IN_TRANSLATION,
+                date_updated=timezone.now(),
+            )
+        elif state in (TranslationRequest.STATES.IMPORT_FAILED, TranslationRequest.STATES.CANCELLED):
+            # Back to the state before the request, see ``update_for_page()`` for stale pages.
+            cls.objects.filter(
+                page__in=target_pages,
+                language=language,
+                state=cls.STATES.IN_TRANSLATION,
+            ).update(
+                state=models.Case(
+                    # In translation since before the previous state was kept.
+                    models.When(
+                        previous_state='',
+                        last_request__isnull=False,
+                        then=models.Value(cls.STATES.TRANSLATED),
+                    ),
+                    models.When(previous_state='', then=models.Value(cls.STATES.PRESENT)),
+                    default=F('previous_state'),
+                ),
+                previous_state='',
+                date_updated=timezone.now(),
+            )
+        elif state == TranslationRequest.STATES.IMPORTED:
+            # A single update, the source of each page comes from its item.
+            page_items = translation_request.items.filter(target_cms_page=models.OuterRef('page')).order_by('pk')
+            cls._get_or_create_for_pages(target_pages, language).update(
+                state=cls.STATES.TRANSLATED,
+                last_request=translation_request,
+                source_page=models.Subquery(page_items.values('source_cms_page')[:1]),
+                source_language=translation_request.source_language,
+                source_fingerprint=models.Subquery(page_items.values('export_fingerprint')[:1]),
+                previous_state='',
+                date_updated=timezone.now(),
+            )
+
+    @classmethod
+    def update_for_page(cls, page, language):
+        """ Called when ``page`` is published in ``language``. """
+        cls._get_or_create_for_pages([page.pk], language).filter(
+            state=cls.STATES.MISSING,
+        ).update(state=cls.STATES.PRESENT, date_updated=timezone.now())
+
+        # Pages in translation again go back to stale if their translation fails.
+        translations = cls.objects.filter(source_page=page, source_language=language).filter(
+            models.Q(state=cls.STATES.TRANSLATED) |
+            models.Q(state=cls.STATES.IN_TRANSLATION, previous_state=cls.STATES.TRANSLATED)
+        )
+
+        if translations.exists():
+            fingerprint = get_content_fingerprint(get_page_export_data(page, language))
+            translations.exclude(source_fingerprint=fingerprint).update(
+                state=models.Case(
+                    models.When(state=cls.STATES.TRANSLATED, then=models.Value(cls.STATES.STALE)),
+                    default=F('state'),
+                ),
+                previous_state=models.Case(
+                    models.When(state=cls.STATES.IN_TRANSLATION, then=models.Value(cls.STATES.STALE)),
+                    default=F('previous_state'),
+                ),
+                date_updated=timezone.now(),
+            )
+
+
+class PendingTranslation(models.Model):
+    """
+    Page published in ``source_language`` since the last automatic translation
+    request to ``target_language``, see ``DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE``.
+    """
+    page = PageField(related_name='+', on_delete=models.CASCADE)
+    source_language = models.CharField(max_length=10, choices=settings.LANGUAGES)
+    target_language = models.CharField(max_length=10, choices=settings.LANGUAGES)
+    date_published = models.DateTimeField(db_index=True)
+
+    class Meta:
+        default_permissions = ''
+        unique_together = ('page', 'source_language', 'target_language')
+
+    @classmethod
+    def add_page(cls, page, language):
+        """ Called when ``page`` is published in ``language``. """
+        for target_language in conf.TRANSLATIONS_AUTO_TRANSLATE.get(language, ()):
+            # Published again: waits for the delay to pass once more.
+            cls.objects.update_or_create(
+                page=page,
+                source_language=language,
+                target_language=target_language,
+                defaults={'date_published': timezone.now()},
+            )
+
+    @classmethod
+    def _get_user(cls):
+        if conf.TRANSLATIONS_AUTO_TRANSLATE_USER:
+            return User.objects.get(username=conf.TRANSLATIONS_AUTO_TRANSLATE_USER)
+        return User.objects.filter(is_superuser=True).order_by('pk').first()
+
+    @classmethod
+    def create_requests(cls):
+        """
+        Creates a translation request per language pair with the pages not published
+        for ``DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE_DELAY`` seconds. Pages whose content
+        didn't change since their last translation are left out, pages currently
+        in translation are kept for later.
+        """
+        published_before = timezone.now() - timedelta(seconds=conf.TRANSLATIONS_AUTO_TRANSLATE_DELAY)
+        pending = cls.objects.filter(date_published__lte=published_before)
+        language_pairs = set(pending.values_list('source_language', 'target_language'))
+        provider_backend = conf.TRANSLATIONS_AUTO_TRANSLATE_PROVIDER or conf.TRANSLATIONS_PROVIDERS[0][0]
+        translation_requests = []
+
+        if not language_pairs:
+            return translation_requests
+
+        user = cls._get_user()
+
+        for source_language, target_language in sorted(language_pairs):
+            pair_pending = pending.filter(source_language=source_language, target_language=target_language)
+            page_ids = list(pair_pending.values_list('page', flat=True))
+            coverage = dict(
+                TranslationCoverage.objects
+                .filter(page__in=page_ids, language=target_language)
+                .values_list('page', 'state')
+            )
+            pages = list(
+                Page.objects
+                .filter(pk__in=page_ids, title_set__language=target_language)
+                .exclude(pk__in=[
+                    page_id for page_id, state in coverage.items()
+                    if state in (TranslationCoverage.STATES.TRANSLATED, TranslationCoverage.STATES.IN_TRANSLATION)
+                ])
+                .order_by('node__path')
+            )
+
+            with transaction.atomic():
+                # Pages in translation are sent with a later request.
+                pair_pending.exclude(page__in=[
+                    page_id for page_id, state in coverage.items()
+                    if state == TranslationCoverage.STATES.IN_TRANSLATION
+                ]).delete()
+
+                if not pages:
+                    continue
+
+                translation_request = TranslationRequest.objects.create(
+                    user=user,
+                    source_language=source_language,
+                    target_language=target_language,
+                    provider_backend=provider_backend,
+                )
+                TranslationRequestItem.objects.bulk_create([
+                    TranslationRequestItem(
+                        translation_request=translation_request,
+                        source_cms_page=page,
+                        target_cms_page=page,
+                    )
+                    for page in pages
+                ])
+                translation_request.update_item_count()
+                translation_request.set_provider_order_name(pages[0])
+            translation_requests.append(translation_request)
+        return translation_requests
+
+
+@receiver(post_save, sender=TranslationRequestItem)
+def increment_item_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        TranslationRequest.objects.filter(pk=instance.translation_request_id).update(item_count=F('item_count') + 1)
+
+
+@receiver(post_delete, sender=TranslationRequestItem)
+def decrement_item_count(sender, instance, **kwargs):
+    TranslationRequest.objects.filter(pk=instance.translation_request_id).update(item_count=F('item_count') - 1)
+
+
+@receiver(post_publish, sender=Page)
+def update_page_coverage(sender, instance, language, **kwargs):
+    TranslationCoverage.update_for_page(instance, language)
+
+
+@receiver(post_publish, sender=Page)
+def add_pending_translation(sender, instance, language, **kwargs):
+    if conf.TRANSLATIONS_AUTO_TRANSLATE:
+        PendingTranslation.add_page(instance, language)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import get_storage_class
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from . import conf
+from .fields import decode_value
+from .models import (
+    TranslationOrder, TranslationRequest, TranslationRequestItem,
+)
+
+
+# Payloads of a translation request, by name and lookup from the request.
+PAYLOAD_LOOKUPS = {
+    'export_content': 'export_content',
+    'request_content': 'request_content',
+    'order_request_content': 'order__request_content',
+    'order_response_content': 'order__response_content',
+}
+FINISHED_STATES = (
+    TranslationRequest.STATES.IMPORTED,
+    TranslationRequest.STATES.CANCELLED,
+)
+
+
+def get_payload_storage():
+    return get_storage_class(conf.TRANSLATIONS_PAYLOAD_STORAGE)()
+
+
+def get_payload_name(translation_request_id, name):
+    return '{}/{}/{}.json.gz'.format(conf.TRANSLATIONS_PAYLOAD_STORAGE_LOCATION, translation_request_id, name)
+
+
+def save_payload(translation_request_id, name, value):
+    storage = get_payload_storage()
+    path = get_payload_name(translation_request_id, name)
+    data = io.BytesIO()
+
+    with gzip.GzipFile(fileobj=data, mode='wb') as payload_file:
+        payload_file.write(json.dumps(value, cls=DjangoJSONEncoder).encode('utf-8'))
+
+    # Overwritten when archiving again, storages rename existing files otherwise.
+    storage.delete(path)
+    storage.save(path, ContentFile(data.getvalue()))
+
+
+def load_payload(translation_request_id, name):
+    """
+    Returns the payload ``name`` of an archived translation request,
+    ``None`` if it had none (e.g. no order was placed).
+    """
+    storage = get_payload_storage()
+    path = get_payload_name(translation_request_id, name)
+
+    if not storage.exists(path):
+        return None
+
+    with storage.open(path, 'rb') as payload_file:
+        data = gzip.GzipFile(fileobj=payload_file).read()
+    return json.loads(data.decode('utf-8'))
+
+
+def get_payload(translation_request_id, name):
+    """
+    Returns the payload ``name`` of a translation request, reading the database
+    column or the archive only.
+    """
+    payload, date_payloads_archived = (
+        TranslationRequest.objects
+        .values_list(PAYLOAD_LOOKUPS[name], 'date_payloads_archived')
+        .get(pk=translation_request_id)
+    )
+
+    if date_payloads_archived:
+        return load_payload(translation_request_id, name)
+    return decode_value(payload)
+
+
+def archive_payloads(translation_request_id):
+    # One payload in memory at a time, they can be megabytes each.
+    requests = TranslationRequest.objects.filter(pk=translation_request_id)
+
+    for name, lookup in PAYLOAD_LOOKUPS.items():
+        payload = requests.values_list(lookup, flat=True).get()
+
+        if payload is not None:
+            save_payload(translation_request_id, name, decode_value(payload))
+
+    with transaction.atomic():
+        requests.update(export_content={}, request_content={}, date_payloads_archived=timezone.now())
+        TranslationOrder.objects.filter(request=translation_request_id).update(request_content={}, response_content={})
+        # The checkpoints of the items are part of ``export_content``.
+        TranslationRequestItem.objects.filter(translation_request=translation_request_id).update(export_content=[])
+
+
+def get_archivable_requests(days=None):
+    if days is None:
+        days = conf.TRANSLATIONS_PAYLOAD_RETENTION_DAYS
+    return TranslationRequest.objects.filter(
+        state__in=FINISHED_STATES,
+        date_created__lt=timezone.now() - timedelta(days=days),
+        date_payloads_archived__isnull=True,
+    )
+
+
+def archive_old_payloads(days=None, batch_size=None):
+    """
+    Moves the payloads of the finished requests created more than ``days`` ago to compressed
+    files of the payload storage, ``batch_size`` requests at a time. Returns the
+    number of archived requests.
+    """
+    if batch_size is None:
+        batch_size = conf.TRANSLATIONS_PAYLOAD_ARCHIVE_BATCH_SIZE
+    archived = 0
+
+    while True:
+        translation_request_ids = list(
+            get_archivable_requests(days)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+
+        if not translation_request_ids:
+            return archived
+
+        for translation_request_id in translation_request_ids:
+            archive_payloads(translation_request_id)
+        archived += len(translation_request_ids)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import defaultdict
+
+from django.core.cache import caches
+
+from . import conf
+
+
+PROGRESS_COUNTERS = (
+    'items_exported',
+    'groups_built',
+    'bytes_sent',
+    'items_imported',
+    'items_failed',
+)
+PROGRESS_CACHE_KEY = 'djangocms_translations:progress:{}:{}'
+
+
+def _get_cache():
+    return caches[conf.TRANSLATIONS_CACHE]
+
+
+def _get_keys(translation_request_id, names):
+    return {PROGRESS_CACHE_KEY.format(translation_request_id, name): name for name in names}
+
+
+def get_progress(translation_request_id):
+    """
+    Returns the counters and the state of the translation request, in a single cache read.
+    """
+    keys = _get_keys(translation_request_id, PROGRESS_COUNTERS + ('state',))
+    values = _get_cache().get_many(list(keys))
+    progress = dict.fromkeys(PROGRESS_COUNTERS, 0)
+    progress['state'] = None
+    progress.update((keys[key], value) for key, value in values.items())
+    return progress
+
+
+def set_progress(translation_request_id, **values):
+    keys = _get_keys(translation_request_id, values)
+    _get_cache().set_many(
+        {key: values[name] for key, name in keys.items()},
+        conf.TRANSLATIONS_PROGRESS_TIMEOUT,
+    )
+
+
+def add_progress(translation_request_id, **counters):
+    cache = _get_cache()
+
+    for key, name in _get_keys(translation_request_id, counters).items():
+        cache.add(key, 0, conf.TRANSLATIONS_PROGRESS_TIMEOUT)
+        try:
+            cache.incr(key, counters[name])
+        except ValueError:
+            # Expired in the meantime.
+            cache.set(key, counters[name], conf.TRANSLATIONS_PROGRESS_TIMEOUT)
+
+
+class ProgressTracker(object):
+    """
+    Collects counter increments of a translation request and adds them to the
+    cache at most every ``flush_interval`` seconds, and when leaving the block::
+
+        with ProgressTracker(translation_request.pk) as progress:
+            for item in items:
+                progress.add('items_exported')
+    """
+
+    def __init__(self, translation_request_id, flush_interval=None):
+        if flush_interval is None:
+            flush_interval = conf.TRANSLATIONS_PROGRESS_FLUSH_INTERVAL
+        self.translation_request_id = translation_request_id
+        self.flush_interval = flush_interval
+        self.pending = defaultdict(int)
+        self.flushed = time.time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def add(self, counter, value=1):
+        self.pending[counter] += value
+
+        if time.time() - self.flushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            add_progress(self.translation_request_id, **self.pending)
+            self.pending.clear()
+        self.flushed = time.time()
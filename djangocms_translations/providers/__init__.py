@@ -1,10 +1,31 @@
 # -*- coding: utf-8 -*-
-from .supertext import SupertextTranslationProvider
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
 
+from .. import conf
 
-TRANSLATION_PROVIDERS = {
-    cls.__name__: cls
-    for cls in (
-        SupertextTranslationProvider,
-    )
-}
+
+_provider_classes = {}
+
+
+def get_provider_choices():
+    return [(name, label) for name, label, path in conf.TRANSLATIONS_PROVIDERS]
+
+
+def get_provider_class(name):
+    """
+    Imports the provider registered as ``name`` on first use
+    and keeps it for the lifetime of the process.
+    """
+    try:
+        return _provider_classes[name]
+    except KeyError:
+        pass
+
+    paths = {provider_name: path for provider_name, label, path in conf.TRANSLATIONS_PROVIDERS}
+
+    if name not in paths:
+        raise ImproperlyConfigured('Translation provider "{}" is not registered.'.format(name))
+
+    _provider_classes[name] = import_string(paths[name])
+    return _provider_classes[name]
@@ -1,23 +1,351 @@
 # -*- coding: utf-8 -*-
-import requests
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+
+from django.core.cache import caches
+
+from djangocms_transfer.forms import _object_version_data_hook
+from djangocms_transfer.utils import get_plugin_class
 
 from .. import conf
+from ..progress import add_progress
+from ..signals import provider_circuit_changed, provider_throttled
+from ..utils import get_text_field_child_label, get_translatable_fields
+
+
+logger = logging.getLogger('djangocms_translations')
+
+METRICS = ('opened', 'half_opened', 'closed', 'rejected', 'throttled')
 
 
 class ProviderException(Exception):
     pass
 
 
+class ProviderUnavailable(ProviderException):
+    """ The provider was not called, the call can be retried after ``retry_after`` seconds. """
+
+    def __init__(self, message, retry_after):
+        super(ProviderUnavailable, self).__init__(message)
+        self.retry_after = retry_after
+
+
+class ProviderThrottled(ProviderUnavailable):
+    pass
+
+
+def _get_cache():
+    return caches[conf.TRANSLATIONS_CACHE]
+
+
+def _get_metric_key(name, metric):
+    return 'djangocms_translations:provider:{}:metrics:{}'.format(name, metric)
+
+
+def _incr_metric(name, metric):
+    cache = _get_cache()
+    key = _get_metric_key(name, metric)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # evicted in between
+        cache.set(key, 1, timeout=None)
+
+
+def get_provider_metrics(name):
+    keys = {_get_metric_key(name, metric): metric for metric in METRICS}
+    values = _get_cache().get_many(keys.keys())
+    return {metric: values.get(key, 0) for key, metric in keys.items()}
+
+
+class RateLimiter(object):
+    """
+    Caps the calls to a provider to ``rate`` per second across all
+    processes sharing the cache. Callers wait up to ``max_wait`` seconds
+    for a free slot before ``ProviderThrottled`` is raised.
+    """
+
+    def __init__(self, sender, name, rate, max_wait):
+        self.sender = sender
+        self.name = name
+        self.rate = rate
+        self.max_wait = max_wait
+
+    def acquire(self):
+        if not self.rate:
+            return
+
+        cache = _get_cache()
+        deadline = time.time() + self.max_wait
+
+        while True:
+            now = time.time()
+            window = int(now)
+            key = 'djangocms_translations:provider:{}:rate:{}'.format(self.name, window)
+            cache.add(key, 0, timeout=2)
+
+            try:
+                calls = cache.incr(key)
+            except ValueError:
+                # Expired in between or not stored at all (e.g. DummyCache).
+                calls = 1
+                cache.set(key, calls, timeout=2)
+
+            if calls <= self.rate:
+                return
+
+            retry_after = window + 1 - now
+
+            if now + retry_after > deadline:
+                _incr_metric(self.name, 'throttled')
+                provider_throttled.send(sender=self.sender, name=self.name, retry_after=retry_after)
+                raise ProviderThrottled(
+                    'Rate limit of {} calls per second reached for {}.'.format(self.rate, self.name),
+                    retry_after=retry_after,
+                )
+            time.sleep(retry_after)
+
+
+class CircuitBreaker(object):
+    """
+    Stops calling a provider for ``reset_timeout`` seconds after
+    ``failure_threshold`` consecutive failures. Once the timeout is over
+    a single trial call is let through (half-open): its success closes
+    the circuit, its failure opens it again.
+
+    The state lives in the cache so that all workers share it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, sender, name, failure_threshold, reset_timeout):
+        self.sender = sender
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.opened_at_key = 'djangocms_translations:provider:{}:circuit:opened_at'.format(name)
+        self.failures_key = 'djangocms_translations:provider:{}:circuit:failures'.format(name)
+        self.trial_key = 'djangocms_translations:provider:{}:circuit:trial'.format(name)
+
+    def _get_opened_at(self):
+        return _get_cache().get(self.opened_at_key)
+
+    def get_state(self):
+        opened_at = self._get_opened_at()
+
+        if opened_at is None:
+            return self.CLOSED
+        elif time.time() - opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def _set_state(self, state, metric):
+        logger.warning('Circuit for provider %s is %s.', self.name, state)
+        _incr_metric(self.name, metric)
+        provider_circuit_changed.send(sender=self.sender, name=self.name, state=state)
+
+    def _reject(self, opened_at):
+        _incr_metric(self.name, 'rejected')
+        raise ProviderUnavailable(
+            'Circuit for provider {} is open.'.format(self.name),
+            retry_after=max(opened_at + self.reset_timeout - time.time(), 1),
+        )
+
+    def before_call(self):
+        opened_at = self._get_opened_at()
+
+        if opened_at is None:
+            return
+
+        if time.time() - opened_at < self.reset_timeout:
+            self._reject(opened_at)
+
+        # Only one worker gets to make the trial call.
+        if not _get_cache().add(self.trial_key, 1, timeout=max(self.reset_timeout, 1)):
+            self._reject(opened_at)
+        self._set_state(self.HALF_OPEN, 'half_opened')
+
+    def record_success(self):
+        cache = _get_cache()
+
+        if self._get_opened_at() is not None:
+            cache.delete_many([self.opened_at_key, self.trial_key])
+            self._set_state(self.CLOSED, 'closed')
+        cache.delete(self.failures_key)
+
+    def record_failure(self):
+        cache = _get_cache()
+
+        if self._get_opened_at() is None:
+            cache.add(self.failures_key, 0, timeout=None)
+            try:
+                failures = cache.incr(self.failures_key)
+            except ValueError:
+                failures = 1
+                cache.set(self.failures_key, failures, timeout=None)
+
+            if failures < self.failure_threshold:
+                return
+
+        # Either too many failures or the trial call failed.
+        cache.set(self.opened_at_key, time.time(), timeout=None)
+        cache.delete_many([self.failures_key, self.trial_key])
+        self._set_state(self.OPEN, 'opened')
+
+
+def _get_translation_export_content(field, raw_plugin):
+    plugin_class = get_plugin_class(raw_plugin['plugin_type'])
+    try:
+        result = plugin_class.get_translation_export_content(field, raw_plugin['data'])
+    except AttributeError:
+        result = (raw_plugin['data'][field], [])
+    return result
+
+
+def _set_translation_import_content(enriched_content, plugin):
+    plugin_class = get_plugin_class(plugin['plugin_type'])
+    try:
+        result = plugin_class.set_translation_import_content(enriched_content, plugin['data'])
+    except AttributeError:
+        result = {}
+    return result
+
+
+def get_translation_groups(export_content):
+    """
+    Returns the translatable content of the exported placeholders as
+    a list of ``{'GroupId': ..., 'Items': [{'Id': field, 'Content': ...}]}``,
+    one group per plugin.
+    """
+    groups = []
+    fields_by_plugin = {}
+
+    for placeholder in export_content:
+        subplugins_already_processed = set()
+
+        for raw_plugin in placeholder['plugins']:
+            plugin_type = raw_plugin['plugin_type']
+
+            if raw_plugin['pk'] in subplugins_already_processed:
+                continue
+
+            if plugin_type not in fields_by_plugin:
+                fields_by_plugin[plugin_type] = get_translatable_fields(plugin_type)
+
+            items = []
+            for field in fields_by_plugin[plugin_type]:
+                content, children_included_in_this_content = _get_translation_export_content(field, raw_plugin)
+                subplugins_already_processed.update(children_included_in_this_content)
+
+                if content:
+                    items.append({
+                        'Id': field,
+                        'Content': content,
+                    })
+
+            if items:
+                groups.append({
+                    'GroupId': '{}:{}:{}'.format(
+                        placeholder['translation_request_item_pk'], placeholder['placeholder'], raw_plugin['pk']
+                    ),
+                    'Items': items
+                })
+
+    return groups
+
+
+def get_translated_placeholders(export_content, groups):
+    """
+    Applies the translated ``groups`` to the exported placeholders.
+    """
+    subplugins_already_processed = set()
+
+    # TLRD: data is like {translation_request_item_pk: {placeholder_name: {plugin_pk: plugin_dict}}}
+    data = defaultdict(dict)
+    for x in export_content:
+        translation_request_item_pk = x['translation_request_item_pk']
+        plugin_dict = OrderedDict((plugin['pk'], plugin) for plugin in x['plugins'])
+        data[translation_request_item_pk][x['placeholder']] = plugin_dict
+
+    for group in groups:
+        translation_request_item_pk, placeholder, plugin_id = group['GroupId'].split(':')
+        translation_request_item_pk = int(translation_request_item_pk)
+        plugin_id = int(plugin_id)
+
+        if plugin_id in subplugins_already_processed:
+            continue
+
+        for item in group['Items']:
+            plugin_dict = data[translation_request_item_pk][placeholder]
+            plugin = plugin_dict[plugin_id]
+            plugin['data'][item['Id']] = item['Content']
+            subplugins = _set_translation_import_content(item['Content'], plugin)
+            subplugins_already_processed.update(list(subplugins.keys()))
+            for subplugin_id, subplugin_content in subplugins.items():
+                field = get_text_field_child_label(plugin_dict[subplugin_id]['plugin_type'])
+                if field:
+                    plugin_dict[subplugin_id]['data'][field] = subplugin_content
+
+    # TLRD: return_data is like {translation_request_item_pk: [<djangocms_transfer.ArchivedPlaceholder>, ]}
+    return_data = {}
+    for translation_request_item_pk, placeholders_dict in data.items():
+        data = json.dumps([{
+            'placeholder': p,
+            'plugins': list(plugins.values()),
+        } for p, plugins in placeholders_dict.items()])
+        archived_placeholders = json.loads(data, object_hook=_object_version_data_hook)
+        return_data[translation_request_item_pk] = archived_placeholders
+
+    return return_data
+
+
 class BaseTranslationProvider(object):
     API_LIVE_URL = None
     API_STAGE_URL = None
 
     CURRENCY_KEY = None
     PRICE_KEY = None
+    # Keys of ``TranslationOrder.provider_details``, used by reports.
+    WORD_COUNT_KEY = None
+
+    # Shared by all workers, see ``RateLimiter`` and ``CircuitBreaker``.
+    TIMEOUT = conf.TRANSLATIONS_PROVIDER_TIMEOUT
+    RATE_LIMIT = conf.TRANSLATIONS_PROVIDER_RATE_LIMIT
+    RATE_LIMIT_WAIT = conf.TRANSLATIONS_PROVIDER_RATE_LIMIT_WAIT
+    CIRCUIT_BREAKER_THRESHOLD = conf.TRANSLATIONS_CIRCUIT_BREAKER_THRESHOLD
+    CIRCUIT_BREAKER_TIMEOUT = conf.TRANSLATIONS_CIRCUIT_BREAKER_TIMEOUT
+    # Seconds to wait for this provider when comparing quotes of several providers.
+    QUOTE_TIMEOUT = conf.TRANSLATIONS_QUOTE_TIMEOUT
 
     def __init__(self, request):
         self.request = request
 
+    @classmethod
+    def get_name(cls):
+        return cls.__name__
+
+    @classmethod
+    def get_rate_limiter(cls):
+        return RateLimiter(
+            sender=cls,
+            name=cls.get_name(),
+            rate=cls.RATE_LIMIT,
+            max_wait=cls.RATE_LIMIT_WAIT,
+        )
+
+    @classmethod
+    def get_circuit_breaker(cls):
+        return CircuitBreaker(
+            sender=cls,
+            name=cls.get_name(),
+            failure_threshold=cls.CIRCUIT_BREAKER_THRESHOLD,
+            reset_timeout=cls.CIRCUIT_BREAKER_TIMEOUT,
+        )
+
     @property
     def api_url(self):
         if conf.TRANSLATIONS_USE_STAGING:
@@ -28,15 +356,46 @@ class BaseTranslationProvider(object):
         return '{}{}'.format(self.api_url, section)
 
     def get_headers(self):
-        return NotImplementedError
+        raise NotImplementedError
+
+    def get_auth(self):
+        return None
+
+    def check_response(self, response):
+        if not response.ok:
+            raise ProviderException(response.content)
+        return response
 
     def make_request(self, method, section, **kwargs):
-        return requests.request(
-            method=method,
-            url=self.get_url(section),
-            headers=self.get_headers(),
-            **kwargs
-        )
+        # Imported here so that processes never calling a provider don't load it.
+        import requests
+
+        circuit_breaker = self.get_circuit_breaker()
+        # Calls rejected by an open circuit don't take a slot of the rate limit.
+        circuit_breaker.before_call()
+        self.get_rate_limiter().acquire()
+        kwargs.setdefault('timeout', self.TIMEOUT)
+
+        try:
+            response = requests.request(
+                method=method,
+                url=self.get_url(section),
+                headers=self.get_headers(),
+                auth=self.get_auth(),
+                **kwargs
+            )
+        except requests.RequestException:
+            circuit_breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.record_success()
+
+        if response.request.body:
+            add_progress(self.request.pk, bytes_sent=len(response.request.body))
+        return self.check_response(response)
 
     def get_export_data(self):
         raise NotImplementedError
@@ -44,9 +403,46 @@ class BaseTranslationProvider(object):
     def get_import_data(self):
         raise NotImplementedError
 
-    def get_quote(self):
+    def get_quote(self, data=None):
+        """
+        Requests a quote for ``data``, the export data of this provider.
+        Without ``data`` it is computed and stored as the request content.
+        """
         raise NotImplementedError
 
+    def get_quotes(self, data=None):
+        """
+        Returns the options of ``get_quote()`` as ``TranslationQuote`` field values.
+        Expects quotes in the *Supertext* format, override for other formats.
+        """
+        provider_quote = self.get_quote(data)
+        currency = provider_quote['Currency']
+        quotes = []
+
+        for option in provider_quote['Options']:
+            name = '{} ({})'.format(option['Name'], option['ShortDescription'])
+
+            for delivery_option in option['DeliveryOptions']:
+                quotes.append({
+                    'provider_options': {
+                        'OrderTypeId': option['OrderTypeId'],
+                        'DeliveryId': delivery_option['DeliveryId'],
+                    },
+                    'name': name,
+                    'description': option['Description'],
+                    'delivery_date': delivery_option['DeliveryDate'],
+                    'price_currency': currency,
+                    'price_amount': delivery_option['Price'] or 0,
+                })
+        return quotes
+
+    def get_response_content(self):
+        """
+        Returns the translated content right after ``send_request()``
+        for providers translating synchronously, ``None`` otherwise.
+        """
+        return None
+
     def get_order_type_choices(self):
         raise NotImplementedError
 
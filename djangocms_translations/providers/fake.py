@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import itertools
+import json
+import re
+import threading
+import time
+from datetime import timedelta
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.utils import timezone
+from django.utils.six.moves import socketserver
+
+import requests
+
+from .. import conf
+from ..utils import get_word_count, pseudo_localize
+from .supertext import SupertextTranslationProvider
+
+
+class FakeSupertextTranslationProvider(SupertextTranslationProvider):
+    """
+    Supertext provider talking to a local ``FakeSupertextApp``
+    listening on ``DJANGOCMS_TRANSLATIONS_FAKE_API_URL``.
+    """
+    @property
+    def api_url(self):
+        return conf.TRANSLATIONS_FAKE_API_URL
+
+    def get_auth(self):
+        return None
+
+
+def _send_callback(url, body):
+    requests.post(url, data=body, headers={'Content-type': 'application/json; charset=UTF-8'})
+
+
+class FakeSupertextApp(object):
+    """
+    WSGI stand-in for the Supertext endpoints used by ``SupertextTranslationProvider``.
+
+    Quotes are computed from the word count of the payload, orders are
+    "translated" right away with ``transform`` and posted back to their
+    ``CallbackUrl`` after ``callback_delay`` seconds.
+    """
+    # (OrderTypeId, name, price factor)
+    ORDER_TYPES = (
+        (6, 'Translation', 1),
+        (8, 'Specialist translation', 1.5),
+        (9, 'Transcreation', 2.5),
+    )
+    # (DeliveryId, hours, price factor)
+    DELIVERY_OPTIONS = (
+        (1, 6, 2),
+        (2, 24, 1.5),
+        (3, 48, 1.2),
+        (4, 72, 1),
+        (5, 168, 0.8),
+    )
+
+    def __init__(self, currency='CHF', price_per_word=0.2, order_types=ORDER_TYPES,
+                 delivery_options=DELIVERY_OPTIONS, transform=pseudo_localize,
+                 callback_delay=0.1, latency=0, send_callback=_send_callback):
+        self.currency = currency
+        self.price_per_word = price_per_word
+        self.order_types = order_types
+        self.delivery_options = delivery_options
+        self.transform = transform
+        self.callback_delay = callback_delay
+        self.latency = latency
+        self.send_callback = send_callback
+        self.orders = {}
+        self._order_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.routes = (
+            ('POST', re.compile(r'/v1/translation/quote/?$'), self.quote),
+            ('POST', re.compile(r'/v1\.1/translation/order/?$'), self.order),
+            ('GET', re.compile(r'/v1/translation/order/(?P<order_id>\d+)/?$'), self.order_status),
+        )
+
+    def __call__(self, environ, start_response):
+        if self.latency:
+            time.sleep(self.latency)
+
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '')
+
+        for route_method, regex, handler in self.routes:
+            match = regex.search(path)
+            if route_method == method and match:
+                try:
+                    status, data = handler(self._read_json(environ), **match.groupdict())
+                except (KeyError, TypeError, ValueError) as error:
+                    status, data = '400 Bad Request', {'Message': str(error)}
+                break
+        else:
+            status, data = '404 Not Found', {'Message': 'Unknown endpoint {} {}'.format(method, path)}
+
+        body = json.dumps(data).encode('utf-8')
+        start_response(status, [
+            ('Content-Type', 'application/json; charset=UTF-8'),
+            ('Content-Length', str(len(body))),
+        ])
+        return [body]
+
+    def _read_json(self, environ):
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+
+        if not length:
+            return {}
+        return json.loads(environ['wsgi.input'].read(length).decode('utf-8'))
+
+    def get_word_count(self, data):
+        return get_word_count(data.get('Groups', []))
+
+    def get_price(self, word_count, order_type_factor, delivery_factor):
+        return round(word_count * self.price_per_word * order_type_factor * delivery_factor, 2)
+
+    def quote(self, data):
+        word_count = self.get_word_count(data)
+        now = timezone.now()
+        options = []
+
+        for order_type_id, name, order_type_factor in self.order_types:
+            options.append({
+                'OrderTypeId': order_type_id,
+                'Name': name,
+                'ShortDescription': 'fake',
+                'Description': 'Pseudo-localized by the fake Supertext provider.',
+                'DeliveryOptions': [
+                    {
+                        'DeliveryId': delivery_id,
+                        'DeliveryDate': (now + timedelta(hours=hours)).isoformat(),
+                        'Price': self.get_price(word_count, order_type_factor, delivery_factor),
+                    }
+                    for delivery_id, hours, delivery_factor in self.delivery_options
+                ],
+            })
+        return '200 OK', {
+            'Currency': self.currency,
+            'WordCount': word_count,
+            'Options': options,
+        }
+
+    def order(self, data):
+        order_type_factors = {order_type[0]: order_type[2] for order_type in self.order_types}
+        delivery_factors = {option[0]: option[2] for option in self.delivery_options}
+        word_count = self.get_word_count(data)
+        price = self.get_price(
+            word_count,
+            order_type_factors.get(data.get('OrderTypeId'), 1),
+            delivery_factors.get(data.get('DeliveryId'), 1),
+        )
+
+        with self._lock:
+            order_id = next(self._order_ids)
+            order = self.orders[order_id] = {
+                'Id': order_id,
+                'Status': 'InProgress',
+                'CallbackUrl': data.get('CallbackUrl'),
+                'ReferenceData': data.get('ReferenceData'),
+                'Groups': [
+                    {
+                        'GroupId': group['GroupId'],
+                        'Items': [
+                            {'Id': item['Id'], 'Content': self.transform(item['Content'])}
+                            for item in group['Items']
+                        ],
+                    }
+                    for group in data['Groups']
+                ],
+            }
+
+        if order['CallbackUrl']:
+            timer = threading.Timer(self.callback_delay, self.deliver, args=(order,))
+            timer.daemon = True
+            timer.start()
+
+        # Supertext v1.1 returns a list of orders
+        return '200 OK', [{
+            'Id': order_id,
+            'Price': price,
+            'Currency': self.currency,
+            'WordCount': word_count,
+        }]
+
+    def order_status(self, data, order_id):
+        order = self.orders.get(int(order_id))
+
+        if not order:
+            return '404 Not Found', {'Message': 'Unknown order {}'.format(order_id)}
+        return '200 OK', {'Id': order['Id'], 'Status': order['Status']}
+
+    def deliver(self, order):
+        body = json.dumps({
+            'Id': order['Id'],
+            'ReferenceData': order['ReferenceData'],
+            'Groups': order['Groups'],
+        }).encode('utf-8')
+        self.send_callback(order['CallbackUrl'], body)
+        order['Status'] = 'Done'
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def start_fake_supertext_server(app, host='127.0.0.1', port=8765):
+    """
+    Serves ``app`` from a daemon thread and returns the server,
+    call ``server.shutdown()`` to stop it.
+    """
+    server = make_server(
+        host,
+        port,
+        app,
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietWSGIRequestHandler,
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import json
+
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from extended_choices import Choices
+
+from .. import conf
+from ..utils import get_word_count, pseudo_localize
+from .base import (
+    BaseTranslationProvider, get_translated_placeholders,
+    get_translation_groups,
+)
+
+
+class PseudoTranslationProvider(BaseTranslationProvider):
+    """
+    Translates in-process with ``pseudo_localize``, without any network.
+    Submitted requests are imported right away, free of charge.
+    """
+    ORDER_TYPE_CHOICES = Choices(
+        ('PSEUDO_LOCALIZATION', 1, _('Pseudo-localization')),
+    )
+    DELIVERY_TIME_CHOICES = Choices(
+        ('IMMEDIATE', 1, _('Immediate')),
+    )
+    CURRENCY = 'CHF'
+    CURRENCY_KEY = 'Currency'
+    PRICE_KEY = 'Price'
+    WORD_COUNT_KEY = 'WordCount'
+    EXPANSION = conf.TRANSLATIONS_PSEUDO_EXPANSION
+
+    def get_export_data(self):
+        return {
+            'Groups': get_translation_groups(json.loads(self.request.get_payload('export_content'))),
+        }
+
+    def get_import_data(self):
+        request = self.request
+        return get_translated_placeholders(
+            json.loads(request.get_payload('export_content')),
+            json.loads(request.get_payload('order_response_content'))['Groups'],
+        )
+
+    def get_quote(self, data=None):
+        if data is None:
+            self.request.request_content = self.get_export_data()
+            self.request.save(update_fields=('request_content',))
+        return {
+            'Currency': self.CURRENCY,
+            'Options': [{
+                'OrderTypeId': self.ORDER_TYPE_CHOICES.PSEUDO_LOCALIZATION,
+                'Name': _('Pseudo-localization'),
+                'ShortDescription': _('no network'),
+                'Description': _('Accented and expanded pseudo-text, imported right away.'),
+                'DeliveryOptions': [{
+                    'DeliveryId': self.DELIVERY_TIME_CHOICES.IMMEDIATE,
+                    'DeliveryDate': timezone.now(),
+                    'Price': 0,
+                }],
+            }],
+        }
+
+    def send_request(self):
+        from djangocms_translations.models import TranslationOrder
+
+        request = self.request
+        order, created = TranslationOrder.objects.get_or_create(
+            request=request,
+            defaults={'request_content': request.request_content},
+        )
+        order.provider_details = {
+            'Id': 'pseudo-{}'.format(request.pk),
+            self.PRICE_KEY: 0,
+            self.CURRENCY_KEY: self.CURRENCY,
+            self.WORD_COUNT_KEY: get_word_count(request.request_content['Groups']),
+        }
+        order.save(update_fields=('provider_details',))
+        return order.provider_details
+
+    def get_response_content(self):
+        groups = [
+            {
+                'GroupId': group['GroupId'],
+                'Items': [
+                    {'Id': item['Id'], 'Content': pseudo_localize(item['Content'], self.EXPANSION)}
+                    for item in group['Items']
+                ],
+            }
+            for group in self.request.request_content['Groups']
+        ]
+        return json.dumps({'Groups': groups}).encode('utf-8')
+
+    def check_status(self):
+        return {'Status': 'Done'}
+
+    def get_order_type_choices(self):
+        return self.ORDER_TYPE_CHOICES
+
+    def get_delivery_time_choices(self):
+        return self.DELIVERY_TIME_CHOICES
+
+    def get_provider_options(self, **kwargs):
+        return {}
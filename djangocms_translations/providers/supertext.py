@@ -1,21 +1,18 @@
 # -*- coding: utf-8 -*-
 import json
-from collections import OrderedDict, defaultdict
 
 from django.conf import settings
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
-import requests
-from djangocms_transfer.forms import _object_version_data_hook
-from djangocms_transfer.utils import get_plugin_class
 from extended_choices import Choices
 
 from .. import __version__ as djangocms_translations_version
-from ..utils import (
-    add_domain, get_text_field_child_label, get_translatable_fields,
+from ..utils import add_domain
+from .base import (
+    BaseTranslationProvider, ProviderException, get_translated_placeholders,
+    get_translation_groups,
 )
-from .base import BaseTranslationProvider, ProviderException
 
 
 # Format: language_code used in settings.LANGUAGE_* --> language_code that will be sent to Supertext
@@ -42,24 +39,6 @@ LANGUAGE_MAPPING = {
 }
 
 
-def _get_translation_export_content(field, raw_plugin):
-    plugin_class = get_plugin_class(raw_plugin['plugin_type'])
-    try:
-        result = plugin_class.get_translation_export_content(field, raw_plugin['data'])
-    except AttributeError:
-        result = (raw_plugin['data'][field], [])
-    return result
-
-
-def _set_translation_import_content(enriched_content, plugin):
-    plugin_class = get_plugin_class(plugin['plugin_type'])
-    try:
-        result = plugin_class.set_translation_import_content(enriched_content, plugin['data'])
-    except AttributeError:
-        result = {}
-    return result
-
-
 class SupertextException(ProviderException):
     pass
 
@@ -81,6 +60,7 @@ class SupertextTranslationProvider(BaseTranslationProvider):
     )
     CURRENCY_KEY = 'Currency'
     PRICE_KEY = 'Price'
+    WORD_COUNT_KEY = 'WordCount'
 
     def get_headers(self):
         return {
@@ -94,15 +74,7 @@ class SupertextTranslationProvider(BaseTranslationProvider):
             settings.DJANGOCMS_TRANSLATIONS_SUPERTEXT_PASSWORD,
         )
 
-    def make_request(self, method, section, **kwargs):
-        response = requests.request(
-            method=method,
-            url=self.get_url(section),
-            headers=self.get_headers(),
-            auth=self.get_auth(),
-            **kwargs
-        )
-
+    def check_response(self, response):
         if not response.ok:
             raise SupertextException(response.content)
         return response
@@ -113,94 +85,26 @@ class SupertextTranslationProvider(BaseTranslationProvider):
             'SourceLang': LANGUAGE_MAPPING.get(self.request.source_language, self.request.source_language),
             'TargetLanguages': [LANGUAGE_MAPPING.get(self.request.target_language, self.request.target_language)],
         }
-        groups = []
-        fields_by_plugin = {}
-
-        for placeholder in json.loads(self.request.export_content):
-            subplugins_already_processed = set()
-
-            for raw_plugin in placeholder['plugins']:
-                plugin_type = raw_plugin['plugin_type']
-
-                if raw_plugin['pk'] in subplugins_already_processed:
-                    continue
-
-                if plugin_type not in fields_by_plugin:
-                    fields_by_plugin[plugin_type] = get_translatable_fields(plugin_type)
-
-                items = []
-                for field in fields_by_plugin[plugin_type]:
-                    content, children_included_in_this_content = _get_translation_export_content(field, raw_plugin)
-                    subplugins_already_processed.update(children_included_in_this_content)
-
-                    if content:
-                        items.append({
-                            'Id': field,
-                            'Content': content,
-                        })
-
-                if items:
-                    groups.append({
-                        'GroupId': '{}:{}:{}'.format(
-                            placeholder['translation_request_item_pk'], placeholder['placeholder'], raw_plugin['pk']
-                        ),
-                        'Items': items
-                    })
-
-        data['Groups'] = groups
+        data['Groups'] = get_translation_groups(json.loads(self.request.get_payload('export_content')))
         return data
 
     def get_import_data(self):
         request = self.request
-        export_content = json.loads(request.export_content)
-        import_content = json.loads(request.order.response_content)
-        subplugins_already_processed = set()
-
-        # TLRD: data is like {translation_request_item_pk: {placeholder_name: {plugin_pk: plugin_dict}}}
-        data = defaultdict(dict)
-        for x in export_content:
-            translation_request_item_pk = x['translation_request_item_pk']
-            plugin_dict = OrderedDict((plugin['pk'], plugin) for plugin in x['plugins'])
-            data[translation_request_item_pk][x['placeholder']] = plugin_dict
-
-        for group in import_content['Groups']:
-            translation_request_item_pk, placeholder, plugin_id = group['GroupId'].split(':')
-            translation_request_item_pk = int(translation_request_item_pk)
-            plugin_id = int(plugin_id)
-
-            if plugin_id in subplugins_already_processed:
-                continue
-
-            for item in group['Items']:
-                plugin_dict = data[translation_request_item_pk][placeholder]
-                plugin = plugin_dict[plugin_id]
-                plugin['data'][item['Id']] = item['Content']
-                subplugins = _set_translation_import_content(item['Content'], plugin)
-                subplugins_already_processed.update(list(subplugins.keys()))
-                for subplugin_id, subplugin_content in subplugins.items():
-                    field = get_text_field_child_label(plugin_dict[subplugin_id]['plugin_type'])
-                    if field:
-                        plugin_dict[subplugin_id]['data'][field] = subplugin_content
-
-        # TLRD: return_data is like {translation_request_item_pk: [<djangocms_transfer.ArchivedPlaceholder>, ]}
-        return_data = {}
-        for translation_request_item_pk, placeholders_dict in data.items():
-            data = json.dumps([{
-                'placeholder': p,
-                'plugins': list(plugins.values()),
-            } for p, plugins in placeholders_dict.items()])
-            archived_placeholders = json.loads(data, object_hook=_object_version_data_hook)
-            return_data[translation_request_item_pk] = archived_placeholders
+        return get_translated_placeholders(
+            json.loads(request.get_payload('export_content')),
+            json.loads(request.get_payload('order_response_content'))['Groups'],
+        )
 
-        return return_data
+    def get_quote(self, data=None):
+        if data is None:
+            data = self.get_export_data()
+            self.request.request_content = data
+            self.request.save(update_fields=('request_content',))
 
-    def get_quote(self):
-        self.request.request_content = self.get_export_data()
-        self.request.save(update_fields=('request_content',))
         response = self.make_request(
             method='post',
             section='v1/translation/quote',
-            json=self.request.request_content,
+            json=data,
         )
         return response.json()
 
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import csv
+import json
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, TextField, Value, When
+from django.utils import six, timezone
+from django.utils.dateparse import parse_date
+
+from .models import TranslationRequest
+from .providers import get_provider_choices, get_provider_class
+
+
+REPORT_COLUMNS = (
+    'id',
+    'order_name',
+    'date_created',
+    'date_submitted',
+    'date_imported',
+    'state',
+    'provider',
+    'source_language',
+    'target_language',
+    'pages',
+    'word_count',
+    'price',
+    'currency',
+)
+
+
+def _get_provider_detail(attribute):
+    # Each provider stores the order details under its own keys.
+    cases = []
+
+    for name, label in get_provider_choices():
+        key = getattr(get_provider_class(name), attribute)
+
+        if key:
+            cases.append(When(provider_backend=name, then=KeyTextTransform(key, 'order__provider_details')))
+    return Case(*cases, default=Value(None), output_field=TextField())
+
+
+def parse_report_date(value):
+    date = parse_date(value)
+
+    if date is None:
+        raise ValueError('Invalid date: {}'.format(value))
+    return date
+
+
+def get_report_rows(date_from=None, date_to=None):
+    """
+    Returns the translation requests created between ``date_from`` and ``date_to``
+    (both included) as tuples of ``REPORT_COLUMNS``.
+    The rows are read from a server-side cursor, only the reported columns are selected.
+    """
+    queryset = TranslationRequest.objects.all()
+
+    if date_from:
+        queryset = queryset.filter(date_created__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+
+    if date_to:
+        date_to = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        queryset = queryset.filter(date_created__lt=date_to)
+
+    queryset = (
+        queryset
+        .annotate(
+            word_count=_get_provider_detail('WORD_COUNT_KEY'),
+            price=_get_provider_detail('PRICE_KEY'),
+            currency=_get_provider_detail('CURRENCY_KEY'),
+        )
+        .order_by('pk')
+        .values_list(
+            'pk',
+            'provider_order_name',
+            'date_created',
+            'date_submitted',
+            'date_imported',
+            'state',
+            'provider_backend',
+            'source_language',
+            'target_language',
+            'item_count',
+            'word_count',
+            'price',
+            'currency',
+        )
+    )
+    return queryset.iterator()
+
+
+class _Echo(object):
+    def write(self, value):
+        return value
+
+
+def _encode_row(row):
+    return [value.encode('utf-8') if isinstance(value, six.text_type) else value for value in row]
+
+
+def iter_csv_report(rows):
+    """
+    Yields the lines of the CSV report as text.
+    """
+    writer = csv.writer(_Echo())
+
+    for row in chain([REPORT_COLUMNS], rows):
+        if six.PY2:
+            # The csv module of Python 2 only writes bytes.
+            yield writer.writerow(_encode_row(row)).decode('utf-8')
+        else:
+            yield writer.writerow(row)
+
+
+def iter_json_report(rows):
+    yield '['
+
+    for index, row in enumerate(rows):
+        yield (',\n' if index else '\n') + json.dumps(dict(zip(REPORT_COLUMNS, row)), cls=DjangoJSONEncoder)
+    yield '\n]\n'
+
+
+REPORT_FORMATS = {
+    'csv': ('text/csv', iter_csv_report),
+    'json': ('application/json', iter_json_report),
+}
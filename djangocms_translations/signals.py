@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from django.dispatch import Signal
+
+
+# Sent by the provider class when its circuit breaker changes state,
+# ``state`` is one of "open", "half_open" or "closed".
+provider_circuit_changed = Signal(providing_args=['name', 'state'])
+
+# Sent by the provider class when a call is refused by its rate limiter.
+provider_throttled = Signal(providing_args=['name', 'retry_after'])
@@ -0,0 +1,89 @@
+/*
+ * Renders translation payloads as a collapsible tree,
+ * fetching each node page by page when it is expanded.
+ */
+(function () {
+    'use strict';
+
+    function fetchPage(url, path, page, callback) {
+        var request = new XMLHttpRequest();
+        var query = '?path=' + encodeURIComponent(path.join('/')) + '&page=' + page;
+
+        request.open('GET', url + query);
+        request.onload = function () {
+            if (request.status === 200) {
+                callback(JSON.parse(request.responseText));
+            }
+        };
+        request.send();
+    }
+
+    function renderNode(url, path, node) {
+        var item = document.createElement('li');
+        var label = document.createElement('code');
+
+        label.textContent = node.key + ': ';
+        item.appendChild(label);
+
+        if (node.type === 'value') {
+            item.appendChild(document.createTextNode(JSON.stringify(node.value)));
+            return item;
+        }
+
+        var toggle = document.createElement('a');
+        var childPath = path.concat([String(node.key)]);
+        var list;
+
+        toggle.href = '#';
+        toggle.textContent = (node.type === 'array' ? '[' : '{') + node.size + (node.type === 'array' ? ']' : '}');
+        toggle.addEventListener('click', function (event) {
+            event.preventDefault();
+            if (list) {
+                list.hidden = !list.hidden;
+                return;
+            }
+            list = document.createElement('ul');
+            item.appendChild(list);
+            loadPage(url, childPath, 1, list);
+        });
+        item.appendChild(toggle);
+        return item;
+    }
+
+    function loadPage(url, path, page, list) {
+        fetchPage(url, path, page, function (data) {
+            data.children.forEach(function (node) {
+                list.appendChild(renderNode(url, path, node));
+            });
+
+            if (data.page < data.num_pages) {
+                var more = document.createElement('li');
+                var link = document.createElement('a');
+
+                link.href = '#';
+                link.textContent = '… (' + (data.count - data.page * data.children.length) + ')';
+                link.addEventListener('click', function (event) {
+                    event.preventDefault();
+                    list.removeChild(more);
+                    loadPage(url, path, data.page + 1, list);
+                });
+                more.appendChild(link);
+                list.appendChild(more);
+            }
+        });
+    }
+
+    document.addEventListener('click', function (event) {
+        if (!event.target.classList.contains('js-translations-payload-load')) {
+            return;
+        }
+        event.preventDefault();
+
+        var container = event.target.parentNode;
+        var list = document.createElement('ul');
+
+        container.removeChild(event.target);
+        container.appendChild(list);
+        loadPage(container.getAttribute('data-url'), [], 1, list);
+    });
+})();
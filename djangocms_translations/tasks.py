@@ -1,11 +1,416 @@
 # -*- coding: utf-8 -*-
+import logging
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from multiprocessing.pool import ThreadPool
+
+from django.core.cache import caches
+from django.db import IntegrityError, connection
+from django.utils import timezone
+
 from celery import shared_task
 
-from .models import TranslationRequest
+from . import conf
+from .models import PendingTranslation, TranslationRequest
+from .payloads import archive_old_payloads
+from .providers.base import ProviderUnavailable
+
+
+PROVIDER_MAX_RETRIES = 10
+BULK_ACTION_CACHE_KEY = 'djangocms_translations:bulk_action:{}'
+BULK_SLOT_CACHE_KEY = 'djangocms_translations:bulk_slot:{}'
+
+logger = logging.getLogger('djangocms_translations')
+
+
+def is_bulk_request(item_count):
+    return item_count > conf.TRANSLATIONS_INTERACTIVE_MAX_ITEMS
+
+
+def get_queue(item_count):
+    """
+    Returns the queue of the tasks of a translation request with ``item_count`` pages,
+    so that bulk requests don't hold up the single page requests of the editors.
+    """
+    if is_bulk_request(item_count):
+        return conf.TRANSLATIONS_BULK_QUEUE
+    return conf.TRANSLATIONS_INTERACTIVE_QUEUE
+
+
+def get_bulk_slot_timeout(item_count):
+    return conf.TRANSLATIONS_BULK_SLOT_TIMEOUT + conf.TRANSLATIONS_BULK_SLOT_PAGE_TIMEOUT * item_count
+
+
+def acquire_bulk_slot(item_count=0):
+    """
+    Takes one of the ``DJANGOCMS_TRANSLATIONS_BULK_CONCURRENCY`` slots shared by
+    all workers and returns its key, or ``None`` when all of them are taken.
+    The slot is released by its holder, or once long enough for ``item_count``
+    pages have passed in case the worker holding it dies.
+    """
+    cache = caches[conf.TRANSLATIONS_CACHE]
+    timeout = get_bulk_slot_timeout(item_count)
+
+    for slot in range(conf.TRANSLATIONS_BULK_CONCURRENCY):
+        key = BULK_SLOT_CACHE_KEY.format(slot)
+
+        if cache.add(key, True, timeout):
+            return key
+    return None
+
+
+def release_bulk_slot(key):
+    caches[conf.TRANSLATIONS_CACHE].delete(key)
+
+
+@contextmanager
+def bulk_slot(task, translation_request):
+    # Single page requests never wait for a slot.
+    if not is_bulk_request(translation_request.item_count):
+        yield
+        return
+
+    key = acquire_bulk_slot(translation_request.item_count)
+
+    if key is None:
+        raise task.retry(countdown=conf.TRANSLATIONS_BULK_SLOT_RETRY_DELAY)
+
+    try:
+        yield
+    finally:
+        release_bulk_slot(key)
+
+
+# Pipeline stages, see ``queue_quote()`` and ``queue_submission()``.
+# The export and import stages are acknowledged once done, so that they are
+# delivered again when a worker dies and resume with the remaining items.
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
+def export_translation_request(self, translation_request_id, start=0, stop=None):
+    translation_request = TranslationRequest.objects.get(pk=translation_request_id)
+
+    with bulk_slot(self, translation_request):
+        translation_request.set_content_from_cms(start, stop)
+
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
+def build_translation_request_content(self, translation_request_id):
+    translation_request = TranslationRequest.objects.get(pk=translation_request_id)
+
+    with bulk_slot(self, translation_request):
+        translation_request.set_request_content()
+
+
+@shared_task(bind=True, max_retries=PROVIDER_MAX_RETRIES)
+def quote_translation_request(self, translation_request_id):
+    translation_request = TranslationRequest.objects.get(pk=translation_request_id)
+
+    try:
+        translation_request.get_quote_from_provider()
+    except ProviderUnavailable as error:
+        raise self.retry(exc=error, countdown=error.retry_after)
+
+
+@shared_task(bind=True, max_retries=PROVIDER_MAX_RETRIES)
+def submit_translation_request(self, translation_request_id):
+    translation_request = TranslationRequest.objects.get(pk=translation_request_id)
+
+    # Requests exported by a previous stage are open.
+    if translation_request.state == TranslationRequest.STATES.OPEN:
+        translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+
+    try:
+        translation_request.submit_request()
+    except ProviderUnavailable as error:
+        raise self.retry(exc=error, countdown=error.retry_after)
+
+
+@shared_task(bind=True, max_retries=PROVIDER_MAX_RETRIES)
+def check_translation_request_status(self, translation_request_id):
+    translation_request = TranslationRequest.objects.select_related('order').get(pk=translation_request_id)
+
+    try:
+        translation_request.check_status()
+    except ProviderUnavailable as error:
+        raise self.retry(exc=error, countdown=error.retry_after)
+
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
+def import_translation_response(self, translation_request_id, raw_data=None):
+    # ``raw_data`` is only passed by tasks queued before the response was stored on the order.
+    translation_request = TranslationRequest.objects.select_related('order').defer_payloads().get(
+        pk=translation_request_id,
+    )
+
+    with bulk_slot(self, translation_request):
+        return translation_request.import_response(raw_data.encode('utf-8') if raw_data else None)
+
+
+def get_export_chunks(item_count):
+    """
+    Returns the ``(start, stop)`` item ranges exported by separate tasks, so that
+    workers pick up other tasks in between the chunks of a large request.
+    """
+    chunk_size = conf.TRANSLATIONS_EXPORT_CHUNK_SIZE
+    return [(start, start + chunk_size) for start in range(0, max(item_count, 1), chunk_size)]
+
+
+def _get_export_stages(translation_request_id, item_count):
+    return [
+        export_translation_request.si(translation_request_id, start, stop)
+        for start, stop in get_export_chunks(item_count)
+    ]
+
+
+def _queue_stages(stages, item_count):
+    # Imported here as ``celery.canvas`` is only needed when queuing.
+    from celery import chain
+
+    queue = get_queue(item_count)
+
+    if queue:
+        stages = [stage.set(queue=queue) for stage in stages]
+    return chain(*stages).delay()
+
+
+def _get_item_count(translation_request_id):
+    return TranslationRequest.objects.values_list('item_count', flat=True).get(pk=translation_request_id)
+
+
+def queue_quote(translation_request_id):
+    """
+    Exports the content of the translation request and gets quotes from the provider.
+    """
+    item_count = _get_item_count(translation_request_id)
+    stages = _get_export_stages(translation_request_id, item_count)
+    stages.append(build_translation_request_content.si(translation_request_id))
+    stages.append(quote_translation_request.si(translation_request_id))
+    return _queue_stages(stages, item_count)
+
+
+def queue_submission(translation_request_id, export=False, build_request_content=False):
+    """
+    Submits the translation request to the provider, exporting its content
+    and building the request content first if asked to.
+    """
+    item_count = _get_item_count(translation_request_id)
+    stages = []
+
+    if export:
+        stages.extend(_get_export_stages(translation_request_id, item_count))
+
+    if export or build_request_content:
+        stages.append(build_translation_request_content.si(translation_request_id))
+    stages.append(submit_translation_request.si(translation_request_id))
+    return _queue_stages(stages, item_count)
+
+
+def queue_task(task, translation_request, *args):
+    """
+    Queues a single stage of ``translation_request`` on the queue matching its size.
+    """
+    queue = get_queue(translation_request.item_count)
+    options = {'queue': queue} if queue else {}
+    return task.apply_async((translation_request.pk,) + args, **options)
 
 
 @shared_task
-def prepare_translation_bulk_request(translation_request_id):
+def flush_pending_translations():
+    """
+    Sends the pages published since the last run, to be scheduled periodically
+    when ``DJANGOCMS_TRANSLATIONS_AUTO_TRANSLATE`` is set.
+    """
+    translation_requests = PendingTranslation.create_requests()
+
+    for translation_request in translation_requests:
+        queue_quote(translation_request.pk)
+    return [translation_request.pk for translation_request in translation_requests]
+
+
+@shared_task
+def archive_old_translation_payloads():
+    """
+    Moves the payloads of old finished requests to the payload storage,
+    to be scheduled periodically.
+    """
+    return archive_old_payloads()
+
+
+@shared_task(bind=True, max_retries=PROVIDER_MAX_RETRIES)
+def prepare_translation_bulk_request(self, translation_request_id):
+    # Superseded by ``queue_quote()``, kept for messages queued before upgrading.
     translation_request = TranslationRequest.objects.get(id=translation_request_id)
-    translation_request.set_content_from_cms()
-    translation_request.get_quote_from_provider()
+
+    try:
+        if translation_request.state == TranslationRequest.STATES.DRAFT:
+            translation_request.set_content_from_cms()
+        translation_request.get_quote_from_provider()
+    except ProviderUnavailable as error:
+        # Circuit open or throttled: don't block the worker, try again later.
+        raise self.retry(exc=error, countdown=error.retry_after)
+
+
+# Bulk actions return True when applied, False when failed
+# and None when the translation request is not in a suitable state.
+
+def _check_status(translation_request):
+    if translation_request.state != TranslationRequest.STATES.IN_TRANSLATION:
+        return None
+    if not hasattr(translation_request, 'order'):
+        return None
+    translation_request.check_status()
+    return True
+
+
+def _reimport(translation_request):
+    # Resumes interrupted imports as well, the items already imported are skipped.
+    if translation_request.state not in (
+        TranslationRequest.STATES.IMPORT_STARTED,
+        TranslationRequest.STATES.IMPORT_FAILED,
+    ):
+        return None
+    if not hasattr(translation_request, 'order') or not translation_request.get_payload('order_response_content'):
+        return None
+    return translation_request.import_response()
+
+
+def _import_from_archive(translation_request):
+    if not translation_request.can_import_from_archive():
+        return None
+    try:
+        translation_request._import_from_archive()
+    except IntegrityError:
+        logger.exception('Failed to import plugins of translation request %s', translation_request.pk)
+        return False
+    return True
+
+
+def _cancel(translation_request):
+    if not translation_request.can_transition(TranslationRequest.STATES.CANCELLED):
+        return None
+    translation_request.set_status(TranslationRequest.STATES.CANCELLED)
+    return True
+
+
+def _delete_stale_draft(translation_request):
+    stale_before = timezone.now() - timedelta(days=conf.TRANSLATIONS_STALE_DRAFT_AGE)
+
+    if translation_request.state != TranslationRequest.STATES.DRAFT:
+        return None
+    if translation_request.date_created >= stale_before:
+        return None
+    translation_request.delete()
+    return True
+
+
+BULK_ACTIONS = {
+    'check_status': _check_status,
+    'reimport': _reimport,
+    'import_from_archive': _import_from_archive,
+    'cancel': _cancel,
+    'delete_stale_drafts': _delete_stale_draft,
+}
+
+
+def get_bulk_action_progress(job_id):
+    return caches[conf.TRANSLATIONS_CACHE].get(BULK_ACTION_CACHE_KEY.format(job_id))
+
+
+def _set_bulk_action_progress(job_id, progress):
+    cache = caches[conf.TRANSLATIONS_CACHE]
+    cache.set(BULK_ACTION_CACHE_KEY.format(job_id), progress, conf.TRANSLATIONS_BULK_ACTION_PROGRESS_TIMEOUT)
+
+
+def queue_bulk_action(action, translation_request_ids):
+    """
+    Runs ``action`` over the given translation requests in a background job
+    and returns the job id to poll ``get_bulk_action_progress()`` with.
+    """
+    assert action in BULK_ACTIONS, 'Unknown bulk action'
+    job_id = uuid.uuid4().hex
+    translation_request_ids = list(translation_request_ids)
+    _set_bulk_action_progress(job_id, {
+        'action': action,
+        'total': len(translation_request_ids),
+        'processed': 0,
+        'succeeded': 0,
+        'skipped': 0,
+        'failed': 0,
+        'done': False,
+    })
+    options = {'queue': conf.TRANSLATIONS_BULK_QUEUE} if conf.TRANSLATIONS_BULK_QUEUE else {}
+    run_bulk_action.apply_async((job_id, action, translation_request_ids), **options)
+    return job_id
+
+
+def _apply_bulk_action(action, translation_request):
+    try:
+        return BULK_ACTIONS[action](translation_request)
+    except Exception:  # noqa
+        # A single request must not abort the whole job.
+        logger.exception('Bulk action %s failed for translation request %s', action, translation_request.pk)
+        return False
+
+
+def _apply_bulk_action_in_thread(args):
+    try:
+        return _apply_bulk_action(*args)
+    finally:
+        # Each pool thread opens its own connection.
+        connection.close()
+
+
+def process_bulk_action(job_id, action, translation_request_ids):
+    progress = get_bulk_action_progress(job_id) or {
+        'action': action,
+        'total': len(translation_request_ids),
+        'processed': 0,
+        'succeeded': 0,
+        'skipped': 0,
+        'failed': 0,
+    }
+    batch_size = conf.TRANSLATIONS_BULK_ACTION_BATCH_SIZE
+    concurrency = conf.TRANSLATIONS_BULK_ACTION_CONCURRENCY
+    pool = ThreadPool(concurrency) if concurrency > 1 else None
+
+    try:
+        for start in range(0, len(translation_request_ids), batch_size):
+            batch = translation_request_ids[start:start + batch_size]
+            translation_requests = list(
+                TranslationRequest.objects
+                .filter(pk__in=batch)
+                .select_related('order')
+                .defer_payloads('order')
+            )
+
+            if pool:
+                results = pool.map(
+                    _apply_bulk_action_in_thread,
+                    [(action, translation_request) for translation_request in translation_requests],
+                )
+            else:
+                results = [
+                    _apply_bulk_action(action, translation_request)
+                    for translation_request in translation_requests
+                ]
+
+            # Requests deleted in the meantime are counted as skipped.
+            progress['processed'] += len(batch)
+            progress['succeeded'] += results.count(True)
+            progress['failed'] += results.count(False)
+            progress['skipped'] += len(batch) - len(results) + results.count(None)
+            _set_bulk_action_progress(job_id, progress)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    progress['done'] = True
+    _set_bulk_action_progress(job_id, progress)
+    return progress
+
+
+@shared_task
+def run_bulk_action(job_id, action, translation_request_ids):
+    return process_bulk_action(job_id, action, translation_request_ids)
@@ -1,23 +1,34 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import json
-from itertools import chain
+import math
+import re
+from collections import defaultdict
+from itertools import chain, islice
 
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import caches
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import BooleanField
 from django.forms import modelform_factory
+from django.utils import six
+from django.utils.encoding import force_bytes
 from django.utils.lru_cache import lru_cache
 from django.utils.safestring import mark_safe
 from django.utils.translation import get_language_info
 
+from cms.models import CMSPlugin
+
+from djangocms_transfer.helpers import get_bound_plugins, get_plugin_data
 from djangocms_transfer.utils import get_plugin_class, get_plugin_model
-from pygments import highlight
-from pygments.formatters import HtmlFormatter
-from pygments.lexers import JsonLexer
 from yurl import URL
 
-from .conf import TRANSLATIONS_CONF
+from .conf import (
+    TRANSLATIONS_CACHE, TRANSLATIONS_CONF, TRANSLATIONS_PAYLOAD_PAGE_SIZE,
+    TRANSLATIONS_PRETTY_CACHE_TIMEOUT,
+)
 
 
 try:
@@ -86,16 +97,130 @@ def add_domain(url, domain=None):
     return str(url.replace(host=domain))
 
 
+@lru_cache(maxsize=None)
+def get_pretty_style():
+    from pygments.formatters import HtmlFormatter
+
+    return '<style>' + HtmlFormatter(style='colorful').get_style_defs() + '</style><br>'
+
+
+def _highlight(data, LexerClass):
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+
+    return highlight(data, LexerClass(), HtmlFormatter(style='colorful'))
+
+
 def pretty_data(data, LexerClass):
-    formatter = HtmlFormatter(style='colorful')
-    data = highlight(data, LexerClass(), formatter)
-    style = '<style>' + formatter.get_style_defs() + '</style><br>'
-    return mark_safe(style + data)
+    return mark_safe(get_pretty_style() + _highlight(data, LexerClass))
 
 
 def pretty_json(data):
-    data = json.dumps(json.loads(data), sort_keys=True, indent=2)
-    return pretty_data(data, JsonLexer)
+    """
+    Highlights the serialized JSON ``data``, caching the result by its hash
+    so that the same content is never formatted twice.
+    """
+    cache = caches[TRANSLATIONS_CACHE]
+    key = 'djangocms_translations:pretty_json:{}'.format(hashlib.sha1(force_bytes(data)).hexdigest())
+    highlighted = cache.get(key)
+
+    if highlighted is None:
+        from pygments.lexers import JsonLexer
+
+        data = json.dumps(json.loads(data), sort_keys=True, indent=2)
+        highlighted = _highlight(data, JsonLexer)
+        cache.set(key, highlighted, TRANSLATIONS_PRETTY_CACHE_TIMEOUT)
+    return mark_safe(get_pretty_style() + highlighted)
+
+
+def get_content_fingerprint(placeholders):
+    """
+    Returns a hash of exported placeholders, ignoring the request item
+    they were exported for, so that page content can be compared over time.
+    """
+    placeholders = json.loads(json.dumps(placeholders, cls=DjangoJSONEncoder))
+    for placeholder in placeholders:
+        placeholder.pop('translation_request_item_pk', None)
+    data = json.dumps(placeholders, sort_keys=True)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def _get_export_order(plugin):
+    # Root plugins by position, then their descendants by path, like djangocms-transfer.
+    if plugin.depth == 1:
+        return (0, plugin.position, plugin.path)
+    return (1, 0, plugin.path)
+
+
+def get_page_export_data(cms_page, language):
+    """
+    Same as ``djangocms_transfer.exporter.get_page_export_data``, but the
+    plugins of all the placeholders of ``cms_page`` are fetched at once
+    instead of twice per placeholder.
+    """
+    placeholders = list(cms_page.rescan_placeholders().values())
+    plugins = CMSPlugin.objects.filter(placeholder__in=placeholders, language=language)
+    plugins_by_placeholder = defaultdict(list)
+
+    # Downcast once per plugin type of the page, the order is kept.
+    for plugin in get_bound_plugins(sorted(plugins, key=_get_export_order)):
+        plugins_by_placeholder[plugin.placeholder_id].append(get_plugin_data(plugin))
+    return [
+        {'placeholder': placeholder.slot, 'plugins': plugins_by_placeholder[placeholder.pk]}
+        for placeholder in placeholders
+    ]
+
+
+def _get_payload_node(key, value):
+    if isinstance(value, dict):
+        return {'key': key, 'type': 'object', 'size': len(value)}
+    if isinstance(value, list):
+        return {'key': key, 'type': 'array', 'size': len(value)}
+    return {'key': key, 'type': 'value', 'value': value}
+
+
+def get_payload_page(data, path=(), page=1, page_size=TRANSLATIONS_PAYLOAD_PAGE_SIZE):
+    """
+    Returns one page of the children of the node found at ``path`` in ``data``,
+    containers only reporting their size so that they can be fetched on demand.
+    Raises ``LookupError`` for invalid paths.
+    """
+    if isinstance(data, six.string_types):
+        # Export content is stored as serialized JSON.
+        data = json.loads(data)
+
+    for key in path:
+        if isinstance(data, list):
+            try:
+                key = int(key)
+            except ValueError:
+                raise LookupError(key)
+        elif not isinstance(data, dict):
+            raise LookupError(key)
+
+        try:
+            data = data[key]
+        except (IndexError, KeyError):
+            raise LookupError(key)
+
+    if isinstance(data, dict):
+        children = sorted(data.items())
+    elif isinstance(data, list):
+        children = enumerate(data)
+    else:
+        raise LookupError(path)
+
+    count = len(data)
+    start = (page - 1) * page_size
+    return {
+        'count': count,
+        'page': page,
+        'num_pages': max(int(math.ceil(count / float(page_size))), 1),
+        'children': [
+            _get_payload_node(key, value)
+            for key, value in islice(children, start, start + page_size)
+        ],
+    }
 
 
 @lru_cache(maxsize=None)
@@ -148,3 +273,43 @@ def get_page_url(page, language, is_https=False):
         ),
         page.get_absolute_url(language=language),
     )
+
+
+PSEUDO_CHARACTERS = dict(zip(
+    map(ord, 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'),
+    u'àƀçđéƒĝĥîĵķļɱñöþǫŕšţûṽŵẋýžÀƁÇĐÉƑĜĤÎĴĶĻṀÑÖÞǪŔŠŢÛṼŴẊÝŽ',
+))
+PSEUDO_MARKUP_RE = re.compile(r'(<[^>]*>|&#?\w+;)')
+
+
+def pseudo_localize(content, expansion=0.3):
+    """
+    Returns a pseudo-translation of ``content``: letters are replaced by
+    accented look-alikes and every text run is padded by ``expansion``
+    to simulate longer target languages. Markup (including ``<cms-plugin>``
+    tags) and HTML entities are left untouched.
+    """
+    if not isinstance(content, six.string_types):
+        return content
+
+    output = []
+    for chunk in PSEUDO_MARKUP_RE.split(content):
+        if not chunk.strip() or PSEUDO_MARKUP_RE.match(chunk):
+            output.append(chunk)
+            continue
+        text = chunk.strip()
+        padding = '~' * int(math.ceil(len(text) * expansion))
+        output.append(chunk.replace(text, u'[{}{}]'.format(text.translate(PSEUDO_CHARACTERS), padding), 1))
+    return ''.join(output)
+
+
+def get_word_count(groups):
+    """
+    Returns the number of words in the ``Items`` of Supertext-format ``groups``, ignoring markup.
+    """
+    return sum(
+        len(PSEUDO_MARKUP_RE.sub(' ', item['Content']).split())
+        for group in groups
+        for item in group['Items']
+        if isinstance(item['Content'], six.string_types)
+    )
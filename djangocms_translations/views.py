@@ -15,7 +15,11 @@ from cms.utils.conf import get_cms_setting
 
 from . import forms, models
 from .cms_renderer import UnboundPluginRenderer
-from .models import TranslationRequest
+from .models import InvalidTransition, TranslationRequest
+from .tasks import (
+    check_translation_request_status, import_translation_response, queue_quote,
+    queue_submission, queue_task, quote_translation_request,
+)
 from .utils import get_page_url
 
 
@@ -58,11 +62,16 @@ def process_provider_callback_view(request, pk):
     requests = (
         TranslationRequest
         .objects
-        .filter(state=TranslationRequest.STATES.IN_TRANSLATION)
+        .filter(state=TranslationRequest.STATES.IN_TRANSLATION, order__isnull=False)
+        .select_related('order')
+        .defer_payloads('order')
     )
     trans_request = get_object_or_404(requests, pk=pk)
-    success = trans_request.import_response(request.body)
-    return JsonResponse({'success': success})
+    # Stored before answering, the task only gets the request to import.
+    trans_request.order.response_content = request.body.decode('utf-8')
+    trans_request.order.save(update_fields=('response_content',))
+    queue_task(import_translation_response, trans_request)
+    return JsonResponse({'success': True})
 
 
 @login_required
@@ -83,7 +92,7 @@ def import_from_archive(request, pk):
 
         try:
             trans_request._import_from_archive()
-        except IntegrityError:
+        except (IntegrityError, InvalidTransition):
             messages.error(request, ugettext('Failed to import plugins.'))
             redirect_to = reverse('admin:translation-request-adjust-import-data', args=(pk,))
         else:
@@ -119,8 +128,7 @@ class CreateTranslationRequestView(CreateView):
 
     def form_valid(self, form):
         response = super(CreateTranslationRequestView, self).form_valid(form)
-        self.object.set_content_from_cms()
-        self.object.get_quote_from_provider()
+        queue_quote(self.object.pk)
         return response
 
 
@@ -132,10 +140,36 @@ class ChooseTranslationQuoteView(UpdateView):
     def get_success_url(self):
         return reverse('admin:djangocms_translations_translationrequest_changelist')
 
+    def get_template_names(self):
+        if self.object.state != models.TranslationRequest.STATES.PENDING_APPROVAL:
+            # The quotes are still being requested in the background.
+            return ['djangocms_translations/pending_quote.html']
+        return super(ChooseTranslationQuoteView, self).get_template_names()
+
+    def get_context_data(self, **kwargs):
+        context = super(ChooseTranslationQuoteView, self).get_context_data(**kwargs)
+        context['in_progress'] = self.object.state in (
+            models.TranslationRequest.STATES.DRAFT,
+            models.TranslationRequest.STATES.OPEN,
+            models.TranslationRequest.STATES.PENDING_QUOTE,
+        )
+        return context
+
     def form_valid(self, form):
+        try:
+            self.object.set_status(models.TranslationRequest.STATES.READY_FOR_SUBMISSION)
+        except InvalidTransition:
+            # Submitted twice, e.g. from two browser tabs.
+            messages.error(self.request, ugettext('This translation request has already been submitted.'))
+            return redirect(self.get_success_url())
+
         response = super(ChooseTranslationQuoteView, self).form_valid(form)
-        self.object.set_status(models.TranslationRequest.STATES.READY_FOR_SUBMISSION)
-        self.object.submit_request()
+        provider_backend = self.object.selected_quote.provider_backend
+        switch_provider = provider_backend and provider_backend != self.object.provider_backend
+
+        if switch_provider:
+            self.object.set_provider_backend(provider_backend)
+        queue_submission(self.object.pk, build_request_content=switch_provider)
         return response
 
 
@@ -148,23 +182,23 @@ def get_quote_from_provider_view(request, pk):
         TranslationRequest.objects.filter(state=TranslationRequest.STATES.PENDING_QUOTE),
         pk=pk,
     )
-    translation_request.get_quote_from_provider()
+    queue_task(quote_translation_request, translation_request)
     return JsonResponse({'success': True})
 
 
 class TranslationRequestStatusView(DetailView):
     template_name = 'djangocms_translations/status_detail.html'
-    model = models.TranslationRequest
+    queryset = models.TranslationRequest.objects.defer_payloads()
 
 
 class CheckRequestStatusView(DetailView):
-    model = models.TranslationRequest
+    queryset = models.TranslationRequest.objects.filter(order__isnull=False).defer_payloads()
 
     def get_success_url(self):
         return reverse('admin:djangocms_translations_translationrequest_changelist')
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
-        self.object.check_status()
-        messages.success(request, 'Status updated.')
+        queue_task(check_translation_request_status, self.object)
+        messages.success(request, ugettext('The status will be updated shortly.'))
         return redirect(self.get_success_url())
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from cms.api import add_plugin, create_page, create_title
+
+
+TEMPLATE = 'test_benchmark.html'
+SLOTS = ('content', 'sidebar', 'header', 'footer')
+TEXT = (
+    '<p>Lorem ipsum dolor sit amet, <strong>consectetur</strong> adipiscing elit, '
+    'sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>'
+)
+
+
+def _add_text_plugin(placeholder, language, index, children):
+    text = add_plugin(placeholder, 'DummyTextPlugin', language, body='')
+    links = [
+        add_plugin(placeholder, 'DummyLinkPlugin', language, target=text, label='Link {} {}'.format(index, child))
+        for child in range(children)
+    ]
+    text.body = '<h2>Section {}</h2>{}{}'.format(
+        index,
+        TEXT * 3,
+        ''.join('<p>See <cms-plugin id="{}"></cms-plugin> too.</p>'.format(link.pk) for link in links),
+    )
+    text.save()
+    return text
+
+
+def generate_site(pages=10, placeholders=1, plugins=10, children=1, languages=('en', 'de')):
+    """
+    Creates ``pages`` pages titled in all ``languages``, each with ``plugins`` text
+    plugins per language in ``placeholders`` placeholders. Every text plugin has
+    ``children`` link plugins nested in its body and is followed by a spacer.
+    Returns the pages.
+    """
+    assert placeholders <= len(SLOTS), 'The benchmark template has {} placeholders'.format(len(SLOTS))
+    created = []
+
+    for page_index in range(pages):
+        page = create_page('Page {}'.format(page_index), TEMPLATE, languages[0])
+
+        for language in languages[1:]:
+            create_title(language, 'Page {} {}'.format(page_index, language), page)
+
+        for slot in SLOTS[:placeholders]:
+            placeholder = page.placeholders.get(slot=slot)
+
+            for language in languages:
+                for plugin_index in range(plugins):
+                    _add_text_plugin(placeholder, language, plugin_index, children)
+                    add_plugin(placeholder, 'DummySpacerPlugin', language)
+        created.append(page)
+    return created
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from cms.test_utils.testcases import CMSTestCase
+
+from tests.benchmarks.site import generate_site
+
+from djangocms_translations.models import (
+    TranslationRequest, TranslationRequestItem,
+)
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2, peak memory isn't measured.
+    tracemalloc = None
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SCALES = OrderedDict([
+    ('small', {'pages': 5, 'placeholders': 1, 'plugins': 5, 'children': 1, 'languages': ('en', 'de')}),
+    ('medium', {'pages': 10, 'placeholders': 2, 'plugins': 5, 'children': 2, 'languages': ('en', 'de', 'pt-br')}),
+    ('large', {'pages': 25, 'placeholders': 4, 'plugins': 10, 'children': 3, 'languages': ('en', 'de', 'pt-br')}),
+])
+DEFAULT_SCALES = 'small,medium'
+
+
+class QueryCounter(object):
+    # Unlike ``CaptureQueriesContext`` not limited to the last 9000 queries.
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def append(self, query):
+        # Stands in for the query log of the connection on Django < 2.0.
+        self.count += 1
+
+
+@contextmanager
+def count_queries():
+    """
+    Yields a ``QueryCounter`` counting the queries of the block.
+    """
+    query_counter = QueryCounter()
+
+    if hasattr(connection, 'execute_wrapper'):
+        with connection.execute_wrapper(query_counter):
+            yield query_counter
+        return
+
+    # Django < 2.0 has no execute wrappers, the debug cursor logs the queries instead.
+    queries_log = connection.queries_log
+    force_debug_cursor = connection.force_debug_cursor
+    connection.queries_log = query_counter
+    connection.force_debug_cursor = True
+
+    try:
+        yield query_counter
+    finally:
+        connection.queries_log = queries_log
+        connection.force_debug_cursor = force_debug_cursor
+
+
+def measure(func, *args):
+    """
+    Returns the result of ``func(*args)`` and its wall time in seconds, number
+    of queries and peak of allocated memory in bytes. The wall time includes
+    the overhead of tracing the memory allocations.
+    """
+    if tracemalloc:
+        tracemalloc.start()
+
+    with count_queries() as query_counter:
+        started = time.time()
+        result = func(*args)
+        wall = time.time() - started
+
+    if tracemalloc:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        peak_memory = None
+    return result, {'wall': wall, 'queries': query_counter.count, 'peak_memory': peak_memory}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the results next to the baseline and returns the regressions: more
+    queries than the baseline, or more than ``tolerance`` times its peak memory.
+    Wall times depend on the machine and are only reported.
+    """
+    regressions = []
+    row = '{:<8} {:<20} {:>10} {:>10} {:>8} {:>8} {:>10} {:>10}'
+    print(row.format('scale', 'stage', 'wall ms', 'baseline', 'queries', 'baseline', 'peak KiB', 'baseline'))
+
+    for scale, stages in results.items():
+        for stage, metrics in stages.items():
+            expected = baseline.get(scale, {}).get(stage, {})
+            print(row.format(
+                scale,
+                stage,
+                int(metrics['wall'] * 1000),
+                int(expected['wall'] * 1000) if 'wall' in expected else '-',
+                metrics['queries'],
+                expected.get('queries', '-'),
+                metrics['peak_memory'] // 1024 if metrics['peak_memory'] else '-',
+                expected['peak_memory'] // 1024 if expected.get('peak_memory') else '-',
+            ))
+
+            if metrics['queries'] > expected.get('queries', metrics['queries']):
+                regressions.append('{} {}: {} queries instead of {}'.format(
+                    scale, stage, metrics['queries'], expected['queries'],
+                ))
+
+            if metrics['peak_memory'] and expected.get('peak_memory'):
+                if metrics['peak_memory'] > expected['peak_memory'] * tolerance:
+                    regressions.append('{} {}: {} bytes peak memory instead of {}'.format(
+                        scale, stage, metrics['peak_memory'], expected['peak_memory'],
+                    ))
+    return regressions
+
+
+@skipUnless(os.environ.get('BENCHMARK'), 'Set BENCHMARK=1 to run the benchmarks.')
+class PipelineBenchmark(CMSTestCase):
+    """
+    Measures the stages of a translation request with the pseudo-localization
+    provider on generated sites. ``BENCHMARK_SCALES`` selects the scales
+    (default ``small,medium``), ``BENCHMARK_SAVE=1`` stores the results as the
+    new baseline and ``BENCHMARK_TOLERANCE`` (default ``1.5``) is the allowed
+    peak memory growth.
+    """
+
+    def _run_stages(self, pages, languages):
+        translation_request = TranslationRequest.objects.create(
+            user=self.get_superuser(),
+            source_language=languages[0],
+            target_language=languages[1],
+            provider_backend=PseudoTranslationProvider.__name__,
+        )
+        TranslationRequestItem.objects.bulk_create([
+            TranslationRequestItem(translation_request=translation_request, source_cms_page=page, target_cms_page=page)
+            for page in pages
+        ])
+        translation_request.update_item_count()
+        provider = translation_request.provider
+        stages = OrderedDict()
+
+        result, stages['export'] = measure(translation_request.set_content_from_cms)
+        translation_request.request_content, stages['get_export_data'] = measure(provider.get_export_data)
+        translation_request.save(update_fields=('request_content',))
+
+        translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+        translation_request.set_status(TranslationRequest.STATES.IN_TRANSLATION)
+        provider.send_request()
+        response_content = provider.get_response_content()
+        translation_request.order.response_content = response_content.decode('utf-8')
+        translation_request.order.save(update_fields=('response_content',))
+
+        import_data, stages['get_import_data'] = measure(provider.get_import_data)
+        result, stages['import_response'] = measure(translation_request.import_response, response_content)
+        self.assertEquals(translation_request.state, TranslationRequest.STATES.IMPORTED)
+
+        def set_import_archive():
+            for translation_request_item_pk, placeholders in import_data.items():
+                translation_request._set_import_archive(translation_request_item_pk, placeholders)
+
+        result, stages['set_import_archive'] = measure(set_import_archive)
+        return stages
+
+    def test_pipeline(self):
+        scales = os.environ.get('BENCHMARK_SCALES', DEFAULT_SCALES).split(',')
+        tolerance = float(os.environ.get('BENCHMARK_TOLERANCE', 1.5))
+        results = OrderedDict()
+
+        for scale in scales:
+            options = SCALES[scale]
+
+            with transaction.atomic():
+                cache.clear()
+                pages = generate_site(**options)
+                results[scale] = self._run_stages(pages, options['languages'])
+                # Each scale starts with an empty site.
+                transaction.set_rollback(True)
+
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as baseline_file:
+                baseline = json.load(baseline_file)
+        else:
+            baseline = {}
+
+        sys.stdout.write('\n')
+        regressions = compare(results, baseline, tolerance)
+
+        if os.environ.get('BENCHMARK_SAVE'):
+            baseline.update(results)
+
+            with open(BASELINE_PATH, 'w') as baseline_file:
+                json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+                baseline_file.write('\n')
+        else:
+            self.assertFalse(regressions, '\n'.join(regressions))
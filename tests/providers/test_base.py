@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from djangocms_translations import conf
+from djangocms_translations.providers.base import (
+    BaseTranslationProvider, CircuitBreaker, ProviderThrottled,
+    ProviderUnavailable, RateLimiter, get_provider_metrics,
+)
+from djangocms_translations.signals import provider_circuit_changed
+
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.states = []
+        provider_circuit_changed.connect(self._record_state)
+
+    def tearDown(self):
+        provider_circuit_changed.disconnect(self._record_state)
+
+    def _record_state(self, sender, name, state, **kwargs):
+        self.states.append(state)
+
+    def _get_circuit_breaker(self, reset_timeout=60):
+        return CircuitBreaker(BaseTranslationProvider, 'test', failure_threshold=2, reset_timeout=reset_timeout)
+
+    def test_opens_after_threshold(self):
+        circuit_breaker = self._get_circuit_breaker()
+
+        circuit_breaker.record_failure()
+        circuit_breaker.before_call()
+        self.assertEquals(circuit_breaker.get_state(), CircuitBreaker.CLOSED)
+
+        circuit_breaker.record_failure()
+        self.assertEquals(circuit_breaker.get_state(), CircuitBreaker.OPEN)
+        with self.assertRaises(ProviderUnavailable) as context:
+            circuit_breaker.before_call()
+        self.assertGreater(context.exception.retry_after, 0)
+        self.assertEquals(self.states, ['open'])
+        self.assertEquals(get_provider_metrics('test')['rejected'], 1)
+
+    def test_success_resets_failures(self):
+        circuit_breaker = self._get_circuit_breaker()
+
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+
+        self.assertEquals(circuit_breaker.get_state(), CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_single_trial(self):
+        circuit_breaker = self._get_circuit_breaker(reset_timeout=0)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        self.assertEquals(circuit_breaker.get_state(), CircuitBreaker.HALF_OPEN)
+
+        circuit_breaker.before_call()
+        with self.assertRaises(ProviderUnavailable):
+            circuit_breaker.before_call()
+
+        circuit_breaker.record_success()
+        self.assertEquals(circuit_breaker.get_state(), CircuitBreaker.CLOSED)
+        self.assertEquals(self.states, ['open', 'half_open', 'closed'])
+
+    def test_failed_trial_reopens(self):
+        circuit_breaker = self._get_circuit_breaker(reset_timeout=0)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+
+        circuit_breaker.before_call()
+        circuit_breaker.record_failure()
+
+        self.assertEquals(self.states, ['open', 'half_open', 'open'])
+        self.assertEquals(get_provider_metrics('test')['opened'], 2)
+
+
+class RateLimitedTranslationProvider(BaseTranslationProvider):
+    API_STAGE_URL = 'http://localhost/'
+    RATE_LIMIT = 1
+    RATE_LIMIT_WAIT = 0
+
+
+class MakeRequestTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_open_circuit_takes_no_rate_slot(self):
+        provider = RateLimitedTranslationProvider(request=None)
+        circuit_breaker = provider.get_circuit_breaker()
+
+        for attempt in range(provider.CIRCUIT_BREAKER_THRESHOLD):
+            circuit_breaker.record_failure()
+
+        for attempt in range(3):
+            with self.assertRaises(ProviderUnavailable):
+                provider.make_request('get', 'quote')
+        # The only slot of this second is still free.
+        provider.get_rate_limiter().acquire()
+
+
+class RateLimiterTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_throttles_above_rate(self):
+        rate_limiter = RateLimiter(BaseTranslationProvider, 'test', rate=5, max_wait=0)
+
+        with self.assertRaises(ProviderThrottled):
+            for attempt in range(20):
+                rate_limiter.acquire()
+        self.assertEquals(get_provider_metrics('test')['throttled'], 1)
+
+    def test_disabled(self):
+        rate_limiter = RateLimiter(BaseTranslationProvider, 'test', rate=None, max_wait=0)
+
+        for attempt in range(10):
+            rate_limiter.acquire()
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    })
+    def test_cache_without_storage(self):
+        # DummyCache stores nothing, every call is the first of its window.
+        with mock.patch.object(conf, 'TRANSLATIONS_CACHE', 'dummy'):
+            rate_limiter = RateLimiter(BaseTranslationProvider, 'test', rate=5, max_wait=0)
+
+            for attempt in range(10):
+                rate_limiter.acquire()
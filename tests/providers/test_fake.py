@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.test import SimpleTestCase
+
+from djangocms_translations.providers.fake import FakeSupertextApp
+from djangocms_translations.utils import pseudo_localize
+
+
+class PseudoLocalizeTestCase(SimpleTestCase):
+    def test_keeps_markup(self):
+        content = '<p>Please <cms-plugin id="1">click</cms-plugin> &amp; go.</p>'
+
+        result = pseudo_localize(content)
+
+        self.assertEquals(
+            result,
+            u'<p>[Þļéàšé~~] <cms-plugin id="1">[çļîçķ~~]</cms-plugin> &amp; [ĝö.~]</p>',
+        )
+
+    def test_ignores_non_text(self):
+        self.assertEquals(pseudo_localize(42), 42)
+        self.assertEquals(pseudo_localize(' '), ' ')
+
+
+class FakeSupertextAppTestCase(SimpleTestCase):
+    payload = {
+        'Groups': [
+            {
+                'GroupId': '1:content:2',
+                'Items': [{'Id': 'body', 'Content': '<p>Hello <b>brave</b> world</p>'}],
+            },
+        ],
+    }
+
+    def setUp(self):
+        self.callbacks = []
+        self.app = FakeSupertextApp(
+            price_per_word=1,
+            callback_delay=0,
+            send_callback=lambda url, body: self.callbacks.append((url, json.loads(body.decode('utf-8')))),
+        )
+
+    def _call(self, method, path, data=None):
+        body = json.dumps(data).encode('utf-8') if data is not None else b''
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+        }
+        setup_testing_defaults(environ)
+        status = []
+        response = self.app(environ, lambda s, headers: status.append(s))
+        return status[0], json.loads(b''.join(response).decode('utf-8'))
+
+    def test_quote(self):
+        status, data = self._call('POST', '/api/v1/translation/quote', self.payload)
+
+        self.assertEquals(status, '200 OK')
+        self.assertEquals(data['WordCount'], 3)
+        self.assertEquals(len(data['Options']), len(self.app.ORDER_TYPES))
+        delivery_options = data['Options'][0]['DeliveryOptions']
+        self.assertEquals([option['Price'] for option in delivery_options], [6, 4.5, 3.6, 3, 2.4])
+
+    def test_order_fires_callback(self):
+        order = dict(self.payload, CallbackUrl='http://example.com/callback/', OrderTypeId=6, DeliveryId=4)
+
+        status, data = self._call('POST', '/api/v1.1/translation/order', order)
+        order = self.app.orders[data[0]['Id']]
+        for attempt in range(100):
+            if order['Status'] == 'Done':
+                break
+            time.sleep(0.01)
+
+        self.assertEquals(status, '200 OK')
+        self.assertEquals(data[0]['Price'], 3)
+        url, callback = self.callbacks[-1]
+        self.assertEquals(url, 'http://example.com/callback/')
+        self.assertEquals(callback['Groups'][0]['GroupId'], '1:content:2')
+        self.assertEquals(
+            callback['Groups'][0]['Items'][0]['Content'],
+            pseudo_localize('<p>Hello <b>brave</b> world</p>'),
+        )
+
+        status, data = self._call('GET', '/api/v1/translation/order/{}'.format(data[0]['Id']))
+        self.assertEquals(data['Status'], 'Done')
+
+    def test_unknown_endpoint(self):
+        status, data = self._call('GET', '/api/v1/unknown')
+
+        self.assertEquals(status, '404 Not Found')
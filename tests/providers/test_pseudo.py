@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from django.core.management import CommandError, call_command
+from django.utils.six import StringIO
+
+from cms.api import add_plugin
+
+from tests.models import DummyLink, DummyText
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations import conf
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+from djangocms_translations.utils import pseudo_localize
+
+
+class PseudoTranslationProviderTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(PseudoTranslationProviderTestCase, self).setUp()
+        self.page = create_translated_page()
+        self.placeholder = self.page.placeholders.get(slot='content')
+        parent = add_plugin(self.placeholder, 'DummyTextPlugin', 'en', body='')
+        child = add_plugin(self.placeholder, 'DummyLinkPlugin', 'en', target=parent, label='Click here')
+        parent.body = '<p>Please <cms-plugin id="{}"></cms-plugin> to go.</p>'.format(child.pk)
+        parent.save()
+
+    def test_quote(self):
+        translation_request = self.create_translation_request([self.page])
+        translation_request.set_content_from_cms()
+
+        translation_request.get_quote_from_provider()
+
+        self.assertEquals(translation_request.state, TranslationRequest.STATES.PENDING_APPROVAL)
+        self.assertEquals([quote.price_amount for quote in translation_request.quotes.all()], [0])
+
+    def test_submit_imports_right_away(self):
+        translation_request = self.submit_translation_request(self.create_translation_request([self.page]))
+
+        self.assertEquals(translation_request.state, TranslationRequest.STATES.IMPORTED)
+        self.assertEquals(translation_request.order.provider_details['Id'], 'pseudo-{}'.format(translation_request.pk))
+        text = DummyText.objects.get(placeholder=self.placeholder, language='de')
+        self.assertIn('<cms-plugin id=', text.body)
+        self.assertTrue(text.body.startswith(pseudo_localize('<p>Please ')))
+        link = DummyLink.objects.get(placeholder=self.placeholder, language='de')
+        self.assertEquals(link.label, pseudo_localize('Click here'))
+
+    def test_command(self):
+        output = StringIO()
+
+        call_command('translations_pseudo_localize', source_language='en', target_language='de', stdout=output)
+
+        self.assertIn('1 pages (0 failed)', output.getvalue())
+        self.assertEquals(TranslationRequest.objects.get().state, TranslationRequest.STATES.IMPORTED)
+
+    def test_command_requires_registration(self):
+        providers = [
+            provider for provider in conf.TRANSLATIONS_PROVIDERS
+            if provider[0] != PseudoTranslationProvider.__name__
+        ]
+
+        self.patch_conf(TRANSLATIONS_PROVIDERS=providers)
+
+        with self.assertRaises(CommandError):
+            call_command('translations_pseudo_localize', source_language='en', target_language='de')
+        self.assertFalse(TranslationRequest.objects.exists())
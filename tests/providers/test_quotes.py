@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import time
+
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations import conf
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.providers.base import ProviderUnavailable
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+class FailingTranslationProvider(PseudoTranslationProvider):
+    def get_quotes(self, data=None):
+        raise ValueError('Invalid quote.')
+
+
+class SlowTranslationProvider(PseudoTranslationProvider):
+    QUOTE_TIMEOUT = 0.1
+
+    def get_quotes(self, data=None):
+        time.sleep(1)
+        return super(SlowTranslationProvider, self).get_quotes(data)
+
+
+class QuoteComparisonTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(QuoteComparisonTestCase, self).setUp()
+        self.patch_conf(TRANSLATIONS_PROVIDERS=tuple(conf.TRANSLATIONS_PROVIDERS) + tuple(
+            (cls.__name__, cls.__name__, '{}.{}'.format(__name__, cls.__name__))
+            for cls in (FailingTranslationProvider, SlowTranslationProvider)
+        ))
+
+        page = create_translated_page(body='<p>Hello</p>')
+        self.translation_request = self.create_translation_request(
+            [page],
+            provider_backend=SlowTranslationProvider.__name__,
+        )
+        self.translation_request.set_content_from_cms()
+
+    def test_skips_failing_providers(self):
+        self.patch_conf(TRANSLATIONS_QUOTE_PROVIDERS=(
+            PseudoTranslationProvider.__name__,
+            FailingTranslationProvider.__name__,
+        ))
+        started = time.time()
+
+        self.translation_request.get_quote_from_provider()
+
+        self.assertLess(time.time() - started, 1)
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.PENDING_APPROVAL)
+        quote = self.translation_request.quotes.get()
+        self.assertEquals(quote.provider_backend, PseudoTranslationProvider.__name__)
+
+    def test_quote_of_other_provider_is_submitted_to_it(self):
+        self.patch_conf(TRANSLATIONS_QUOTE_PROVIDERS=(PseudoTranslationProvider.__name__,))
+        self.translation_request.get_quote_from_provider()
+        quote = self.translation_request.quotes.get()
+
+        # As done by ChooseTranslationQuoteView and the queued stages.
+        self.translation_request.set_provider_backend(quote.provider_backend)
+        self.translation_request.set_request_content()
+        self.translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+        self.translation_request.submit_request()
+
+        self.translation_request.refresh_from_db()
+        self.assertEquals(self.translation_request.provider_backend, PseudoTranslationProvider.__name__)
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.IMPORTED)
+
+    def test_all_providers_unavailable(self):
+        self.patch_conf(TRANSLATIONS_QUOTE_PROVIDERS=(SlowTranslationProvider.__name__,))
+
+        with self.assertRaises(ProviderUnavailable) as context:
+            self.translation_request.get_quote_from_provider()
+        self.assertEquals(context.exception.retry_after, SlowTranslationProvider.QUOTE_TIMEOUT)
+
+    def test_request_content_is_reused(self):
+        self.patch_conf(TRANSLATIONS_QUOTE_PROVIDERS=(FailingTranslationProvider.__name__,))
+        self.translation_request.provider_backend = PseudoTranslationProvider.__name__
+        self.translation_request.request_content = {'Groups': []}
+        self.translation_request.save(update_fields=('provider_backend', 'request_content'))
+
+        self.translation_request.get_quote_from_provider()
+
+        self.translation_request.refresh_from_db()
+        self.assertEquals(self.translation_request.request_content, {'Groups': []})
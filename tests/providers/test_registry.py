@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from djangocms_translations.providers import (
+    get_provider_choices, get_provider_class,
+)
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+class ProviderRegistryTestCase(SimpleTestCase):
+    def test_choices(self):
+        self.assertIn('PseudoTranslationProvider', dict(get_provider_choices()))
+
+    def test_loads_provider_class(self):
+        self.assertIs(get_provider_class('PseudoTranslationProvider'), PseudoTranslationProvider)
+
+    def test_unknown_provider(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_provider_class('UnknownTranslationProvider')
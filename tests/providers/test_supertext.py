@@ -6,7 +6,7 @@ from cms.test_utils.testcases import CMSTestCase
 
 from djangocms_transfer.exporter import export_page
 
-from djangocms_translations.providers.supertext import (
+from djangocms_translations.providers.base import (
     _get_translation_export_content, _set_translation_import_content,
 )
 
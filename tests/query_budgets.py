@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudget(namedtuple('QueryBudget', ('base', 'per_page', 'per_plugin'))):
+    """
+    Upper bound of the queries of a stage: ``base`` plus ``per_page`` for each
+    page and ``per_plugin`` for each source plugin of the translation request.
+    """
+
+    def get_limit(self, pages, plugins):
+        return self.base + self.per_page * pages + self.per_plugin * plugins
+
+
+# Raise a budget on purpose only, with the reason in the commit.
+QUERY_BUDGETS = {
+    # The placeholders and the plugins of a page are fetched at once, the plugins are
+    # downcast once for each of the three plugin types of the generated pages.
+    'export': QueryBudget(12, 6, 0),
+    # The export hook of the text plugin looks up its nested plugins.
+    'request_content': QueryBudget(1, 0, 1),
+    'quote': QueryBudget(9, 0, 0),
+    'submit': QueryBudget(9, 0, 0),
+    # The target pages are fetched at once, but each item is locked and imported in
+    # its own transaction. djangocms-transfer creates and reorders each plugin on its
+    # own and marks each placeholder as dirty.
+    'import': QueryBudget(14, 12, 8),
+    'archive': QueryBudget(0, 7, 4),
+    'changelist': QueryBudget(9, 0, 0),
+    'change_view': QueryBudget(16, 0, 0),
+    'bulk_wizard': QueryBudget(35, 0, 0),
+    # The site and page choices and the selected pages. The item validation adds none,
+    # the languages of the pages are read from their rows.
+    'create_form': QueryBudget(5, 0, 0),
+    # The request with its order, then the response stored on the order.
+    'callback': QueryBudget(2, 0, 0),
+}
+
+
+class QueryBudgetMixin(object):
+    query_budgets = QUERY_BUDGETS
+
+    @contextmanager
+    def assertQueryBudget(self, stage, pages, plugins=0):
+        """
+        Fails if the block runs more queries than the budget of ``stage``
+        for ``pages`` pages with ``plugins`` plugins.
+        """
+        with CaptureQueriesContext(connection) as context:
+            yield
+
+        limit = self.query_budgets[stage].get_limit(pages, plugins)
+        message = '{} ran {} queries for {} pages and {} plugins, {} allowed:\n{}'.format(
+            stage,
+            len(context),
+            pages,
+            plugins,
+            limit,
+            '\n'.join(query['sql'] for query in context.captured_queries),
+        )
+        self.assertLessEqual(len(context), limit, message)
@@ -59,6 +59,23 @@ HELPER_SETTINGS = {
     'DJANGOCMS_TRANSLATIONS_SUPERTEXT_USER': os.environ.get('DJANGOCMS_TRANSLATIONS_SUPERTEXT_USER'),
     'DJANGOCMS_TRANSLATIONS_SUPERTEXT_PASSWORD': os.environ.get('DJANGOCMS_TRANSLATIONS_SUPERTEXT_PASSWORD'),
     'DJANGOCMS_TRANSLATIONS_USE_STAGING': True,
+    'DJANGOCMS_TRANSLATIONS_PROVIDERS': (
+        (
+            'SupertextTranslationProvider',
+            'Supertext',
+            'djangocms_translations.providers.supertext.SupertextTranslationProvider',
+        ),
+        (
+            'FakeSupertextTranslationProvider',
+            'Supertext (local fake)',
+            'djangocms_translations.providers.fake.FakeSupertextTranslationProvider',
+        ),
+        (
+            'PseudoTranslationProvider',
+            'Pseudo-localization (offline)',
+            'djangocms_translations.providers.pseudo.PseudoTranslationProvider',
+        ),
+    ),
 }
 
 
@@ -68,6 +85,7 @@ if 'test' in sys.argv:
     HELPER_SETTINGS['CMS_TEMPLATES'] = (
         ('test_fullwidth.html', 'Fullwidth'),
         ('test_page.html', 'Normal page'),
+        ('test_benchmark.html', 'Benchmark'),
     )
 
 
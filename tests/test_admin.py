@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import re
+import uuid
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cms.api import create_page
+
+from tests.utils import TranslationsTestCase
+
+from djangocms_translations import conf, models
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.tasks import process_bulk_action
+from djangocms_translations.utils import get_payload_page, pretty_json
+
+
+class PayloadPageTestCase(SimpleTestCase):
+    data = {'Groups': [{'GroupId': str(index), 'Items': []} for index in range(5)]}
+
+    def test_pages(self):
+        page = get_payload_page(self.data, path=['Groups'], page=2, page_size=2)
+
+        self.assertEquals(page['count'], 5)
+        self.assertEquals(page['num_pages'], 3)
+        self.assertEquals(
+            page['children'],
+            [{'key': 2, 'type': 'object', 'size': 2}, {'key': 3, 'type': 'object', 'size': 2}],
+        )
+
+    def test_serialized_data(self):
+        page = get_payload_page(json.dumps(self.data), path=['Groups', '0'])
+
+        self.assertEquals(page['children'], [
+            {'key': 'GroupId', 'type': 'value', 'value': '0'},
+            {'key': 'Items', 'type': 'array', 'size': 0},
+        ])
+
+    def test_invalid_path(self):
+        for path in (['Unknown'], ['Groups', 'x'], ['Groups', '9'], ['Groups', '0', 'GroupId']):
+            with self.assertRaises(LookupError):
+                get_payload_page(self.data, path=path)
+
+
+class PrettyJsonTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_by_content(self):
+        data = json.dumps({'b': 1, 'a': [1, 2]})
+        key = 'djangocms_translations:pretty_json:{}'.format(hashlib.sha1(data.encode('utf-8')).hexdigest())
+
+        highlighted = pretty_json(data)
+
+        self.assertIn('<style>', highlighted)
+        self.assertTrue(highlighted.endswith(cache.get(key)))
+        cache.set(key, 'cached')
+        self.assertTrue(pretty_json(data).endswith('cached'))
+
+
+class TranslationRequestAdminTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(TranslationRequestAdminTestCase, self).setUp()
+        self.translation_request = self.create_translation_request(
+            export_content=json.dumps([{'placeholder': 'content', 'plugins': [{'pk': 1}]}]),
+        )
+        self.client.force_login(self.user)
+
+    def test_change_view_defers_payload(self):
+        url = reverse('admin:djangocms_translations_translationrequest_change', args=(self.translation_request.pk,))
+
+        response = self.client.get(url)
+
+        self.assertContains(response, reverse(
+            'admin:translation-request-payload',
+            args=(self.translation_request.pk, 'export_content'),
+        ))
+        self.assertNotContains(response, 'placeholder')
+
+    def test_payload_view(self):
+        url = reverse('admin:translation-request-payload', args=(self.translation_request.pk, 'export_content'))
+
+        response = self.client.get(url, {'path': '0/plugins'})
+
+        self.assertEquals(response.json()['children'], [{'key': 0, 'type': 'object', 'size': 1}])
+        self.assertEquals(self.client.get(url, {'path': '1'}).status_code, 404)
+
+    def test_views_defer_payload_columns(self):
+        models.TranslationOrder.objects.create(
+            request=self.translation_request,
+            response_content={'Id': 'order-1', 'Groups': []},
+            provider_details={'Id': 'order-1'},
+        )
+        urls = [
+            reverse('admin:djangocms_translations_translationrequest_changelist'),
+            reverse('admin:djangocms_translations_translationrequest_change', args=(self.translation_request.pk,)),
+            reverse('admin:translation-request-pages-sent', args=(self.translation_request.pk,)),
+            reverse('admin:translation-request-show-log', args=(self.translation_request.pk,)),
+        ]
+
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+
+            self.assertEquals(response.status_code, 200)
+            for query in context.captured_queries:
+                # Keys may be extracted, whole payload columns must not be selected.
+                self.assertIsNone(re.search(r'_content"(,| FROM)', query['sql']))
+
+        self.assertContains(self.client.get(urls[1]), 'order-1')
+        url = reverse(
+            'admin:translation-request-payload',
+            args=(self.translation_request.pk, 'order_response_content'),
+        )
+        self.assertEquals(self.client.get(url).json()['count'], 2)
+
+    def test_choose_quote_waits_for_quotes(self):
+        url = reverse('admin:choose-translation-quote', args=(self.translation_request.pk,))
+
+        response = self.client.get(url)
+
+        self.assertTemplateUsed(response, 'djangocms_translations/pending_quote.html')
+        self.assertContains(response, 'http-equiv="refresh"')
+
+    def test_item_count(self):
+        page = create_page('test page', 'test_page.html', 'en')
+        item = self.translation_request.items.create(source_cms_page=page, target_cms_page=page)
+        self.translation_request.items.create(source_cms_page=page, target_cms_page=page)
+        item.delete()
+
+        self.translation_request.refresh_from_db()
+        self.assertEquals(self.translation_request.item_count, 1)
+
+        response = self.client.get(reverse('admin:djangocms_translations_translationrequest_changelist'))
+        self.assertContains(response, '>1</a>')
+
+
+class BulkActionTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(BulkActionTestCase, self).setUp()
+        cache.clear()
+        # Pool threads use their own connections and can't see the test transaction.
+        self.patch_conf(TRANSLATIONS_BULK_ACTION_BATCH_SIZE=2, TRANSLATIONS_BULK_ACTION_CONCURRENCY=1)
+        self.client.force_login(self.user)
+
+    def _run_action(self, action, translation_requests):
+        # Runs the job inline, as queue_bulk_action() would on an eager worker.
+        job_id = uuid.uuid4().hex
+        process_bulk_action(job_id, action, [translation_request.pk for translation_request in translation_requests])
+        return self.client.get(reverse('admin:translation-request-bulk-action-api', args=(job_id,))).json()
+
+    def test_cancel(self):
+        translation_requests = [
+            self.create_translation_request(state=TranslationRequest.STATES.OPEN),
+            self.create_translation_request(state=TranslationRequest.STATES.PENDING_APPROVAL),
+            self.create_translation_request(state=TranslationRequest.STATES.IMPORTED),
+        ]
+
+        progress = self._run_action('cancel', translation_requests)
+
+        self.assertEquals(progress, {
+            'action': 'cancel',
+            'total': 3,
+            'processed': 3,
+            'succeeded': 2,
+            'skipped': 1,
+            'failed': 0,
+            'done': True,
+        })
+        self.assertEquals(
+            [translation_request.state for translation_request in TranslationRequest.objects.order_by('pk')],
+            ['cancelled', 'cancelled', 'imported'],
+        )
+
+    def test_delete_stale_drafts(self):
+        stale = self.create_translation_request(
+            state=TranslationRequest.STATES.DRAFT,
+            age=conf.TRANSLATIONS_STALE_DRAFT_AGE + 1,
+        )
+        recent = self.create_translation_request(state=TranslationRequest.STATES.DRAFT)
+
+        progress = self._run_action('delete_stale_drafts', [stale, recent])
+
+        self.assertEquals((progress['succeeded'], progress['skipped']), (1, 1))
+        self.assertEquals(list(TranslationRequest.objects.values_list('pk', flat=True)), [recent.pk])
+
+    def test_unknown_job(self):
+        url = reverse('admin:translation-request-bulk-action-api', args=('0' * 32,))
+
+        self.assertEquals(self.client.get(url).status_code, 404)
+
+    def test_progress_page(self):
+        job_id = '0' * 32
+
+        response = self.client.get(reverse('admin:translation-request-bulk-action', args=(job_id,)))
+
+        self.assertContains(response, reverse('admin:translation-request-bulk-action-api', args=(job_id,)))
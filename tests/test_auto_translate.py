@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations.models import (
+    PendingTranslation, TranslationCoverage, TranslationRequest,
+)
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+class AutoTranslateTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(AutoTranslateTestCase, self).setUp()
+        self.patch_conf(
+            TRANSLATIONS_AUTO_TRANSLATE={'en': ('de',)},
+            TRANSLATIONS_AUTO_TRANSLATE_DELAY=0,
+            TRANSLATIONS_AUTO_TRANSLATE_PROVIDER=PseudoTranslationProvider.__name__,
+        )
+        self.pages = [
+            create_translated_page('page {}'.format(index), body='Text {}'.format(index), published=False)
+            for index in range(2)
+        ]
+
+    def test_publish_adds_pending_translation(self):
+        self.pages[0].publish('en')
+        self.pages[0].publish('en')
+        self.pages[0].publish('de')
+
+        pending = PendingTranslation.objects.get()
+        self.assertEquals(pending.page, self.pages[0])
+        self.assertEquals((pending.source_language, pending.target_language), ('en', 'de'))
+
+    def test_pages_wait_for_delay(self):
+        self.patch_conf(TRANSLATIONS_AUTO_TRANSLATE_DELAY=60)
+        self.pages[0].publish('en')
+
+        self.assertEquals(PendingTranslation.create_requests(), [])
+        self.assertEquals(PendingTranslation.objects.count(), 1)
+
+    def test_create_requests(self):
+        for page in self.pages:
+            page.publish('en')
+
+        translation_request, = PendingTranslation.create_requests()
+
+        self.assertEquals(translation_request.user, self.user)
+        self.assertEquals(translation_request.target_language, 'de')
+        self.assertEquals(translation_request.item_count, 2)
+        self.assertEquals(
+            set(translation_request.items.values_list('source_cms_page', flat=True)),
+            {page.pk for page in self.pages},
+        )
+        self.assertFalse(PendingTranslation.objects.exists())
+
+    def test_unchanged_and_in_translation_pages_are_left_out(self):
+        for page in self.pages:
+            page.publish('en')
+        TranslationCoverage._get_or_create_for_pages([self.pages[0].pk], 'de').update(
+            state=TranslationCoverage.STATES.TRANSLATED,
+        )
+        TranslationCoverage._get_or_create_for_pages([self.pages[1].pk], 'de').update(
+            state=TranslationCoverage.STATES.IN_TRANSLATION,
+        )
+
+        self.assertEquals(PendingTranslation.create_requests(), [])
+        self.assertFalse(TranslationRequest.objects.exists())
+        self.assertEquals(PendingTranslation.objects.get().page, self.pages[1])
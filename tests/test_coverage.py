@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from cms.api import add_plugin
+
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations.models import (
+    TranslationCoverage, TranslationRequest,
+)
+
+
+class TranslationCoverageTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(TranslationCoverageTestCase, self).setUp()
+        self.page = create_translated_page(body='<p>Hello</p>')
+        self.placeholder = self.page.placeholders.get(slot='content')
+
+    def _get_coverage(self, language='de'):
+        return TranslationCoverage.objects.get(page=self.page, language=language)
+
+    def test_rebuild(self):
+        call_command('translations_rebuild_coverage', stdout=StringIO())
+
+        self.assertEquals(self._get_coverage('de').state, TranslationCoverage.STATES.PRESENT)
+        self.assertEquals(self._get_coverage('pt-br').state, TranslationCoverage.STATES.MISSING)
+
+    def test_request_states(self):
+        translation_request = self.create_translation_request([self.page])
+        translation_request.set_content_from_cms()
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.IN_TRANSLATION)
+
+        translation_request.set_status(TranslationRequest.STATES.CANCELLED)
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.PRESENT)
+
+        translation_request = self._translate()
+        coverage = self._get_coverage()
+        self.assertEquals(coverage.state, TranslationCoverage.STATES.TRANSLATED)
+        self.assertEquals(coverage.last_request, translation_request)
+        self.assertEquals(coverage.source_page, self.page)
+        self.assertEquals(coverage.source_fingerprint, translation_request.items.get().export_fingerprint)
+        self.assertEquals(len(coverage.source_fingerprint), 40)
+
+    def test_imported_in_a_single_update(self):
+        translation_request = self.create_translation_request([self.page])
+        translation_request.set_content_from_cms()
+        TranslationRequest.objects.filter(pk=translation_request.pk).update(
+            state=TranslationRequest.STATES.IMPORT_STARTED,
+        )
+        translation_request.refresh_from_db()
+        translation_request.date_imported = timezone.now()
+
+        # The state transition, the coverage rows and their update.
+        with self.assertNumQueries(4):
+            translation_request.set_status(TranslationRequest.STATES.IMPORTED, update_fields=('date_imported',))
+
+    def test_stale_after_publishing_source(self):
+        self._translate()
+
+        self.page.publish('en')
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.TRANSLATED)
+
+        add_plugin(self.placeholder, 'DummyTextPlugin', 'en', body='<p>New</p>')
+        self.page.publish('en')
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.STALE)
+
+    def _translate(self):
+        return self.submit_translation_request(self.create_translation_request([self.page]))
+
+    def test_cancelled_request_keeps_stale(self):
+        self._translate()
+        add_plugin(self.placeholder, 'DummyTextPlugin', 'en', body='<p>New</p>')
+        self.page.publish('en')
+
+        translation_request = self.create_translation_request([self.page])
+        translation_request.set_content_from_cms()
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.IN_TRANSLATION)
+
+        translation_request.set_status(TranslationRequest.STATES.CANCELLED)
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.STALE)
+
+    def test_cancelled_request_stale_after_publishing_source(self):
+        self._translate()
+        translation_request = self.create_translation_request([self.page])
+        translation_request.set_content_from_cms()
+
+        add_plugin(self.placeholder, 'DummyTextPlugin', 'en', body='<p>New</p>')
+        self.page.publish('en')
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.IN_TRANSLATION)
+
+        translation_request.set_status(TranslationRequest.STATES.CANCELLED)
+        self.assertEquals(self._get_coverage().state, TranslationCoverage.STATES.STALE)
+
+    def test_api(self):
+        other_page = create_translated_page('other page', published=False)
+        other_page.publish('de')
+        call_command('translations_rebuild_coverage', stdout=StringIO())
+        self.client.force_login(self.user)
+
+        summary = self.client.get(reverse('admin:translation-coverage-api')).json()
+        self.assertEquals(summary['de'], {'present': 2})
+        self.assertEquals(summary['pt-br'], {'missing': 2})
+
+        pages = self.client.get(reverse('admin:translation-coverage-pages'), {'language': 'de'}).json()
+        self.assertEquals(pages['count'], 2)
+        self.assertEquals(pages['results'][0]['page'], self.page.pk)
+
+        response = self.client.get(reverse('admin:translation-coverage'))
+        self.assertContains(response, '?language=pt-br&amp;state=missing">2</a>')
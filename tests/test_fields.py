@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import json
+
+from django.db import connection
+
+from tests.utils import TranslationsTestCase
+
+from djangocms_translations.fields import ZLIB_HEADER, CompressedValue
+from djangocms_translations.models import TranslationRequest
+
+
+class CompressedJSONFieldTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(CompressedJSONFieldTestCase, self).setUp()
+        self.request_content = {'Groups': [{'GroupId': '1:content:1', 'Items': [{'Content': '<p>Hello</p>' * 100}]}]}
+        self.translation_request = self.create_translation_request(request_content=self.request_content)
+
+    def _get_column(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT request_content FROM djangocms_translations_translationrequest WHERE id = %s',
+                [self.translation_request.pk],
+            )
+            return bytes(cursor.fetchone()[0])
+
+    def test_stored_compressed(self):
+        data = self._get_column()
+
+        self.assertTrue(data.startswith(ZLIB_HEADER))
+        self.assertLess(len(data) * 10, len(json.dumps(self.request_content)))
+
+    def test_decoded_on_access(self):
+        translation_request = TranslationRequest.objects.get(pk=self.translation_request.pk)
+
+        self.assertIsInstance(translation_request.__dict__['request_content'], CompressedValue)
+        self.assertEquals(translation_request.request_content, self.request_content)
+        self.assertEquals(translation_request.__dict__['request_content'], self.request_content)
+
+    def test_deferred(self):
+        translation_request = TranslationRequest.objects.defer_payloads().get(pk=self.translation_request.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEquals(translation_request.request_content, self.request_content)
+
+    def test_reads_uncompressed(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE djangocms_translations_translationrequest SET request_content = %s WHERE id = %s',
+                [connection.Database.Binary(b'{"Groups": []}'), self.translation_request.pk],
+            )
+
+        self.assertEquals(TranslationRequest.objects.get().request_content, {'Groups': []})
+        value = TranslationRequest.objects.values_list('request_content', flat=True).get()
+        self.assertEquals(value.decode(), {'Groups': []})
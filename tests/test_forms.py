@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from django.urls import reverse
+
+from cms.api import create_page, create_title
+from cms.test_utils.testcases import CMSTestCase
+
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations.forms import (
+    TranslateInBulkStep2Form, _get_bulk_request_eligible_pages,
+)
+
+
+class BulkRequestEligiblePagesTestCase(CMSTestCase):
+    def _create_page(self, title, languages, parent=None):
+        page = create_page(title, 'test_page.html', languages[0], parent=parent)
+        for language in languages[1:]:
+            create_title(language, title, page)
+        return page
+
+    def test_ancestors_need_both_languages(self):
+        root = self._create_page('root', ['en', 'de'])
+        child = self._create_page('child', ['en', 'de'], parent=root)
+        grandchild = self._create_page('grandchild', ['en', 'de'], parent=child)
+        self._create_page('no de', ['en'], parent=root)
+        orphan = self._create_page('orphan parent', ['en'])
+        self._create_page('orphan', ['en', 'de'], parent=orphan)
+
+        with self.assertNumQueries(1):
+            pages = list(_get_bulk_request_eligible_pages('en', 'de'))
+
+        self.assertEquals(pages, [root, child, grandchild])
+
+    def test_deep_tree(self):
+        parent = None
+        pages = []
+
+        for depth in range(6):
+            # The fourth level lacks the target language, so do its descendants.
+            languages = ['en'] if depth == 3 else ['en', 'de']
+            parent = self._create_page('level {}'.format(depth), languages, parent=parent)
+            pages.append(parent)
+
+        with self.assertNumQueries(1):
+            eligible_pages = list(_get_bulk_request_eligible_pages('en', 'de'))
+
+        self.assertEquals(eligible_pages, pages[:3])
+
+
+class TranslateInBulkStep2FormTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(TranslateInBulkStep2FormTestCase, self).setUp()
+        self.root = create_translated_page('root', published=False)
+        self.child = create_translated_page('child', published=False, parent=self.root)
+        self.grandchild = create_translated_page('grandchild', published=False, parent=self.child)
+        self.sibling = create_translated_page('sibling', published=False)
+        self.translation_request = self.create_translation_request()
+
+    def test_renders_root_pages(self):
+        with self.assertNumQueries(2):
+            form = TranslateInBulkStep2Form(translation_request=self.translation_request)
+            html = str(form['pages'])
+
+        self.assertIn('data-pk="{}"'.format(self.root.pk), html)
+        self.assertIn('data-pk="{}"'.format(self.sibling.pk), html)
+        self.assertNotIn('data-pk="{}"'.format(self.child.pk), html)
+
+    def test_subtrees(self):
+        form = TranslateInBulkStep2Form(
+            data={'pages': [self.sibling.pk], 'subtrees': [self.child.pk]},
+            translation_request=self.translation_request,
+        )
+
+        self.assertTrue(form.is_valid())
+        self.assertEquals(form.cleaned_data['pages'], [self.child, self.grandchild, self.sibling])
+
+    def test_subtrees_queries(self):
+        form = TranslateInBulkStep2Form(
+            data={'subtrees': [self.root.pk, self.child.pk, self.sibling.pk]},
+            translation_request=self.translation_request,
+        )
+
+        # The subtrees with their nodes, then their pages.
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        self.assertEquals(len(form.cleaned_data['pages']), 4)
+
+    def test_requires_pages(self):
+        form = TranslateInBulkStep2Form(data={}, translation_request=self.translation_request)
+
+        self.assertFalse(form.is_valid())
+
+    def test_children_view(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session['translation_request_pk'] = self.translation_request.pk
+        session['bulk_translation_step'] = 1
+        session.save()
+
+        response = self.client.get(reverse('admin:translate-in-bulk-step-2'))
+        self.assertContains(response, reverse('admin:translate-in-bulk-step-2-children', args=(0,)))
+
+        response = self.client.get(reverse('admin:translate-in-bulk-step-2-children', args=(self.root.pk,)))
+        self.assertContains(response, 'data-pk="{}"'.format(self.child.pk))
+        self.assertNotContains(response, 'data-pk="{}"'.format(self.grandchild.pk))
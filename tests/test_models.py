@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import json
+
+from django.utils import timezone
+
+from cms.models import CMSPlugin
+
+from djangocms_transfer import exporter
+from tests.benchmarks.site import generate_site
+from tests.models import DummyText
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations.models import (
+    InvalidTransition, TransitionConflict, TranslationImport,
+    TranslationRequest,
+)
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+from djangocms_translations.utils import (
+    get_content_fingerprint, get_page_export_data,
+)
+
+
+class UnavailableTranslationProvider(PseudoTranslationProvider):
+    def send_request(self):
+        raise IOError('Provider down.')
+
+
+class TranslationRequestTransitionTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(TranslationRequestTransitionTestCase, self).setUp()
+        self.translation_request = self.create_translation_request(
+            state=TranslationRequest.STATES.READY_FOR_SUBMISSION,
+        )
+
+    def test_invalid_transition(self):
+        with self.assertRaises(InvalidTransition):
+            self.translation_request.set_status(TranslationRequest.STATES.IMPORTED)
+
+        self.translation_request.refresh_from_db()
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.READY_FOR_SUBMISSION)
+
+    def test_losing_transition_fails(self):
+        other = TranslationRequest.objects.get(pk=self.translation_request.pk)
+        self.translation_request.set_status(TranslationRequest.STATES.CANCELLED)
+
+        with self.assertRaises(TransitionConflict):
+            other.set_status(TranslationRequest.STATES.IN_TRANSLATION)
+
+        other.refresh_from_db()
+        self.assertEquals(other.state, TranslationRequest.STATES.CANCELLED)
+
+    def test_failed_submission_is_released(self):
+        self.translation_request._provider = UnavailableTranslationProvider(self.translation_request)
+
+        with self.assertRaises(IOError):
+            self.translation_request.submit_request()
+
+        self.translation_request.refresh_from_db()
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.READY_FOR_SUBMISSION)
+
+
+class TranslationRequestCheckpointTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(TranslationRequestCheckpointTestCase, self).setUp()
+        pages = [create_translated_page('page {}'.format(index), body='Text {}'.format(index)) for index in range(2)]
+        self.placeholders = [page.placeholders.get(slot='content') for page in pages]
+        self.translation_request = self.create_translation_request(pages)
+        self.items = list(self.translation_request.items.order_by('pk'))
+
+    def test_export_resumes_with_remaining_items(self):
+        self.items[0].export_content = [{'translation_request_item_pk': self.items[0].pk, 'checkpoint': True}]
+        self.items[0].date_exported = timezone.now()
+        self.items[0].save()
+
+        self.translation_request.set_content_from_cms()
+
+        export_content = json.loads(self.translation_request.export_content)
+        self.assertEquals(export_content[0], self.items[0].export_content[0])
+        self.assertEquals(export_content[-1]['translation_request_item_pk'], self.items[1].pk)
+        self.assertEquals(self.translation_request.items.filter(date_exported__isnull=True).count(), 0)
+
+    def test_export_content_of_items_is_cleared(self):
+        self.translation_request.set_content_from_cms()
+
+        export_content = json.loads(self.translation_request.export_content)
+        self.assertEquals(
+            [placeholder['translation_request_item_pk'] for placeholder in export_content],
+            [item.pk for item in self.items],
+        )
+        self.assertEquals(
+            list(self.translation_request.items.values_list('export_content', flat=True)),
+            [[], []],
+        )
+        self.assertEquals(self.translation_request.items.filter(date_exported__isnull=True).count(), 0)
+
+        with self.assertRaises(InvalidTransition):
+            self.translation_request.set_content_from_cms()
+        self.translation_request.refresh_from_db()
+        self.assertEquals(json.loads(self.translation_request.export_content), export_content)
+
+    def test_import_resumes_with_remaining_items(self):
+        self.translation_request.set_content_from_cms()
+        self.translation_request.set_request_content()
+        self.translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+        self.items[0].date_imported = timezone.now()
+        self.items[0].save(update_fields=('date_imported',))
+
+        self.translation_request.submit_request()
+
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.IMPORTED)
+        self.assertFalse(DummyText.objects.filter(placeholder=self.placeholders[0], language='de').exists())
+        self.assertTrue(DummyText.objects.filter(placeholder=self.placeholders[1], language='de').exists())
+
+    def test_interrupted_import_is_resumed(self):
+        self.submit_translation_request(self.translation_request)
+        response_content = self.translation_request.order.response_content
+        self.translation_request.items.filter(pk=self.items[1].pk).update(date_imported=None)
+        TranslationRequest.objects.update(state=TranslationRequest.STATES.IMPORT_STARTED)
+        self.translation_request.imports.update(state=TranslationImport.STATES.STARTED)
+        self.translation_request.refresh_from_db()
+
+        self.translation_request.import_response(response_content.encode('utf-8'))
+
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.IMPORTED)
+        self.assertEquals(DummyText.objects.filter(placeholder=self.placeholders[0], language='de').count(), 1)
+        self.assertTrue(self.translation_request.items.get(pk=self.items[1].pk).date_imported)
+        self.assertEquals(self.translation_request.imports.count(), 1)
+
+
+class PageExportTestCase(TranslationsTestCase):
+    """
+    The export must stay the same as the one of djangocms-transfer, which
+    imports it and whose output the coverage fingerprints were taken from.
+    """
+
+    def _assert_matches_djangocms_transfer(self, page, language):
+        self.assertEquals(get_page_export_data(page, language), exporter.get_page_export_data(page, language))
+
+    def test_queries(self):
+        page = generate_site(pages=1, placeholders=3, plugins=3, children=2)[0]
+
+        with self.assertNumQueries(2 + 3):
+            # The placeholders, the plugins and each plugin type.
+            get_page_export_data(page, 'de')
+
+    def test_matches_djangocms_transfer(self):
+        # The fourth placeholder of the template stays empty, pt-br has no plugins at all.
+        pages = generate_site(pages=2, placeholders=3, plugins=3, children=2)
+
+        for page in pages:
+            for language in ('en', 'de', 'pt-br'):
+                self._assert_matches_djangocms_transfer(page, language)
+
+    def test_root_plugins_by_position(self):
+        page = generate_site(pages=1, placeholders=2, plugins=3)[0]
+        root_plugins = list(CMSPlugin.objects.filter(placeholder__page=page, depth=1).order_by('-path'))
+
+        # The paths of moved plugins don't follow their positions.
+        for position, plugin in enumerate(root_plugins):
+            CMSPlugin.objects.filter(pk=plugin.pk).update(position=position)
+
+        self._assert_matches_djangocms_transfer(page, 'en')
+
+    def test_fingerprint_matches_djangocms_transfer(self):
+        page = generate_site(pages=1, placeholders=2, plugins=2)[0]
+        translation_request = self.create_translation_request([page])
+
+        translation_request.set_content_from_cms()
+
+        self.assertEquals(
+            translation_request.items.get().export_fingerprint,
+            get_content_fingerprint(exporter.get_page_export_data(page, 'en')),
+        )
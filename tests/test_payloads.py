@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.six import StringIO
+
+from tests.utils import TranslationsTestCase
+
+from djangocms_translations.models import TranslationOrder, TranslationRequest
+from djangocms_translations.payloads import (
+    archive_old_payloads, get_payload, get_payload_name, get_payload_storage,
+)
+
+
+class PayloadArchiveTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(PayloadArchiveTestCase, self).setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.export_content = '[{"translation_request_item_pk": 1, "placeholder": "content", "plugins": []}]'
+        self.translation_request = self.create_translation_request(
+            state=TranslationRequest.STATES.IMPORTED,
+            age=100,
+            export_content=self.export_content,
+            request_content={'Groups': [{'GroupId': '1:content:1', 'Items': []}]},
+        )
+        TranslationOrder.objects.create(
+            request=self.translation_request,
+            response_content='{"Groups": []}',
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+        super(PayloadArchiveTestCase, self).tearDown()
+
+    def test_archive(self):
+        recent = self.create_translation_request(state=TranslationRequest.STATES.IMPORTED, age=1)
+        open_request = self.create_translation_request(state=TranslationRequest.STATES.IN_TRANSLATION, age=100)
+
+        self.assertEquals(archive_old_payloads(batch_size=1), 1)
+
+        translation_request = TranslationRequest.objects.get(pk=self.translation_request.pk)
+        self.assertTrue(translation_request.date_payloads_archived)
+        self.assertEquals(translation_request.export_content, {})
+        self.assertEquals(translation_request.order.response_content, {})
+        self.assertTrue(get_payload_storage().exists(get_payload_name(translation_request.pk, 'export_content')))
+        self.assertEquals(get_payload(translation_request.pk, 'export_content'), self.export_content)
+        self.assertEquals(get_payload(translation_request.pk, 'order_response_content'), '{"Groups": []}')
+        self.assertEquals(get_payload(translation_request.pk, 'order_request_content'), {})
+        self.assertIsNone(TranslationRequest.objects.get(pk=recent.pk).date_payloads_archived)
+        self.assertIsNone(TranslationRequest.objects.get(pk=open_request.pk).date_payloads_archived)
+        self.assertEquals(archive_old_payloads(), 0)
+
+    def test_archived_import_data(self):
+        import_data = self.translation_request.provider.get_import_data()
+        archive_old_payloads()
+
+        translation_request = TranslationRequest.objects.get(pk=self.translation_request.pk)
+        self.assertEquals(translation_request.get_payload('export_content'), self.export_content)
+        self.assertEquals(translation_request.provider.get_import_data(), import_data)
+
+    def test_archived_payload_is_shown(self):
+        call_command('translations_archive_payloads', stdout=StringIO())
+        url = reverse('admin:translation-request-payload', args=(self.translation_request.pk, 'request_content'))
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEquals(response.json()['count'], 1)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.progress import ProgressTracker, get_progress
+
+
+class ProgressTrackerTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_flushes_on_exit(self):
+        with ProgressTracker(1, flush_interval=60) as progress:
+            progress.add('items_exported')
+            progress.add('items_exported')
+            self.assertEquals(get_progress(1)['items_exported'], 0)
+
+        self.assertEquals(get_progress(1)['items_exported'], 2)
+
+    def test_flushes_after_interval(self):
+        progress = ProgressTracker(1, flush_interval=0)
+
+        progress.add('bytes_sent', 100)
+        progress.add('bytes_sent', 50)
+
+        self.assertEquals(get_progress(1)['bytes_sent'], 150)
+        self.assertIsNone(get_progress(1)['state'])
+
+
+class TranslationRequestProgressTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(TranslationRequestProgressTestCase, self).setUp()
+        cache.clear()
+        page = create_translated_page(body='<p>Hello</p>')
+        self.translation_request = self.create_translation_request([page])
+
+    def test_pipeline_counters(self):
+        self.submit_translation_request(self.translation_request)
+
+        progress = get_progress(self.translation_request.pk)
+        self.assertEquals(progress['state'], TranslationRequest.STATES.IMPORTED)
+        self.assertEquals(progress['items_exported'], 1)
+        self.assertEquals(progress['groups_built'], 1)
+        self.assertEquals(progress['items_imported'], 1)
+        self.assertEquals(progress['items_failed'], 0)
+
+    def test_endpoint(self):
+        self.translation_request.set_content_from_cms()
+        url = reverse('admin:translation-request-progress', args=(self.translation_request.pk,))
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEquals(response.json()['items_exported'], 1)
+        self.assertEquals(response.json()['state'], TranslationRequest.STATES.OPEN)
+
+    def test_endpoint_falls_back_to_database_state(self):
+        url = reverse('admin:translation-request-progress', args=(self.translation_request.pk,))
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEquals(response.json()['state'], TranslationRequest.STATES.DRAFT)
+        self.assertEquals(get_progress(self.translation_request.pk)['state'], TranslationRequest.STATES.DRAFT)
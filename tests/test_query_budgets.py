@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from cms.models import CMSPlugin
+
+from tests.benchmarks.site import generate_site
+from tests.query_budgets import QueryBudgetMixin
+from tests.utils import TranslationsTestCase
+
+from djangocms_translations import views
+from djangocms_translations.forms import CreateTranslationForm
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+# Pages and text plugins per page of the generated sites, each stage is checked on all of them.
+SITES = ((1, 1), (3, 1), (1, 4))
+
+
+class AsynchronousPseudoTranslationProvider(PseudoTranslationProvider):
+    def get_response_content(self):
+        # Translated later, like a provider calling back.
+        return None
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TranslationsTestCase):
+    def setUp(self):
+        super(QueryBudgetTestCase, self).setUp()
+        # The callback view is checked on its own, the import has a budget of its own.
+        patcher = mock.patch.object(views, 'queue_task')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _check_budget(self, stage, prepare):
+        """
+        Runs the callable returned by ``prepare(pages)`` within the budget
+        of ``stage`` on each of the generated sites.
+        """
+        for page_count, plugin_count in SITES:
+            with transaction.atomic():
+                cache.clear()
+                pages = generate_site(pages=page_count, plugins=plugin_count)
+                run = prepare(pages)
+                plugins = CMSPlugin.objects.filter(placeholder__page__in=pages, language='en').count()
+
+                with self.assertQueryBudget(stage, len(pages), plugins):
+                    run()
+                transaction.set_rollback(True)
+
+    def _create_exported_translation_request(self, pages):
+        translation_request = self.create_translation_request(pages)
+        translation_request.set_content_from_cms()
+        translation_request.set_request_content()
+        return translation_request
+
+    def _create_submitted_translation_request(self, pages):
+        translation_request = self.create_translation_request(pages)
+        return self.submit_translation_request(translation_request, AsynchronousPseudoTranslationProvider)
+
+    def test_export(self):
+        self._check_budget('export', lambda pages: self.create_translation_request(pages).set_content_from_cms)
+
+    def test_request_content(self):
+        def prepare(pages):
+            translation_request = self.create_translation_request(pages)
+            translation_request.set_content_from_cms()
+            return translation_request.set_request_content
+
+        self._check_budget('request_content', prepare)
+
+    def test_quote(self):
+        def prepare(pages):
+            return self._create_exported_translation_request(pages).get_quote_from_provider
+
+        self._check_budget('quote', prepare)
+
+    def test_submit(self):
+        def prepare(pages):
+            translation_request = self._create_exported_translation_request(pages)
+            translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+            translation_request._provider = AsynchronousPseudoTranslationProvider(translation_request)
+            return translation_request.submit_request
+
+        self._check_budget('submit', prepare)
+
+    def test_import(self):
+        def prepare(pages):
+            translation_request = self._create_submitted_translation_request(pages)
+            response_content = translation_request.provider.get_response_content()
+            return lambda: translation_request.import_response(response_content)
+
+        self._check_budget('import', prepare)
+
+    def test_archive(self):
+        def prepare(pages):
+            translation_request = self._create_submitted_translation_request(pages)
+            response_content = translation_request.provider.get_response_content()
+            translation_request.order.response_content = response_content.decode('utf-8')
+            translation_request.order.save(update_fields=('response_content',))
+            import_data = translation_request.provider.get_import_data()
+
+            def archive():
+                for translation_request_item_pk, placeholders in import_data.items():
+                    translation_request._set_import_archive(translation_request_item_pk, placeholders)
+            return archive
+
+        self._check_budget('archive', prepare)
+
+    def test_changelist(self):
+        def prepare(pages):
+            for page in pages:
+                self.create_translation_request([page])
+            self.client.force_login(self.user)
+            return lambda: self.client.get(reverse('admin:djangocms_translations_translationrequest_changelist'))
+
+        self._check_budget('changelist', prepare)
+
+    def test_change_view(self):
+        def prepare(pages):
+            translation_request = self._create_submitted_translation_request(pages)
+            self.client.force_login(self.user)
+            url = reverse('admin:djangocms_translations_translationrequest_change', args=(translation_request.pk,))
+            return lambda: self.client.get(url)
+
+        self._check_budget('change_view', prepare)
+
+    def test_bulk_wizard(self):
+        def prepare(pages):
+            self.client.force_login(self.user)
+
+            def run_wizard():
+                self.client.post(reverse('admin:translate-in-bulk-step-1'), {
+                    'source_language': 'en',
+                    'target_language': 'de',
+                    'provider_backend': PseudoTranslationProvider.__name__,
+                })
+                self.client.get(reverse('admin:translate-in-bulk-step-2'))
+                response = self.client.post(reverse('admin:translate-in-bulk-step-2'), {
+                    'pages': [page.pk for page in pages],
+                    'send-without-quote': '1',
+                })
+                self.assertRedirects(
+                    response,
+                    reverse('admin:translate-in-bulk-step-3'),
+                    fetch_redirect_response=False,
+                )
+                self.client.get(reverse('admin:translate-in-bulk-step-3'))
+            return run_wizard
+
+        self._check_budget('bulk_wizard', prepare)
+
+    def test_create_form(self):
+        def prepare(pages):
+            # The last page, so that all the pages are loaded for the page choices.
+            page = pages[-1]
+            form = CreateTranslationForm(user=self.user, data={
+                'source_cms_page_0': page.node.site_id,
+                'source_cms_page_1': page.pk,
+                'source_language': 'en',
+                'target_cms_page_0': page.node.site_id,
+                'target_cms_page_1': page.pk,
+                'target_language': 'de',
+                'provider_backend': PseudoTranslationProvider.__name__,
+            })
+
+            def validate():
+                self.assertTrue(form.is_valid(), form.errors)
+            return validate
+
+        self._check_budget('create_form', prepare)
+
+    def test_callback(self):
+        def prepare(pages):
+            translation_request = self._create_submitted_translation_request(pages)
+            url = reverse('admin:translation-request-provider-callback', args=(translation_request.pk,))
+
+            def callback():
+                response = self.client.post(url, b'{}', content_type='application/json')
+                self.assertEquals(response.json(), {'success': True})
+            return callback
+
+        self._check_budget('callback', prepare)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.six import StringIO
+
+from tests.utils import TranslationsTestCase
+
+from djangocms_translations.models import TranslationOrder, TranslationRequest
+from djangocms_translations.reports import REPORT_COLUMNS, get_report_rows
+
+
+class ReportTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(ReportTestCase, self).setUp()
+        self.translation_request = self._create_translation_request('Order 1')
+        TranslationOrder.objects.create(
+            request=self.translation_request,
+            provider_details={'Id': 'pseudo-1', 'Price': 12.5, 'Currency': 'CHF', 'WordCount': 42},
+        )
+        self.old_translation_request = self._create_translation_request('Order 0', age=40)
+
+    def _create_translation_request(self, name, age=0):
+        return self.create_translation_request(age=age, provider_order_name=name, request_content={'Groups': []})
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            rows = list(get_report_rows(date_from=date.today() - timedelta(days=1)))
+
+        self.assertEquals(len(rows), 1)
+        row = dict(zip(REPORT_COLUMNS, rows[0]))
+        self.assertEquals(row['order_name'], 'Order 1')
+        self.assertEquals((row['word_count'], row['price'], row['currency']), ('42', '12.5', 'CHF'))
+
+    def test_command_csv(self):
+        output = StringIO()
+
+        call_command('translations_report', stdout=output)
+
+        rows = list(csv.reader(StringIO(output.getvalue())))
+        self.assertEquals(rows[0], list(REPORT_COLUMNS))
+        self.assertEquals([row[1] for row in rows[1:]], ['Order 1', 'Order 0'])
+        self.assertEquals(rows[2][-3:], ['', '', ''])
+
+    def test_command_output_file(self):
+        TranslationRequest.objects.filter(pk=self.translation_request.pk).update(
+            provider_order_name=u'Übersetzung für Zürich',
+        )
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'report.csv')
+
+        try:
+            call_command('translations_report', output=path)
+
+            with io.open(path, encoding='utf-8') as report:
+                content = report.read()
+        finally:
+            shutil.rmtree(directory)
+        self.assertIn(u'Übersetzung für Zürich', content)
+
+        output = StringIO()
+        call_command('translations_report', format='json', stdout=output)
+        self.assertEquals(json.loads(output.getvalue())[0]['order_name'], u'Übersetzung für Zürich')
+
+    def test_admin_json(self):
+        self.client.force_login(self.user)
+        url = reverse('admin:translation-report')
+
+        response = self.client.get(url, {'format': 'json', 'date_to': str(date.today() - timedelta(days=30))})
+
+        data = json.loads(b''.join(response.streaming_content).decode('utf-8'))
+        self.assertEquals([row['id'] for row in data], [self.old_translation_request.pk])
+        self.assertEquals(self.client.get(url, {'date_from': '2019-02-30'}).status_code, 404)
+        self.assertEquals(self.client.get(url, {'format': 'xml'}).status_code, 404)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations import conf
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.tasks import (
+    acquire_bulk_slot, get_bulk_slot_timeout, get_export_chunks, get_queue,
+    release_bulk_slot,
+)
+
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+@mock.patch.multiple(conf, TRANSLATIONS_INTERACTIVE_QUEUE='interactive', TRANSLATIONS_BULK_QUEUE='bulk')
+class SchedulingTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_queue(self):
+        self.assertEquals(get_queue(1), 'interactive')
+        self.assertEquals(get_queue(conf.TRANSLATIONS_INTERACTIVE_MAX_ITEMS), 'interactive')
+        self.assertEquals(get_queue(conf.TRANSLATIONS_INTERACTIVE_MAX_ITEMS + 1), 'bulk')
+
+    def test_export_chunks(self):
+        chunk_size = conf.TRANSLATIONS_EXPORT_CHUNK_SIZE
+
+        self.assertEquals(get_export_chunks(0), [(0, chunk_size)])
+        self.assertEquals(get_export_chunks(chunk_size), [(0, chunk_size)])
+        self.assertEquals(
+            get_export_chunks(chunk_size + 1),
+            [(0, chunk_size), (chunk_size, chunk_size * 2)],
+        )
+
+    def test_bulk_slots(self):
+        keys = [acquire_bulk_slot() for slot in range(conf.TRANSLATIONS_BULK_CONCURRENCY)]
+
+        self.assertNotIn(None, keys)
+        self.assertIsNone(acquire_bulk_slot())
+
+        release_bulk_slot(keys[0])
+        self.assertEquals(acquire_bulk_slot(), keys[0])
+
+    def test_bulk_slot_timeout(self):
+        self.assertEquals(get_bulk_slot_timeout(0), conf.TRANSLATIONS_BULK_SLOT_TIMEOUT)
+        self.assertEquals(
+            get_bulk_slot_timeout(100),
+            conf.TRANSLATIONS_BULK_SLOT_TIMEOUT + conf.TRANSLATIONS_BULK_SLOT_PAGE_TIMEOUT * 100,
+        )
+
+
+class ChunkedExportTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(ChunkedExportTestCase, self).setUp()
+        pages = [create_translated_page('page {}'.format(index), body='Text {}'.format(index)) for index in range(3)]
+        self.translation_request = self.create_translation_request(pages)
+
+    def test_chunks_match_full_export(self):
+        self.translation_request.set_content_from_cms()
+        export_content = json.loads(self.translation_request.export_content)
+        TranslationRequest.objects.update(state=TranslationRequest.STATES.DRAFT)
+        self.translation_request.items.update(date_exported=None)
+        self.translation_request.refresh_from_db()
+
+        self.translation_request.set_content_from_cms(0, 2)
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.DRAFT)
+        self.translation_request.set_content_from_cms(2, 4)
+
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.OPEN)
+        self.assertEquals(json.loads(self.translation_request.export_content), export_content)
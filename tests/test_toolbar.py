@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from cms.api import create_page
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_translations.cms_toolbars import get_menu_skeleton
+
+
+class TranslationsToolbarTestCase(CMSTestCase):
+    def test_menu(self):
+        page = create_page('test page', 'test_page.html', 'en', published=True)
+        self.client.force_login(self.get_superuser())
+
+        response = self.client.get(page.get_absolute_url('en') + '?edit')
+
+        self.assertContains(response, 'source_cms_page={}&amp;'.format(page.pk))
+        self.assertContains(response, 'target_language=pt-br')
+        self.assertContains(response, 'target_language=de')
+
+    def test_skeleton_is_cached(self):
+        self.assertIs(get_menu_skeleton(1, 'en', 'en'), get_menu_skeleton(1, 'en', 'en'))
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import json
+
+from django.urls import reverse
+
+from tests.utils import TranslationsTestCase, create_translated_page
+
+from djangocms_translations import views
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class AsynchronousPseudoTranslationProvider(PseudoTranslationProvider):
+    def get_response_content(self):
+        return None
+
+
+class ProviderCallbackTestCase(TranslationsTestCase):
+    def setUp(self):
+        super(ProviderCallbackTestCase, self).setUp()
+        patcher = mock.patch.object(views, 'queue_task')
+        self.queue_task = patcher.start()
+        self.addCleanup(patcher.stop)
+        page = create_translated_page(body='<p>Hello</p>')
+        self.translation_request = self.submit_translation_request(
+            self.create_translation_request([page]),
+            AsynchronousPseudoTranslationProvider,
+        )
+
+    def test_response_stored_before_queuing(self):
+        response_content = PseudoTranslationProvider(self.translation_request).get_response_content()
+        url = reverse('admin:translation-request-provider-callback', args=(self.translation_request.pk,))
+
+        response = self.client.post(url, response_content, content_type='application/json')
+
+        self.assertEquals(response.json(), {'success': True})
+        # Only the primary key goes through the broker.
+        self.queue_task.assert_called_once_with(mock.ANY, self.translation_request)
+        self.translation_request.order.refresh_from_db()
+        self.assertEquals(
+            json.loads(self.translation_request.order.response_content),
+            json.loads(response_content.decode('utf-8')),
+        )
+
+        # As run by the task.
+        self.translation_request.refresh_from_db()
+        self.translation_request.import_response()
+        self.assertEquals(self.translation_request.state, TranslationRequest.STATES.IMPORTED)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from django.utils import timezone
+
+from cms.api import add_plugin, create_page, create_title
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_translations import conf
+from djangocms_translations.models import TranslationRequest
+from djangocms_translations.providers.pseudo import PseudoTranslationProvider
+
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+def create_translated_page(title='test page', body=None, published=True, parent=None):
+    """
+    Returns a page with an English and a German title and, given ``body``,
+    an English text plugin in its content placeholder.
+    """
+    page = create_page(title, 'test_page.html', 'en', published=published, parent=parent)
+    create_title('de', '{} de'.format(title), page)
+
+    if body is not None:
+        add_plugin(page.placeholders.get(slot='content'), 'DummyTextPlugin', 'en', body=body)
+    return page
+
+
+class TranslationsTestCase(CMSTestCase):
+    def setUp(self):
+        super(TranslationsTestCase, self).setUp()
+        self.user = self.get_superuser()
+
+    def patch_conf(self, **values):
+        """
+        Overrides the ``conf`` values until the end of the test, they are read
+        from the settings once so ``override_settings()`` doesn't reach them.
+        """
+        for name, value in values.items():
+            patcher = mock.patch.object(conf, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_translation_request(self, pages=(), age=0, **kwargs):
+        """
+        Returns an English to German translation request of ``pages``,
+        created ``age`` days ago.
+        """
+        kwargs.setdefault('provider_backend', PseudoTranslationProvider.__name__)
+        translation_request = TranslationRequest.objects.create(
+            user=self.user,
+            source_language='en',
+            target_language='de',
+            **kwargs
+        )
+
+        for page in pages:
+            translation_request.items.create(source_cms_page=page, target_cms_page=page)
+
+        if pages:
+            translation_request.set_provider_order_name(pages[0])
+        if age:
+            TranslationRequest.objects.filter(pk=translation_request.pk).update(
+                date_created=timezone.now() - timedelta(days=age),
+            )
+        # The item count and the creation date were updated in the database.
+        translation_request.refresh_from_db()
+        return translation_request
+
+    def submit_translation_request(self, translation_request, provider_class=None):
+        """
+        Exports and submits ``translation_request``, through ``provider_class``
+        instead of its own provider if given.
+        """
+        translation_request.set_content_from_cms()
+        translation_request.set_request_content()
+        translation_request.set_status(TranslationRequest.STATES.READY_FOR_SUBMISSION)
+
+        if provider_class is not None:
+            translation_request._provider = provider_class(translation_request)
+        translation_request.submit_request()
+        translation_request._provider = None
+        return translation_request